@@ -0,0 +1,96 @@
+import os
+from card import CARDS
+from evaluator import CATEGORY_NAMES, hand_strength, category_of
+
+class AnomalySink:
+    """
+    Append-only file of every formula anomaly of a run, so the run can go on instead of stopping at the first one
+
+    - one line per anomaly: given hand card ids, retained hand card ids, method name and value, tab separated
+        ie: "0 13 26 39 40<TAB>0 13<TAB>calc_total_better_one_pair_combination<TAB>TypeError: ..."
+    - size - bytes written so far (a checkpoint saves it - see truncate_to)
+    - summarize the file with read_anomalies and summarize_anomalies
+
+    truncate_to (optional) - cut the file back to this size first, ie: to the size saved with a checkpoint when resuming
+    """
+    def __init__(self, path, truncate_to=None):
+        self.path = path
+        if truncate_to is not None and os.path.exists(path):
+            os.truncate(path, truncate_to)
+        self.file = open(path, "a", encoding="utf-8")
+        self.size = self.file.tell()
+        self.count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def record(self, given_hand, retained_hand, method, value):
+        """
+        Append one anomaly - retained_hand can be None for an anomaly of the whole given hand
+        """
+        retained_ids = " ".join(str(card.id) for card in retained_hand) if retained_hand is not None else "-"
+        value = str(value).replace("\t", " ").replace("\n", " ")
+        line = f"{' '.join(str(card.id) for card in given_hand)}\t{retained_ids}\t{method}\t{value}\n"
+
+        self.file.write(line)
+        self.size += len(line.encode("utf-8"))
+        self.count += 1
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+def read_anomalies(path):
+    """
+    Generate every anomaly of a sink file as (given hand, retained hand or None, method, value)
+    """
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            (given_ids, retained_ids, method, value) = line.rstrip("\n").split("\t", 3)
+            given_hand = [CARDS[int(card_id)] for card_id in given_ids.split()]
+            retained_hand = [CARDS[int(card_id)] for card_id in retained_ids.split()] if retained_ids != "-" else None
+            yield (given_hand, retained_hand, method, value)
+
+def hand_pattern(given_hand, retained_hand):
+    """
+    Short pattern of an anomaly - the given hand's combo and the value counts of the retained hand
+
+    ie: "one pair, keep 2+1 suited" - a pair and another card all the same suit
+    """
+    pattern = CATEGORY_NAMES[category_of(hand_strength(given_hand))]
+    if retained_hand is None:
+        return pattern
+    if len(retained_hand) == 0:
+        return f"{pattern}, keep 0"
+
+    values = [card.value for card in retained_hand]
+    counts = sorted((values.count(value) for value in set(values)), reverse=True)
+    suited = " suited" if len(retained_hand) > 1 and len({card.suit_id for card in retained_hand}) == 1 else ""
+    return f"{pattern}, keep {'+'.join(str(count) for count in counts)}{suited}"
+
+def summarize_anomalies(anomalies):
+    """
+    Number of anomalies by method and by hand pattern - {method: {pattern: count}}, most anomalies first
+    """
+    summary = {}
+    for (given_hand, retained_hand, method, value) in anomalies:
+        patterns = summary.setdefault(method, {})
+        pattern = hand_pattern(given_hand, retained_hand)
+        patterns[pattern] = patterns.get(pattern, 0) + 1
+
+    return {
+        method: dict(sorted(patterns.items(), key=lambda item: -item[1]))
+        for method, patterns in sorted(summary.items(), key=lambda item: -sum(item[1].values()))
+    }
+
+def print_anomaly_summary(summary):
+    for method, patterns in summary.items():
+        print(f"{method}: {sum(patterns.values())}")
+        for pattern, count in patterns.items():
+            print(f"  {pattern}: {count}")
@@ -0,0 +1,5 @@
+"""
+Benchmarks of the solver, the hand evaluators and the deck
+
+py -m benchmarks.run --output benchmark.json
+"""
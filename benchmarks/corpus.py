@@ -0,0 +1,49 @@
+import random
+import itertools
+from card import CARDS
+from deck import unrank_combination
+from evaluator import PrimeEvaluator, CATEGORY_NAMES
+from player import RETAINED_HAND_POSITIONS
+
+CORPUS_SEED = 2024
+# hands per combo - royal flush only has 4
+CORPUS_SIZE = 50
+
+def generate_category_index():
+    """
+    Hand index (Deck.generate_all_iteration order) of every hand, one list per combo (index in CATEGORY_NAMES)
+    """
+    evaluator = PrimeEvaluator()
+    category_index = [[] for _ in CATEGORY_NAMES]
+    for index, hand in enumerate(itertools.combinations(CARDS, 5)):
+        category_index[evaluator.category(hand)].append(index)
+    return category_index
+
+class Corpus:
+    """
+    Fixed hands for the benchmarks - the same seed always gives the same hands
+
+    - hands[category] - up to size hands of the combo, sampled from every hand of the combo
+    - retained_hands[category] - a retained hand of each hand (one of its 31 retained hands)
+    """
+    def __init__(self, seed=CORPUS_SEED, size=CORPUS_SIZE, category_index=None):
+        if category_index is None:
+            category_index = generate_category_index()
+
+        rng = random.Random(seed)
+        self.seed = seed
+        self.size = size
+        self.hands = []
+        self.retained_hands = []
+
+        for index_list in category_index:
+            sample = rng.sample(index_list, min(size, len(index_list)))
+            hands = [[CARDS[card_id] for card_id in unrank_combination(index, 52, 5)] for index in sample]
+            self.hands.append(hands)
+            self.retained_hands.append([[hand[i] for i in rng.choice(RETAINED_HAND_POSITIONS)] for hand in hands])
+
+    def all_hands(self):
+        return [hand for hands in self.hands for hand in hands]
+
+    def all_retained_hands(self):
+        return [retained_hand for retained_hands in self.retained_hands for retained_hand in retained_hands]
@@ -0,0 +1,110 @@
+import sys
+import json
+import time
+import argparse
+import platform
+from deck import Deck
+from player import Player
+from evaluator import CATEGORY_NAMES
+from benchmarks.corpus import Corpus, CORPUS_SEED, CORPUS_SIZE
+from benchmarks.timing import measure
+
+def deal_and_mulligan(deck):
+    """
+    Deal 5 cards and mulligan 3 of them
+    """
+    hand = [deck.deal() for _ in range(5)]
+    deck.mulligan(hand[:3])
+
+def new_deck(*args):
+    """
+    Setup of the deck benchmarks - a full deck for every call, followed by the other args
+    """
+    return (Deck(),) + args
+
+def generate_benchmarks(corpus):
+    """
+    (name, function, inputs, setup) of every benchmark - the function is called with every args in inputs (see timing.measure)
+
+    - is/* - every check method with every hand
+    - total/* - every calc_*_total_combination with every retained hand
+    - better/* - every calc_total_better_* with the hands of its combo
+        - the method benchmarks use a player without caches so every call is calculated
+    - find_best_retained_hand - end to end for every hand, with the default caches and without
+    - deck/* - shuffle, deal and mulligan - every call gets a new full deck (setup), so repeats never deal from an empty deck
+    """
+    player = Player(total_cache_size=0, better_cache_size=0)
+    all_hands = corpus.all_hands()
+    all_retained_hands = corpus.all_retained_hands()
+    benchmarks = []
+
+    for formula in player.formula_list:
+        benchmarks.append((f"is/{formula['check'].__name__}", formula["check"], [(hand,) for hand in all_hands], None))
+
+    for formula in player.formula_list[1:]:
+        benchmarks.append((f"total/{formula['total'].__name__}", formula["total"], [(retained_hand,) for retained_hand in all_retained_hands], None))
+
+    for category, formula in enumerate(player.formula_list):
+        inputs = list(zip(corpus.hands[category], corpus.retained_hands[category]))
+        benchmarks.append((f"better/{formula['better'].__name__}", formula["better"], inputs, None))
+
+    benchmarks.append(("find_best_retained_hand", Player().find_best_retained_hand, [(hand,) for hand in all_hands], None))
+    benchmarks.append(("find_best_retained_hand/no_cache", player.find_best_retained_hand, [(hand,) for hand in all_hands], None))
+
+    num_deck = len(all_hands)
+    benchmarks.append(("deck/shuffle", Deck.shuffle, [()] * num_deck, new_deck))
+    benchmarks.append(("deck/deal", Deck.deal, [()] * num_deck, new_deck))
+    benchmarks.append(("deck/deal_random_5", Deck.deal_random, [(5,)] * num_deck, new_deck))
+    benchmarks.append(("deck/deal_5_mulligan_3", deal_and_mulligan, [()] * num_deck, new_deck))
+
+    return benchmarks
+
+def run_benchmarks(seed=CORPUS_SEED, size=CORPUS_SIZE, name_filter=None, repeat=1, corpus=None):
+    """
+    Run every benchmark whose name starts with name_filter
+
+    Returns {"meta": {...}, "results": {name: measure(...)}} - can be saved as JSON
+    """
+    if corpus is None:
+        corpus = Corpus(seed, size)
+
+    results = {}
+    for (name, function, inputs, setup) in generate_benchmarks(corpus):
+        if name_filter is not None and not name.startswith(name_filter):
+            continue
+        results[name] = measure(function, inputs, repeat, setup)
+
+    return {
+        "meta": {
+            "seed": corpus.seed,
+            "size": corpus.size,
+            "hands_per_category": {CATEGORY_NAMES[category]: len(hands) for category, hands in enumerate(corpus.hands)},
+            "repeat": repeat,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+def print_report(report):
+    print(f"{'benchmark':<60}{'calls':>8}{'ops/sec':>14}{'p50 us':>12}{'p99 us':>12}{'peak KB':>10}")
+    for name, result in report["results"].items():
+        print(f"{name:<60}{result['calls']:>8}{result['ops_per_sec']:>14.0f}{result['p50_us']:>12.1f}{result['p99_us']:>12.1f}{result['peak_memory_bytes'] / 1024:>10.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the solver, the hand evaluators and the deck")
+    parser.add_argument("--seed", type=int, default=CORPUS_SEED, help="seed of the hand corpus")
+    parser.add_argument("--size", type=int, default=CORPUS_SIZE, help="hands per combo")
+    parser.add_argument("--filter", default=None, help="only run the benchmarks that start with this name (ie: total/)")
+    parser.add_argument("--repeat", type=int, default=1, help="time every call this many times")
+    parser.add_argument("--output", default=None, help="save the results as JSON")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.seed, args.size, args.filter, args.repeat)
+    print_report(report)
+
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Saved: {args.output}")
@@ -0,0 +1,52 @@
+import time
+import tracemalloc
+
+def percentile(sorted_values, percent):
+    """
+    Nearest rank percentile of a sorted list
+    """
+    if len(sorted_values) == 0:
+        return 0
+    rank = max(0, min(len(sorted_values) - 1, round(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+def measure(function, inputs, repeat=1, setup=None):
+    """
+    Call function(*args) for every args in inputs (repeat times) and time every call
+
+    - setup (optional) - the args of every call are setup(*args), made before the pass and not timed
+        ie: a fresh Deck for every call of a method that deals from it
+    - a second pass with tracemalloc measures the peak memory (tracemalloc slows down the calls so it is not timed)
+
+    Returns {"calls", "ops_per_sec", "mean_us", "p50_us", "p99_us", "peak_memory_bytes"}
+    """
+    def pass_inputs():
+        if setup is None:
+            return inputs
+        return [setup(*args) for args in inputs]
+
+    perf_counter_ns = time.perf_counter_ns
+    latencies = []
+    for _ in range(repeat):
+        for args in pass_inputs():
+            start = perf_counter_ns()
+            function(*args)
+            latencies.append(perf_counter_ns() - start)
+
+    call_inputs = pass_inputs()
+    tracemalloc.start()
+    for args in call_inputs:
+        function(*args)
+    (_, peak_memory) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    total_ns = sum(latencies)
+    return {
+        "calls": len(latencies),
+        "ops_per_sec": len(latencies) / (total_ns / 1e9) if total_ns > 0 else 0,
+        "mean_us": total_ns / max(len(latencies), 1) / 1000,
+        "p50_us": percentile(latencies, 50) / 1000,
+        "p99_us": percentile(latencies, 99) / 1000,
+        "peak_memory_bytes": peak_memory,
+    }
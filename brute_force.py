@@ -0,0 +1,142 @@
+import math
+import itertools
+import numpy as np
+from evaluator import PrimeEvaluator, CARD_BITS, CARD_PRIMES, NOT_UNIQUE
+
+# per card id
+CARD_BIT_ARRAY = np.array(CARD_BITS, dtype=np.int32)
+CARD_PRIME_ARRAY = np.array(CARD_PRIMES, dtype=np.int64)
+CARD_SUIT_ARRAY = np.arange(52, dtype=np.int8) // 13
+
+class VectorEvaluator:
+    """
+    NumPy version of evaluator.PrimeEvaluator - evaluate many hands at once
+
+    Hands are an integer array of card ids with shape (number of hands, 5)
+    """
+    def __init__(self, prime_evaluator=None):
+        if prime_evaluator is None:
+            prime_evaluator = PrimeEvaluator()
+
+        self.flush_table = np.array(prime_evaluator.flush_table, dtype=np.uint16)
+        self.unique_table = np.array(prime_evaluator.unique_table, dtype=np.uint16)
+        products = sorted(prime_evaluator.paired)
+        self.paired_products = np.array(products, dtype=np.int64)
+        self.paired_strength = np.array([prime_evaluator.paired[product] for product in products], dtype=np.uint16)
+
+    def strength(self, hand_ids):
+        """
+        Return the strength of every hand as a uint16 array - a higher strength is a better hand
+        """
+        hand_ids = np.asarray(hand_ids)
+        mask = np.bitwise_or.reduce(CARD_BIT_ARRAY[hand_ids], axis=1)
+        product = CARD_PRIME_ARRAY[hand_ids].prod(axis=1)
+        suits = CARD_SUIT_ARRAY[hand_ids]
+        flush = (suits == suits[:, :1]).all(axis=1)
+
+        return self.lookup(mask, product, flush)
+
+    def lookup(self, mask, product, flush):
+        """
+        Return the strength of every hand from its value mask, value prime product and same suit flag
+        """
+        strength = np.where(flush, self.flush_table[mask], self.unique_table[mask])
+
+        paired = strength == NOT_UNIQUE
+        if paired.any():
+            strength[paired] = self.paired_strength[np.searchsorted(self.paired_products, product[paired])]
+
+        return strength
+
+class BruteForceEngine:
+    """
+    Count better combinations by enumerating every redraw instead of the calc_* formulas
+
+    It gives a second answer (independent of the formulas) for calc_better_combination.
+    For a retained hand with k card(s) to draw, every redraw is one of the math.comb(47 + k, k) combinations of the remaining deck.
+
+    - keep 2+ cards - every k card redraw from 52 cards is an integer array made at init (with its card mask, value mask, prime product and suit)
+        - filter the redraws that do not use a retained card and evaluate them at once with the retained hand
+    - keep 0 or 1 card - every possible hand (or every hand with that card) is evaluated once at init and sorted,
+      so counting the better hands is a binary search instead of evaluating 2,598,960 (249,900) redraws per call
+    """
+    def __init__(self, vector_evaluator=None):
+        self.evaluator = vector_evaluator if vector_evaluator is not None else VectorEvaluator()
+
+        all_hand_ids = np.fromiter(itertools.chain.from_iterable(itertools.combinations(range(52), 5)), dtype=np.int16, count=5 * math.comb(52, 5)).reshape(-1, 5)
+        all_strength = self.evaluator.strength(all_hand_ids)
+
+        # keep 0 card - sorted strength of every hand
+        self.sorted_strength = np.sort(all_strength)
+
+        # keep 1 card - sorted strength of every hand with the card, one row per card id
+        card_strength = all_hand_ids.T.astype(np.int32).ravel() << 16 | np.tile(all_strength.astype(np.int32), 5)
+        card_strength.sort()
+        self.sorted_card_strength = (card_strength & 0xFFFF).astype(np.uint16).reshape(52, -1)
+
+        # keep 2+ cards - every redraw of 0 to 3 cards
+        self.redraw = {}
+        for num_card_to_draw in range(4):
+            all_redraw = list(itertools.combinations(range(52), num_card_to_draw))
+            redraw_ids = np.array(all_redraw, dtype=np.int64).reshape(len(all_redraw), num_card_to_draw)
+            suits = CARD_SUIT_ARRAY[redraw_ids]
+
+            card_mask = np.bitwise_or.reduce(np.left_shift(1, redraw_ids), axis=1)
+            value_mask = np.bitwise_or.reduce(CARD_BIT_ARRAY[redraw_ids], axis=1)
+            product = CARD_PRIME_ARRAY[redraw_ids].prod(axis=1)
+            # suit of the redraw - -1 if it has more than 1 suit, -2 for the empty redraw (matches any suit)
+            suit = np.full(len(all_redraw), -2, dtype=np.int8)
+            if num_card_to_draw > 0:
+                suit = np.where((suits == suits[:, :1]).all(axis=1), suits[:, 0], -1).astype(np.int8)
+
+            self.redraw[num_card_to_draw] = (card_mask, value_mask, product, suit)
+
+    def calc_better_combination(self, given_hand, retained_hand):
+        """
+        Calculate the number of better combination for a specific set of retained hand
+
+        Same as Player.calc_better_combination
+        """
+        given_strength = self.evaluator.strength(np.array([[card.id for card in given_hand]]))[0]
+        return self.count_better(given_strength, [card.id for card in retained_hand])
+
+    def calc_all_better_combination(self, given_hand, retained_hand_combination):
+        """
+        Calculate the number of better combination for every retained hand in retained_hand_combination
+        """
+        given_strength = self.evaluator.strength(np.array([[card.id for card in given_hand]]))[0]
+        return [self.count_better(given_strength, [card.id for card in retained_hand]) for retained_hand in retained_hand_combination]
+
+    def count_better(self, given_strength, retained_ids):
+        """
+        Count the hands made with retained_ids + any redraw that are stronger than given_strength
+        """
+        given_strength = np.uint16(given_strength)
+
+        if len(retained_ids) == 0:
+            return int(len(self.sorted_strength) - np.searchsorted(self.sorted_strength, given_strength, side="right"))
+
+        if len(retained_ids) == 1:
+            row = self.sorted_card_strength[retained_ids[0]]
+            return int(len(row) - np.searchsorted(row, given_strength, side="right"))
+
+        retained_card_mask = 0
+        retained_value_mask = 0
+        retained_product = 1
+        for card_id in retained_ids:
+            retained_card_mask |= 1 << card_id
+            retained_value_mask |= CARD_BITS[card_id]
+            retained_product *= CARD_PRIMES[card_id]
+        retained_suits = set(card_id // 13 for card_id in retained_ids)
+        retained_suit = retained_suits.pop() if len(retained_suits) == 1 else -1
+
+        (card_mask, value_mask, product, suit) = self.redraw[5 - len(retained_ids)]
+        in_deck = (card_mask & retained_card_mask) == 0
+
+        flush = np.zeros(np.count_nonzero(in_deck), dtype=bool)
+        if retained_suit != -1:
+            redraw_suit = suit[in_deck]
+            flush = (redraw_suit == retained_suit) | (redraw_suit == -2)
+
+        strength = self.evaluator.lookup(value_mask[in_deck] | retained_value_mask, product[in_deck] * retained_product, flush)
+        return int(np.count_nonzero(strength > given_strength))
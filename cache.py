@@ -0,0 +1,89 @@
+import sys
+from collections import OrderedDict
+
+# returned by LRUCache.get when the key is not cached (None can be a cached result)
+MISSING = object()
+
+def sizeof(obj):
+    """
+    Size in bytes of obj and the tuples/lists inside it (sys.getsizeof only counts the container)
+    """
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (tuple, list)):
+        size += sum(sizeof(item) for item in obj)
+    return size
+
+class LRUCache:
+    """
+    Size bounded cache - when it is full, the least recently used entry is evicted
+
+    - hits / misses - counted by get
+    - evictions - entries removed to make room
+    - bytes - approximate size of the cached keys and values (see sizeof) - small ints and strings are shared so it is an upper bound
+    """
+    def __init__(self, maxsize):
+        if maxsize <= 0:
+            raise ValueError(f"Invalid cache size: {maxsize}")
+
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+
+    def __len__(self):
+        return len(self.data)
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def get(self, key, default=MISSING):
+        """
+        Return the cached value and mark it as most recently used - return default if the key is not cached
+        """
+        try:
+            value = self.data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+
+        self.data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Cache the value - evict the least recently used entry if the cache is full
+        """
+        if key in self.data:
+            self.data.move_to_end(key)
+            self.bytes -= sizeof(self.data[key])
+        else:
+            if len(self.data) >= self.maxsize:
+                (old_key, old_value) = self.data.popitem(last=False)
+                self.bytes -= sizeof(old_key) + sizeof(old_value)
+                self.evictions += 1
+            self.bytes += sizeof(key)
+        self.data[key] = value
+        self.bytes += sizeof(value)
+
+    def clear(self):
+        self.data.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+
+    def stats(self):
+        """
+        Return {"hits", "misses", "evictions", "bytes", "size", "maxsize"}
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "bytes": self.bytes,
+            "size": len(self.data),
+            "maxsize": self.maxsize,
+        }
@@ -0,0 +1,110 @@
+import itertools
+from evaluator import CONSECUTIVE_VALUE_COMBOS
+
+# value mask of each straight (bit 0 is 2 and bit 12 is Ace) - the last one is 10-J-Q-K-A
+STRAIGHT_MASKS = [sum(1 << (val - 2) for val in combo) for combo in CONSECUTIVE_VALUE_COMBOS]
+ROYAL_MASK = STRAIGHT_MASKS[-1]
+
+def canonicalize(card_list):
+    """
+    Map a hand to the representative of its suit isomorphic class
+
+    Two hands are isomorphic if one becomes the other by relabeling the suits (ie: every ♠️ -> ♥️ and every ♥️ -> ♠️).
+    They have the same best retained hand and the same better hand probabilities.
+    - 2,598,960 hands -> 134,459 classes
+
+    - find the value mask of each suit (bit 0 is 2 and bit 12 is Ace)
+    - relabel the suits in order of their mask (highest mask -> suit 0)
+        - suits with the same mask are interchangeable so their order does not matter
+
+    Returns (canonical card ids sorted, suit_map)
+    - suit_map[suit_id] = suit id in the representative
+    """
+    masks = [0, 0, 0, 0]
+    for card in card_list:
+        masks[card.suit_id] |= 1 << (card.value - 2)
+
+    order = sorted(range(4), key=lambda suit: masks[suit], reverse=True)
+    suit_map = [0, 0, 0, 0]
+    for new_suit, suit in enumerate(order):
+        suit_map[suit] = new_suit
+
+    canonical_ids = tuple(sorted(canonical_id(card, suit_map) for card in card_list))
+    return (canonical_ids, suit_map)
+
+def iter_class_representatives():
+    """
+    Generate the sorted card ids of the representative of every suit isomorphic class (134,459) without the other hands
+
+    - a hand is its class representative (canonicalize) when its suit value masks never go up from suit 0 to suit 3
+    - pick suit 0's values, then every mask of suit 1 that is not above it, and so on - the last suit with cards can be the only one left
+    """
+    def generate(suit, num_card, max_mask, card_ids):
+        if num_card == 0:
+            yield tuple(card_ids)
+            return
+        if suit == 4:
+            return
+
+        for num_suit_card in range(num_card, 0, -1):
+            for values in itertools.combinations(range(13), num_suit_card):
+                mask = sum(1 << value for value in values)
+                if mask > max_mask:
+                    continue
+                yield from generate(suit + 1, num_card - num_suit_card, mask, card_ids + [suit * 13 + value for value in values])
+
+    for card_ids in generate(0, 5, (1 << 13) - 1, []):
+        yield tuple(sorted(card_ids))
+
+def canonical_id(card, suit_map):
+    """
+    Card id of a card after relabeling its suit with suit_map
+    """
+    return suit_map[card.suit_id] * 13 + card.value - 2
+
+def retained_hand_pattern(retained_hand):
+    """
+    Abstract pattern of a retained hand - every calc_*_total_combination result depends only on it
+
+    - value counts sorted (ie: XXY -> (1, 2)) - the actual values do not matter for pairs/triples/quads/full house
+    - same suit - flush, straight flush and royal flush
+    - number of straights (CONSECUTIVE_VALUE_COMBOS) that have all of the values and if 10-J-Q-K-A is one of them
+        - always (0, False) with a repeat value - no straight can be made
+
+    ie: [3♠️, 4♠️] and [9♥️, Q♥️] are both ((1, 1), True, 2, False)
+    """
+    counts = {}
+    mask = 0
+    suits = set()
+    for card in retained_hand:
+        counts[card.value] = counts.get(card.value, 0) + 1
+        mask |= 1 << (card.value - 2)
+        suits.add(card.suit_id)
+
+    num_straight = 0
+    royal = False
+    if len(counts) == len(retained_hand):
+        for straight_mask in STRAIGHT_MASKS:
+            if mask & straight_mask == mask:
+                num_straight += 1
+        royal = mask & ROYAL_MASK == mask
+
+    return (tuple(sorted(counts.values())), len(suits) <= 1, num_straight, royal)
+
+def better_combination_pattern(given_hand, retained_hand, use_suit=True):
+    """
+    Suit free key of a (given hand, retained hand) pair - every calc_total_better_* result depends only on it
+
+    - given hand values sorted - the hand to beat (its combo is already known from the method)
+    - retained hand values sorted - the rest of the given hand is mulliganed
+    - same suit of the retained hand - only when use_suit (flush, straight and high card need it)
+
+    ie: given [11,10,8,5,4] flush with retained [10,5,4] -> beat [11,8] with 2 draws excluding values {10,5,4}, in any suit
+    """
+    given_values = tuple(sorted(card.value for card in given_hand))
+    retained_values = tuple(sorted(card.value for card in retained_hand))
+    if not use_suit:
+        return (given_values, retained_values)
+
+    same_suit = len({card.suit_id for card in retained_hand}) <= 1
+    return (given_values, retained_values, same_suit)
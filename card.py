@@ -1,16 +1,56 @@
+SUITS = ["♠️", "♥️", "♣️", "♦️"]
+FACE_NAMES = {2: "2", 3: "3", 4: "4", 5: "5", 6: "6", 7: "7", 8: "8", 9: "9", 10: "10", 11: "Jack", 12: "Queen", 13: "King", 14: "Ace"}
+SUIT_INDEX = {suit: i for i, suit in enumerate(SUITS)}
+
 class Card:
-    def __init__(self, suit, value):
-        if suit not in ["♠️", "♥️", "♣️", "♦️"]:
+    """
+    A deck only ever has 52 different cards - so every Card is one of 52 interned objects (CARDS)
+    - Card(suit, value) looks up the existing card instead of creating a new one
+    - id: 0..51 -> suit_id * 13 + (value - 2), same order as Deck.create_deck
+    - value: 2..14 (rank)
+    - suit_id: 0..3 index into SUITS
+    - the emoji suit and the face name are only looked up when needed (__str__)
+    """
+    __slots__ = ("id", "value", "suit_id")
+
+    def __new__(cls, suit, value):
+        if suit not in SUIT_INDEX:
             raise ValueError("Invalid suit")
         if value not in range(2,15):
             raise ValueError("Invalid value")
-        self.suit = suit
-        self.value = value
-        self.face = self.get_face_name()
+        return CARDS[SUIT_INDEX[suit] * 13 + value - 2]
+
+    @classmethod
+    def from_id(cls, card_id):
+        """
+        Return the interned card for a 0..51 card id
+        """
+        return CARDS[card_id]
+
+    @classmethod
+    def _create(cls, card_id):
+        card = object.__new__(cls)
+        card.id = card_id
+        card.value = card_id % 13 + 2
+        card.suit_id = card_id // 13
+        return card
+
+    @property
+    def suit(self):
+        return SUITS[self.suit_id]
+
+    @property
+    def face(self):
+        return FACE_NAMES[self.value]
 
     def get_face_name(self):
-        face_names = {2: "2", 3: "3", 4: "4", 5: "5", 6: "6", 7: "7", 8: "8", 9: "9", 10: "10", 11: "Jack", 12: "Queen", 13: "King", 14: "Ace"}
-        return face_names[self.value]
+        return FACE_NAMES[self.value]
+
+    def __reduce__(self):
+        # keep cards interned across pickle/copy (process pool workers)
+        return (Card, (self.suit, self.value))
 
     def __str__(self):
-        return f"{self.face}{self.suit}"
\ No newline at end of file
+        return f"{self.face}{self.suit}"
+
+CARDS = tuple(Card._create(card_id) for card_id in range(52))
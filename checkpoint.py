@@ -0,0 +1,44 @@
+import os
+import json
+
+CHECKPOINT_VERSION = 1
+# next_index is a lex index (Deck.generate_all_iteration order) - not the colex rank of hand_index.rank_hand
+CHECKPOINT_ORDER = "lex"
+
+class Checkpoint:
+    """
+    Small JSON state file of a long run - written atomically so a crash never leaves a half written file
+
+    - save(next_index, aggregates) - the lex index of the first hand that is not done and the aggregates of every hand before it
+    - load() - the last saved (next_index, aggregates), None if there is no checkpoint
+    - the file is written to path.tmp, flushed to disk and then renamed over path (os.replace is atomic)
+    - floats are saved with their exact repr, so resumed aggregates are the same as uninterrupted ones
+    """
+    def __init__(self, path):
+        self.path = path
+
+    def save(self, next_index, aggregates):
+        state = {"version": CHECKPOINT_VERSION, "order": CHECKPOINT_ORDER, "next_index": next_index, "aggregates": aggregates}
+
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(state, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.path)
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return None
+
+        with open(self.path) as file:
+            state = json.load(file)
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Invalid checkpoint version: {state.get('version')}")
+        if state.get("order", CHECKPOINT_ORDER) != CHECKPOINT_ORDER:
+            raise ValueError(f"Invalid checkpoint order: {state['order']}")
+        return (state["next_index"], state["aggregates"])
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
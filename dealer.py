@@ -0,0 +1,68 @@
+import numpy as np
+
+# Dealer.mulligan - sorts after every card id
+NOT_RETAINED = 127
+
+class Dealer:
+    """
+    Deal or mulligan many independent hands at once into card id arrays (NumPy) - the batch version of Deck.deal_random
+
+    Every hand draws its cards from its own deck without building it - Floyd's algorithm samples k of m slots without replacement:
+    - for j from m - k to m - 1, pick a random slot t in 0..j - take t if it is new, j if it was already taken
+    - every row is sampled at once, so a draw is a few array operations of shape (number of hands,) for all hands
+    - the slots are mapped to card ids by skipping the cards that are not in the deck (the retained cards)
+
+    seed (optional) - the same seed gives the same hands
+    """
+    def __init__(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+
+    def sample(self, num_left, num_draw, max_draw):
+        """
+        Random slots without replacement - row i has num_draw[i] slots of 0..num_left[i]-1 (the rest of the row is -1)
+
+        Returns an int64 array with shape (number of rows, max_draw)
+        """
+        num_row = len(num_left)
+        slots = np.full((num_row, max_draw), -1, dtype=np.int64)
+        for i in range(max_draw):
+            active = i < num_draw
+            j = num_left - num_draw + i
+            t = (self.rng.random(num_row) * (j + 1)).astype(np.int64)
+            taken = (slots[:, :i] == t[:, None]).any(axis=1)
+            slots[:, i] = np.where(active, np.where(taken, j, t), -1)
+        return slots
+
+    def deal(self, num_hand, num_card=5):
+        """
+        Deal num_hand hands of num_card cards from full decks - int8 array with shape (num_hand, num_card)
+        """
+        slots = self.sample(np.full(num_hand, 52), np.full(num_hand, num_card), num_card)
+        return slots.astype(np.int8)
+
+    def mulligan(self, hands, retained_masks):
+        """
+        Mulligan every hand - the cards that are not retained go back to the deck and the same number are redrawn
+
+        - hands - card id array with shape (number of hands, 5)
+        - retained_masks - bit j is set if the j-th card of the hand is retained (same as BatchResult.retained_masks)
+        - the deck of a hand is the 52 cards without its retained cards (the discarded cards can be redrawn), same as Deck.mulligan
+
+        Returns a new hand array - the retained cards keep their position and the redrawn cards take the discarded positions
+        """
+        hands = np.asarray(hands, dtype=np.int8)
+        retained_masks = np.asarray(retained_masks, dtype=np.int64)
+        retained = (retained_masks[:, None] >> np.arange(5) & 1) == 1
+        num_retained = retained.sum(axis=1)
+
+        slots = self.sample(52 - num_retained, 5 - num_retained, 5)
+
+        # slot -> card id - every retained card at or below the id pushes it up by one (in increasing order)
+        retained_ids = np.sort(np.where(retained, hands, NOT_RETAINED), axis=1)
+        for j in range(5):
+            slots += slots >= retained_ids[:, j:j + 1]
+
+        # the k-th discarded position gets the k-th drawn card
+        discard_order = np.cumsum(~retained, axis=1) - 1
+        drawn = np.take_along_axis(slots, np.maximum(discard_order, 0), axis=1)
+        return np.where(retained, hands, drawn).astype(np.int8)
@@ -1,72 +1,188 @@
+import math
 import random
 import itertools
-from card import Card
+from card import Card, CARDS, SUIT_INDEX
+
+# Deck.position of a full deck - card id i is at slot i
+FULL_DECK_POSITION = list(range(52))
+FULL_DECK_MASK = (1 << 52) - 1
 
 class Deck:
-    def __init__(self):
-        self.cards = []
+    """
+    A poker deck - the last card is the top of the deck
+
+    The cards are kept so that dealing a specific card, membership, the number of cards left and copying do not scan the deck:
+    - slots - the cards in deck order, a dealt card in the middle of the deck is a None tombstone (removed on the next shuffle)
+    - position - slot index of every card id (-1 if the card is not in the deck)
+    - mask - 52 bit occupancy, bit card id is set if the card is in the deck
+    - num_card - number of cards left
+
+    seed (optional) - the deck shuffles and draws with its own random.Random(seed), so the same seed gives the same cards
+    - without a seed the random module is used
+    - a duplicate deck shares the random stream of its deck
+    """
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed) if seed is not None else random
         self.create_deck()
 
     def create_deck(self):
         """
         At init - create a full poker deck
         """
-        suits = ["♠️", "♥️", "♣️", "♦️"]
-        values = range(2, 15) 
-        for suit, value in itertools.product(suits, values):
-            self.cards.append(Card(suit, value))
+        # CARDS is already in suit then value order (card id 0..51)
+        self.slots = list(CARDS)
+        self.position = FULL_DECK_POSITION[:]
+        self.mask = FULL_DECK_MASK
+        self.num_card = 52
+
+    @property
+    def cards(self):
+        """
+        Cards left in deck order - a tuple, so changing it fails instead of silently not changing the deck
+
+        - it supports the reads of the old list (len, in, index, slices, iteration)
+        - change the deck with its methods (deal, deal_card, mulligan, put_back) or assign a list of cards to replace it
+        - every read copies the deck - use len(deck) and card in deck for the count and membership in hot code
+        """
+        if len(self.slots) != self.num_card:
+            self.compact()
+        return tuple(self.slots)
+
+    @cards.setter
+    def cards(self, card_list):
+        self.slots = []
+        self.position = [-1] * 52
+        self.mask = 0
+        self.num_card = 0
+        for card in card_list:
+            self.put_back(card)
+
+    def __len__(self):
+        return self.num_card
+
+    def __contains__(self, card):
+        return self.mask >> card.id & 1 == 1
+
+    def compact(self):
+        """
+        Remove the tombstones and update the position of every card
+        """
+        self.slots = [card for card in self.slots if card is not None]
+        for i, card in enumerate(self.slots):
+            self.position[card.id] = i
+
+    def put_back(self, card):
+        """
+        Put a card on top of the deck
+        """
+        if card in self:
+            raise ValueError(f"Card already in deck: {card}")
+        self.position[card.id] = len(self.slots)
+        self.slots.append(card)
+        self.mask |= 1 << card.id
+        self.num_card += 1
 
     def shuffle(self):
         """
         Shuffle deck 
         """
-        random.shuffle(self.cards)
+        self.slots = [card for card in self.slots if card is not None]
+        self.rng.shuffle(self.slots)
+        for i, card in enumerate(self.slots):
+            self.position[card.id] = i
 
     def showDeck(self):
         """
         print card in deck
         """
-        for card in self.cards:
-            print(str(card))
+        for card in self.slots:
+            if card is not None:
+                print(str(card))
 
     def deal(self):
         """
         Deal the last card of the deck
         """
-        if len(self.cards) > 0:
-            return self.cards.pop()
-        else:
+        if self.num_card == 0:
             return None
+
+        card = self.slots.pop()
+        while card is None:
+            card = self.slots.pop()
+        self.position[card.id] = -1
+        self.mask ^= 1 << card.id
+        self.num_card -= 1
+        return card
+
+    def deal_random(self, num_card):
+        """
+        Deal num_card random cards (fewer if the deck runs out) - partial Fisher-Yates, only the dealt cards are drawn
+
+        - the dealt cards are the same as shuffle and then num_card deals, without shuffling the rest of the deck
+        - each dealt card is swapped with the top card and popped, so the rest of the deck keeps its order except for the swapped cards
+        """
+        if len(self.slots) != self.num_card:
+            self.compact()
+
+        slots = self.slots
+        position = self.position
+        randrange = self.rng.randrange
+        dealt = []
+        for _ in range(min(num_card, self.num_card)):
+            last = len(slots) - 1
+            i = randrange(last + 1)
+            card = slots[i]
+            if i != last:
+                slots[i] = slots[last]
+                position[slots[i].id] = i
+            slots.pop()
+            position[card.id] = -1
+            self.mask ^= 1 << card.id
+            dealt.append(card)
+
+        self.num_card -= len(dealt)
+        return dealt
         
     def mulligan(self, mulligan_list):
         """
         Given a list of card to mulligan - return those card(s) to the deck and redraw the same num of discarded card
+
+        - the redraw is a partial shuffle (deal_random) - same odds as shuffling the deck and dealing
         """
-        redraw = []
         for card in mulligan_list:
-            self.cards.append(card)
-        self.shuffle()
-        for _ in range(len(mulligan_list)):
-            redraw.append(self.deal())
-        return redraw
+            self.put_back(card)
+        return self.deal_random(len(mulligan_list))
 
     def create_duplicate_deck(self):
         """
-        Create a copy of the deck
+        Create a copy of the deck - the state is copied instead of building a new deck
         """
-        new_deck = Deck()
-        new_deck.cards = self.cards[:]
+        new_deck = Deck.__new__(Deck)
+        new_deck.rng = self.rng
+        new_deck.slots = self.slots[:]
+        new_deck.position = self.position[:]
+        new_deck.mask = self.mask
+        new_deck.num_card = self.num_card
         return new_deck
 
     def deal_card(self, value, suit):
         """
         Given a value and a suit, deal a specific card from the deck
         """
-        for card in self.cards:
-            if card.value == value and card.suit == suit:
-                self.cards.remove(card)
-                return card
-        return None
+        if suit not in SUIT_INDEX or value not in range(2, 15):
+            return None
+        card = Card(suit, value)
+        if self.mask >> card.id & 1 == 0:
+            return None
+
+        self.slots[self.position[card.id]] = None
+        self.position[card.id] = -1
+        self.mask ^= 1 << card.id
+        self.num_card -= 1
+        # the tombstones are never more than the cards left
+        if len(self.slots) > 2 * self.num_card:
+            self.compact()
+        return card
     
     def generate_all_iteration(self):
         """
@@ -76,4 +192,76 @@ class Deck:
         all_iteration_list = [list(hand) for hand in all_iteration]
 
         return all_iteration_list
+
+    def stream_all_iteration(self, start=0, stop=None, chunk_size=None):
+        """
+        Same hands in the same order as generate_all_iteration but yielded one at a time - constant memory
+
+        - start / stop - lex index (position in generate_all_iteration) of the first hand and the hand to stop before
+            - not the colex rank of hand_index.rank_hand - use hand_index.iter_hand_ids for the mulligan table order
+            - the first hand is found from its index (unrank_combination) without generating the hands before it
+        - chunk_size - yield lists of chunk_size hands instead of single hands (the last list can be shorter)
+        """
+        hands = self.iterate_combination(start, stop)
+        if chunk_size is None:
+            yield from hands
+            return
+
+        while True:
+            chunk = list(itertools.islice(hands, chunk_size))
+            if len(chunk) == 0:
+                return
+            yield chunk
+
+    def iterate_combination(self, start=0, stop=None):
+        """
+        Generate the 5 card hands of the deck from lex index start to stop in itertools.combinations order
+
+        - the hands are from the cards in the deck when the generator starts (dealing from the deck does not change them)
+        """
+        cards = self.cards
+        num_card = len(cards)
+        total = math.comb(num_card, 5)
+        stop = total if stop is None else min(stop, total)
+        if start >= stop:
+            return
+
+        positions = unrank_combination(start, num_card, 5)
+        for _ in range(stop - start):
+            yield [cards[i] for i in positions]
+
+            # next combination - increment the last position that is not at its max and reset the positions after it
+            i = 4
+            while i >= 0 and positions[i] == num_card - 5 + i:
+                i -= 1
+            if i < 0:
+                return
+            positions[i] += 1
+            for j in range(i + 1, 5):
+                positions[j] = positions[j - 1] + 1
+
+def unrank_combination(index, n, k):
+    """
+    Positions (0..n-1) of the index-th k combination of n items in itertools.combinations (lexicographic) order
+
+    - the lex index of Deck.generate_all_iteration - hand_index.unrank_hand is the colex rank of the hand tables
+
+    ie: unrank_combination(0, 52, 5) -> [0, 1, 2, 3, 4], unrank_combination(1, 52, 5) -> [0, 1, 2, 3, 5]
+    """
+    if not 0 <= index < math.comb(n, k):
+        raise ValueError(f"Invalid combination index: {index}")
+
+    positions = []
+    position = 0
+    for remaining in range(k, 0, -1):
+        # number of combinations that start with this position
+        count = math.comb(n - position - 1, remaining - 1)
+        while index >= count:
+            index -= count
+            position += 1
+            count = math.comb(n - position - 1, remaining - 1)
+        positions.append(position)
+        position += 1
+
+    return positions
     
@@ -0,0 +1,162 @@
+import array
+import itertools
+from card import CARDS
+
+# same order as Player.generate_method_list - the index is the combo's category
+CATEGORY_NAMES = ["high card", "one pair", "two pair", "three of a kind", "straight", "flush", "full house", "four of a kind", "straight flush", "royal flush"]
+HIGH_CARD, ONE_PAIR, TWO_PAIR, THREE_OF_A_KIND, STRAIGHT, FLUSH, FULL_HOUSE, FOUR_OF_A_KIND, STRAIGHT_FLUSH, ROYAL_FLUSH = range(10)
+
+# strength = category << CATEGORY_SHIFT | tiebreak
+# the biggest category (high card) has 1278 tiebreak ranks so 12 bits is enough
+CATEGORY_SHIFT = 12
+
+# excluding steel wheel A-2-3-4-5
+CONSECUTIVE_VALUE_COMBOS = [(i, i+1, i+2, i+3, i+4) for i in range(2, 11)]
+
+def classify_values(values, same_suit):
+    """
+    Classify 5 card values the same way as the Player.is_* methods
+
+    Returns (category, tiebreak key)
+    - category is the index in CATEGORY_NAMES
+    - tiebreak key is a tuple of values that compare the same way as the calc_total_better_* methods
+        - unique values ordered by count and then by value - XXXYY -> (X, Y), XXYZA -> (X, Y, Z, A)
+        - higher tuple is the better hand within the same category
+    """
+    counts = {}
+    for val in values:
+        counts[val] = counts.get(val, 0) + 1
+
+    key = tuple(sorted(counts, key=lambda val: (counts[val], val), reverse=True))
+    count_list = sorted(counts.values(), reverse=True)
+    straight = tuple(sorted(values)) in CONSECUTIVE_VALUE_COMBOS
+
+    if straight and same_suit:
+        if max(values) == 14:
+            return (ROYAL_FLUSH, key)
+        return (STRAIGHT_FLUSH, key)
+    if count_list == [4, 1]:
+        return (FOUR_OF_A_KIND, key)
+    if count_list == [3, 2]:
+        return (FULL_HOUSE, key)
+    if same_suit:
+        return (FLUSH, key)
+    if straight:
+        return (STRAIGHT, key)
+    if count_list == [3, 1, 1]:
+        return (THREE_OF_A_KIND, key)
+    if count_list == [2, 2, 1]:
+        return (TWO_PAIR, key)
+    if count_list == [2, 1, 1, 1]:
+        return (ONE_PAIR, key)
+    return (HIGH_CARD, key)
+
+def generate_strength_map():
+    """
+    Generate the strength of every distinct 5 card value combination
+
+    - all value combinations with at most 4 of the same value (6175)
+    - all value combinations without repeat can also be same suit (1287)
+    - rank the tiebreak key within each category
+
+    Returns {(sorted values, same suit): strength}
+    """
+    by_category = [[] for _ in CATEGORY_NAMES]
+
+    for values in itertools.combinations_with_replacement(range(2, 15), 5):
+        if any(values.count(val) > 4 for val in values):
+            continue
+        suit_options = [False, True] if len(set(values)) == 5 else [False]
+        for same_suit in suit_options:
+            category, key = classify_values(values, same_suit)
+            by_category[category].append((key, values, same_suit))
+
+    strength_map = {}
+    for category, entries in enumerate(by_category):
+        entries.sort()
+        for tiebreak, (key, values, same_suit) in enumerate(entries):
+            strength_map[(values, same_suit)] = category << CATEGORY_SHIFT | tiebreak
+
+    return strength_map
+
+STRENGTH_MAP = generate_strength_map()
+
+def category_of(strength):
+    """
+    Return the category (index in CATEGORY_NAMES) of a strength
+    """
+    return strength >> CATEGORY_SHIFT
+
+def hand_strength(card_list):
+    """
+    Return the strength of a 5 card hand - a higher strength is a better hand
+    """
+    values = tuple(sorted(card.value for card in card_list))
+    same_suit = len({card.suit_id for card in card_list}) == 1
+    return STRENGTH_MAP[(values, same_suit)]
+
+# region prime product evaluator
+# each value is a prime so the product of 5 values is unique to the value combination (order does not matter)
+PRIMES = {2: 2, 3: 3, 4: 5, 5: 7, 6: 11, 7: 13, 8: 17, 9: 19, 10: 23, 11: 29, 12: 31, 13: 37, 14: 41}
+
+# per card id - value bit (bit 0 is 2 and bit 12 is Ace) and value prime
+CARD_BITS = [1 << (card.value - 2) for card in CARDS]
+CARD_PRIMES = [PRIMES[card.value] for card in CARDS]
+
+# the best strength is royal flush (9 << 12) so 0xFFFF is never a strength
+NOT_UNIQUE = 0xFFFF
+
+class PrimeEvaluator:
+    """
+    Hand evaluator without a large table - same strength as hand_strength and HandRankTable
+
+    - the 5 value bits are OR together into a 13 bit mask (8192 possible)
+    - flush -> flush_table[mask]
+    - 5 unique values -> unique_table[mask]
+    - any repeat value (pair, triple, ...) -> paired[product of value primes]
+    """
+    def __init__(self):
+        self.flush_table = array.array("H", [0] * 8192)
+        # NOT_UNIQUE - mask with less than 5 values
+        self.unique_table = array.array("H", [NOT_UNIQUE] * 8192)
+        self.paired = {}
+
+        for (values, same_suit), strength in STRENGTH_MAP.items():
+            mask = 0
+            product = 1
+            for val in values:
+                mask |= 1 << (val - 2)
+                product *= PRIMES[val]
+
+            if same_suit:
+                self.flush_table[mask] = strength
+            elif len(set(values)) == 5:
+                self.unique_table[mask] = strength
+            else:
+                self.paired[product] = strength
+
+    def strength(self, card_list):
+        """
+        Return the strength of a 5 card hand - a higher strength is a better hand
+        """
+        c1, c2, c3, c4, c5 = [card.id for card in card_list]
+        mask = CARD_BITS[c1] | CARD_BITS[c2] | CARD_BITS[c3] | CARD_BITS[c4] | CARD_BITS[c5]
+
+        # card id // 13 is the suit
+        suit = c1 // 13
+        if suit == c2 // 13 == c3 // 13 == c4 // 13 == c5 // 13:
+            return self.flush_table[mask]
+
+        strength = self.unique_table[mask]
+        if strength != NOT_UNIQUE:
+            return strength
+
+        return self.paired[CARD_PRIMES[c1] * CARD_PRIMES[c2] * CARD_PRIMES[c3] * CARD_PRIMES[c4] * CARD_PRIMES[c5]]
+
+    def category(self, card_list):
+        """
+        Return the category (index in CATEGORY_NAMES) of a 5 card hand
+        """
+        return self.strength(card_list) >> CATEGORY_SHIFT
+
+# endregion prime product evaluator
@@ -0,0 +1,86 @@
+import math
+import bisect
+
+TOTAL_HANDS = math.comb(52, 5)
+
+# BINOMIAL[n][k] = math.comb(n, k) for n in 0..52 and k in 0..5
+BINOMIAL = [[math.comb(n, k) for k in range(6)] for n in range(53)]
+
+# BINOMIAL_COLUMN[k] = [comb(0, k), comb(1, k), ... comb(51, k)] - sorted, for the unrank binary search
+BINOMIAL_COLUMN = [[BINOMIAL[n][k] for n in range(52)] for k in range(6)]
+
+# TOTAL_HOLDS[k] - number of k card holds of the 52 cards
+TOTAL_HOLDS = [math.comb(52, k) for k in range(5)]
+
+def rank_hand(card_ids):
+    """
+    Combinatorial (colex) rank of a 5 card hand
+
+    - card_ids can be in any order
+    - sorted ids c1 < c2 < c3 < c4 < c5 -> comb(c1,1) + comb(c2,2) + comb(c3,3) + comb(c4,4) + comb(c5,5)
+    - every hand gets a unique rank in 0..2,598,959
+    - the index of mulligan_table, hand_rank_table and shard - not the lex index of Deck.generate_all_iteration (itertools.combinations order)
+    """
+    c1, c2, c3, c4, c5 = sorted(card_ids)
+    return BINOMIAL[c1][1] + BINOMIAL[c2][2] + BINOMIAL[c3][3] + BINOMIAL[c4][4] + BINOMIAL[c5][5]
+
+def iter_hand_ids(start=0, stop=TOTAL_HANDS):
+    """
+    Generate the sorted card ids of every 5 card hand in rank order (rank start, start + 1, ... stop - 1)
+
+    - the first hand is found from its rank (unrank_hand) without generating the hands before it
+    """
+    stop = min(stop, TOTAL_HANDS)
+    if start >= stop:
+        return
+
+    card_ids = list(unrank_hand(start))
+    for _ in range(stop - start):
+        yield tuple(card_ids)
+
+        # next hand - increment the lowest card that can move up and reset the cards below it to 0, 1, 2, ...
+        i = 0
+        while i < 4 and card_ids[i] + 1 == card_ids[i + 1]:
+            i += 1
+        card_ids[i] += 1
+        for j in range(i):
+            card_ids[j] = j
+
+def unrank_hand(rank):
+    """
+    Sorted card ids of the hand with this colex rank - the inverse of rank_hand
+    """
+    if not 0 <= rank < TOTAL_HANDS:
+        raise ValueError(f"Invalid hand rank: {rank}")
+    return unrank_ids(rank, 5)
+
+def rank_hold(card_ids):
+    """
+    Combinatorial (colex) rank of a 0 to 4 card hold - same formula as rank_hand with one term per card
+
+    - every k card hold gets a unique rank in 0..comb(52, k)-1 (the empty hold is 0)
+    """
+    if len(card_ids) > 4:
+        raise ValueError(f"Invalid hold size: {len(card_ids)}")
+    return sum(BINOMIAL[card_id][k] for k, card_id in enumerate(sorted(card_ids), 1))
+
+def unrank_hold(rank, num_card):
+    """
+    Sorted card ids of the num_card card hold with this colex rank - the inverse of rank_hold
+    """
+    if not 0 <= num_card <= 4:
+        raise ValueError(f"Invalid hold size: {num_card}")
+    if not 0 <= rank < TOTAL_HOLDS[num_card]:
+        raise ValueError(f"Invalid hold rank: {rank}")
+    return unrank_ids(rank, num_card)
+
+def unrank_ids(rank, num_card):
+    """
+    Greedy colex unrank - from the highest card, the largest id c with comb(c, k) <= rank
+    """
+    card_ids = []
+    for k in range(num_card, 0, -1):
+        card_id = bisect.bisect_right(BINOMIAL_COLUMN[k], rank) - 1
+        rank -= BINOMIAL[card_id][k]
+        card_ids.append(card_id)
+    return tuple(reversed(card_ids))
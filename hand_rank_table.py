@@ -0,0 +1,72 @@
+import os
+import sys
+import mmap
+import array
+from card import CARDS
+from evaluator import STRENGTH_MAP, CATEGORY_SHIFT
+from hand_index import TOTAL_HANDS, rank_hand, iter_hand_ids
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hand_rank_table.bin")
+
+def build_hand_rank_table(path=TABLE_PATH):
+    """
+    Build the strength of all 2,598,960 hands and save it as a binary file
+
+    - one uint16 (native byte order) per hand, indexed by hand_index.rank_hand
+    - strength = category << CATEGORY_SHIFT | tiebreak (see evaluator.py)
+    """
+    values = [card.value for card in CARDS]
+    suits = [card.suit_id for card in CARDS]
+
+    table = array.array("H")
+    for ids in iter_hand_ids():
+        hand_values = tuple(sorted([values[i] for i in ids]))
+        same_suit = len({suits[i] for i in ids}) == 1
+        table.append(STRENGTH_MAP[(hand_values, same_suit)])
+
+    with open(path, "wb") as file:
+        table.tofile(file)
+
+    return path
+
+class HandRankTable:
+    """
+    Strength of every 5 card hand loaded from the file made by build_hand_rank_table
+
+    The file is mapped with mmap so classifying a hand is one index lookup and several processes share the same memory
+    """
+    def __init__(self, path=TABLE_PATH):
+        with open(path, "rb") as file:
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.table = memoryview(self.mmap).cast("H")
+
+        if len(self.table) != TOTAL_HANDS:
+            self.close()
+            raise ValueError(f"Invalid hand rank table: {path}")
+
+    def strength(self, card_list):
+        """
+        Return the strength of a 5 card hand - a higher strength is a better hand
+        """
+        return self.table[rank_hand([card.id for card in card_list])]
+
+    def category(self, card_list):
+        """
+        Return the category (index in evaluator.CATEGORY_NAMES) of a 5 card hand
+        """
+        return self.table[rank_hand([card.id for card in card_list])] >> CATEGORY_SHIFT
+
+    def close(self):
+        self.table.release()
+        self.mmap.close()
+
+def load_hand_rank_table(path=TABLE_PATH):
+    """
+    Load the hand rank table - return None when the file was never built
+    """
+    if not os.path.exists(path):
+        return None
+    return HandRankTable(path)
+
+if __name__ == "__main__":
+    print(f"Building hand rank table: {build_hand_rank_table(*sys.argv[1:2])}")
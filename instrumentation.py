@@ -0,0 +1,95 @@
+import json
+import time
+import functools
+import itertools
+
+# player methods timed as a stage - every calc_*_total_combination and calc_total_better_* is added by name (see stage_names)
+STAGE_METHODS = ["generate_all_retained_hand_combination", "generate_method_list"]
+
+def stage_names(player):
+    """
+    Name of every player method that is timed as a stage
+    """
+    names = list(STAGE_METHODS)
+    for name in dir(type(player)):
+        if (name.startswith("calc_") and name.endswith("_total_combination") and name != "calc_total_combination") or name.startswith("calc_total_better_"):
+            names.append(name)
+    return names
+
+class Instrumentation:
+    """
+    Wall time, calls and itertools combinations of every solver stage (opt-in - Player(instrumentation=Instrumentation()))
+
+    - stages - {method name: {"calls", "time_ns", "combinations"}}
+        - time_ns includes the stages called inside it and the LRU cache lookup (cache hits are calls too - see Player.cache_stats)
+        - combinations - items enumerated from itertools.combinations / itertools.product inside the stage (not counting the stages it calls)
+    - a player without instrumentation keeps its plain methods - nothing is timed or counted
+    """
+    def __init__(self):
+        self.stages = {}
+        # stages that are running - the innermost one gets the combinations
+        self.running = []
+
+    def instrument(self, player):
+        """
+        Replace the stage methods and the itertools functions of one player with timed / counted versions
+        """
+        for name in stage_names(player):
+            setattr(player, name, self.wrap(name, getattr(player, name)))
+        player.combinations = self.count(itertools.combinations)
+        player.product = self.count(itertools.product)
+
+    def get_stage(self, name):
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = {"calls": 0, "time_ns": 0, "combinations": 0}
+            self.stages[name] = stage
+        return stage
+
+    def wrap(self, name, method):
+        """
+        method timed as the name stage
+        """
+        stage = self.get_stage(name)
+
+        @functools.wraps(method)
+        def wrapper(*args):
+            self.running.append(stage)
+            start = time.perf_counter_ns()
+            try:
+                return method(*args)
+            finally:
+                stage["time_ns"] += time.perf_counter_ns() - start
+                stage["calls"] += 1
+                self.running.pop()
+
+        return wrapper
+
+    def count(self, function):
+        """
+        function (itertools.combinations / itertools.product) that counts every item it yields in the running stage
+        """
+        @functools.wraps(function)
+        def wrapper(*args):
+            stage = self.running[-1] if len(self.running) > 0 else self.get_stage("other")
+            for item in function(*args):
+                stage["combinations"] += 1
+                yield item
+
+        return wrapper
+
+    def reset(self):
+        for stage in self.stages.values():
+            stage["calls"] = 0
+            stage["time_ns"] = 0
+            stage["combinations"] = 0
+
+    def stats(self):
+        """
+        Copy of every stage that was called - {name: {"calls", "time_ns", "combinations"}}, slowest first
+        """
+        stages = [(name, dict(stage)) for name, stage in self.stages.items() if stage["calls"] > 0 or stage["combinations"] > 0]
+        return dict(sorted(stages, key=lambda item: item[1]["time_ns"], reverse=True))
+
+    def to_json(self, indent=2):
+        return json.dumps(self.stats(), indent=indent)
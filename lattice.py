@@ -0,0 +1,183 @@
+import math
+import bisect
+import itertools
+from evaluator import STRENGTH_MAP, CATEGORY_NAMES, CATEGORY_SHIFT, hand_strength, category_of
+from result import HoldResult, HoldDistribution, MulliganResult
+from player import RETAINED_HAND_POSITIONS, TOTAL_COMBINATIONS
+
+# DRAW_VALUES[k] - every multiset of k values as ((value, count), ...) - the values of k drawn cards
+DRAW_VALUES = [
+    [tuple((val, values.count(val)) for val in sorted(set(values))) for values in itertools.combinations_with_replacement(range(2, 15), k)]
+    for k in range(6)
+]
+
+# COMB[n][k] = math.comb(n, k) for n in 0..4 and k in 0..5 (cards of a value left in the deck, cards of the value drawn)
+COMB = [[math.comb(n, k) for k in range(6)] for n in range(5)]
+
+# hold suit state - the suit id if all of the retained cards are the same suit
+NO_SUIT = -1
+MIXED_SUIT = -2
+
+class HoldState:
+    """
+    What the evaluator needs to know about a retained hand - built from its parent (the retained hand without its last card)
+
+    - counts - number of retained cards of each value (index 0 is 2 and index 12 is Ace) - the deck has 4 - counts[i] of the value left
+    - values - retained values sorted
+    - suit - suit id of the retained cards, NO_SUIT if empty or MIXED_SUIT
+    """
+    __slots__ = ("counts", "values", "suit")
+
+    def __init__(self, counts, values, suit):
+        self.counts = counts
+        self.values = values
+        self.suit = suit
+
+    def add(self, card):
+        """
+        State of this retained hand + card
+        """
+        counts = list(self.counts)
+        counts[card.value - 2] += 1
+
+        if self.suit == NO_SUIT:
+            suit = card.suit_id
+        elif self.suit == card.suit_id:
+            suit = self.suit
+        else:
+            suit = MIXED_SUIT
+
+        return HoldState(tuple(counts), tuple(sorted(self.values + (card.value,))), suit)
+
+EMPTY_HOLD = HoldState((0,) * 13, (), NO_SUIT)
+
+class LatticeEvaluator:
+    """
+    Exact better combination of all 31 retained hands without the calc_* methods - same answer as calc_percent_of_better_combination
+
+    The retained hands are a subset lattice, walked from 0 to 4 cards:
+    - the state of a retained hand (HoldState) is its parent's state + 1 card, no value/count list is built per retained hand
+    - every redraw is grouped by its values (DRAW_VALUES) - ways to draw them = product of comb(cards of the value left, cards drawn)
+    - flush - the drawn values are all different and not retained, so there is exactly 1 card of the retained suit for each
+        - 1 flush per value combination if the retained hand is one suit, 4 (one per suit) if it is empty, 0 if it is mixed
+    - the strength (evaluator.STRENGTH_MAP) and ways of every completion only depend on the retained values and if they are one suit
+        - they are cached sorted by strength with the number of ways that are at least as strong - the better combination is one bisect
+    """
+    def __init__(self):
+        # {(retained values, same suit): (sorted strengths, ways at least as strong as each strength + [0])}
+        self.completion_cache = {}
+
+    def generate_hold_states(self, given_hand):
+        """
+        State of every retained hand in generate_all_retained_hand_combination order
+        """
+        states = {(): EMPTY_HOLD}
+        for positions in RETAINED_HAND_POSITIONS[1:]:
+            states[positions] = states[positions[:-1]].add(given_hand[positions[-1]])
+        return [states[positions] for positions in RETAINED_HAND_POSITIONS]
+
+    def calc_completion(self, state):
+        """
+        Every 5 card hand that can be made from the retained hand as (sorted strengths, ways at least as strong + [0]) - cached
+        """
+        same_suit = state.suit != MIXED_SUIT
+        key = (state.values, same_suit)
+        completion = self.completion_cache.get(key)
+        if completion is not None:
+            return completion
+
+        num_flush = 0
+        if state.suit == NO_SUIT:
+            num_flush = 4
+        elif same_suit:
+            num_flush = 1
+
+        ways = {}
+        for draw in DRAW_VALUES[5 - len(state.values)]:
+            num_way = 1
+            for (val, num_draw) in draw:
+                num_way *= COMB[4 - state.counts[val - 2]][num_draw]
+            if num_way == 0:
+                continue
+
+            values = tuple(sorted(state.values + tuple(val for (val, num_draw) in draw for _ in range(num_draw))))
+            if num_flush > 0 and len(set(values)) == 5:
+                flush_strength = STRENGTH_MAP[(values, True)]
+                ways[flush_strength] = ways.get(flush_strength, 0) + num_flush
+                num_way -= num_flush
+
+            strength = STRENGTH_MAP[(values, False)]
+            ways[strength] = ways.get(strength, 0) + num_way
+
+        strengths = sorted(ways)
+        at_least = [0] * (len(strengths) + 1)
+        for i in range(len(strengths) - 1, -1, -1):
+            at_least[i] = at_least[i + 1] + ways[strengths[i]]
+
+        completion = (strengths, at_least)
+        self.completion_cache[key] = completion
+        return completion
+
+    def calc_all_better_combination(self, given_hand):
+        """
+        HoldResult (better combination, total combination) of every retained hand in generate_all_retained_hand_combination order
+        """
+        given_strength = hand_strength(given_hand)
+
+        holds = []
+        for positions, state in zip(RETAINED_HAND_POSITIONS, self.generate_hold_states(given_hand)):
+            (strengths, at_least) = self.calc_completion(state)
+            better_combination = at_least[bisect.bisect_right(strengths, given_strength)]
+            holds.append(HoldResult([given_hand[i] for i in positions], better_combination, TOTAL_COMBINATIONS[5 - len(positions)]))
+
+        return holds
+
+    def calc_distribution(self, state, given_strength):
+        """
+        (combinations of each combo, better, equal, worse) of one retained hand from its cached completion
+
+        - the completion is sorted by strength, so every combo is a range of it - found by bisect on category << CATEGORY_SHIFT
+        - better / equal / worse are ranges of the given hand's combo
+        """
+        (strengths, at_least) = self.calc_completion(state)
+
+        starts = [bisect.bisect_left(strengths, category << CATEGORY_SHIFT) for category in range(len(CATEGORY_NAMES) + 1)]
+        category_combinations = tuple(at_least[starts[category]] - at_least[starts[category + 1]] for category in range(len(CATEGORY_NAMES)))
+
+        category = category_of(given_strength)
+        equal_start = bisect.bisect_left(strengths, given_strength)
+        better_start = bisect.bisect_right(strengths, given_strength)
+        better = at_least[better_start] - at_least[starts[category + 1]]
+        equal = at_least[equal_start] - at_least[better_start]
+        worse = at_least[starts[category]] - at_least[equal_start]
+
+        return (category_combinations, better, equal, worse)
+
+    def calc_all_distribution(self, given_hand):
+        """
+        HoldDistribution of every retained hand in generate_all_retained_hand_combination order
+
+        - the full combo distribution of every redraw and the better / equal / worse split of the given hand's combo
+        - same walk and completion cache as calc_all_better_combination - HoldDistribution.better_combination is the same count
+        """
+        given_strength = hand_strength(given_hand)
+        category = category_of(given_strength)
+
+        distributions = []
+        for positions, state in zip(RETAINED_HAND_POSITIONS, self.generate_hold_states(given_hand)):
+            (category_combinations, better, equal, worse) = self.calc_distribution(state, given_strength)
+            distributions.append(HoldDistribution([given_hand[i] for i in positions], category, category_combinations, better, equal, worse, TOTAL_COMBINATIONS[5 - len(positions)]))
+
+        return distributions
+
+    def calc_all_percent_of_better_combination(self, given_hand):
+        """
+        Better hand probability of every retained hand - same as calc_percent_of_better_combination
+        """
+        return [hold.probability for hold in self.calc_all_better_combination(given_hand)]
+
+    def solve(self, given_hand):
+        """
+        Same as Player.solve - MulliganResult with every retained hand ranked
+        """
+        return MulliganResult(given_hand, category_of(hand_strength(given_hand)), self.calc_all_better_combination(given_hand))
@@ -1,5 +1,6 @@
 from deck import Deck
 from player import Player
+from render import render_result
 
 def demo():
     # setup game
@@ -15,8 +16,9 @@ def demo():
 
     # calc best probabilities and best retained hand
     print("Generate and calculating all retained hand possibilities and their better hand probabilities\n")
-    (best_retained_hand, best_probabilities) = player.find_best_retained_hand(player.hand, print_result=True)
+    result = player.solve(player.hand)
+    render_result(result, show_holds=True)
 
-    return best_probabilities
+    return result.probability
 
 demo()
\ No newline at end of file
@@ -0,0 +1,108 @@
+import math
+import statistics
+import numpy as np
+from brute_force import VectorEvaluator
+from evaluator import category_of
+from result import HoldEstimate, MulliganResult
+from player import RETAINED_HAND_POSITIONS
+
+# redraws sampled per retained hand per round
+BATCH_SIZE = 2000
+# stop sampling a retained hand after this many redraws, even if it is not separated (ie: 2 retained hands with the same probability)
+MAX_SAMPLES = 50000
+
+def wilson_interval(successes, samples, z):
+    """
+    Wilson score interval of successes / samples - (low, high)
+    """
+    if samples == 0:
+        return (0.0, 1.0)
+
+    p = successes / samples
+    denominator = 1 + z * z / samples
+    center = (p + z * z / (2 * samples)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / samples + z * z / (4 * samples * samples)) / denominator
+    return (max(0.0, center - margin), min(1.0, center + margin))
+
+class MonteCarloEstimator:
+    """
+    Estimate the better hand probability of every retained hand by sampling redraws - no calc_* method is needed
+
+    - each round samples batch_size redraws for every retained hand still in the race, evaluated at once (brute_force.VectorEvaluator)
+        - a redraw is the k smallest of one uniform random number per card left in the deck - a uniform k card combination
+    - every retained hand has a Wilson interval after every round
+        - a retained hand whose interval is below the best retained hand's interval is out of the race
+        - sampling stops when only the best retained hand is left or it has max_samples redraws
+    - confidence is for the whole race, not for one interval - the intervals are Bonferroni adjusted (z)
+        - the race looks at 31 retained hands after each of up to max_samples / batch_size rounds
+        - each interval is at 1 - (1 - confidence) / (31 * number of rounds), so every interval of every round
+          holds at once with probability >= confidence - the exact best retained hand is then never out of the race
+        - retained hands closer than the intervals can separate in max_samples redraws all stay in the race to the end
+    - the same seed always gives the same estimates
+
+    vector_evaluator (optional) - anything with strength(hand_ids) for an (n, 5) card id array, ie: a variant rule set
+    """
+    def __init__(self, seed=None, confidence=0.95, batch_size=BATCH_SIZE, max_samples=MAX_SAMPLES, vector_evaluator=None):
+        if not 0 < confidence < 1:
+            raise ValueError(f"Invalid confidence: {confidence}")
+        if batch_size <= 0 or max_samples < batch_size:
+            raise ValueError(f"Invalid batch size: {batch_size} (max samples: {max_samples})")
+
+        self.rng = np.random.default_rng(seed)
+        self.confidence = confidence
+        self.batch_size = batch_size
+        self.max_samples = max_samples
+        # number of intervals the race can look at - every retained hand after every round
+        num_interval = len(RETAINED_HAND_POSITIONS) * math.ceil(max_samples / batch_size)
+        self.z = statistics.NormalDist().inv_cdf(1 - (1 - confidence) / (2 * num_interval))
+        self.evaluator = vector_evaluator if vector_evaluator is not None else VectorEvaluator()
+
+    def sample_better(self, given_strength, retained_ids, deck_ids, num_sample):
+        """
+        Number of num_sample random redraws of the retained hand that are stronger than given_strength
+        """
+        num_card_to_draw = 5 - len(retained_ids)
+        keys = self.rng.random((num_sample, len(deck_ids)))
+        redraw = deck_ids[np.argpartition(keys, num_card_to_draw - 1, axis=1)[:, :num_card_to_draw]]
+
+        hands = np.empty((num_sample, 5), dtype=np.int16)
+        hands[:, :len(retained_ids)] = retained_ids
+        hands[:, len(retained_ids):] = redraw
+        return int((self.evaluator.strength(hands) > given_strength).sum())
+
+    def estimate(self, given_hand):
+        """
+        MulliganResult (result.py) of every retained hand with a HoldEstimate - same order as Player.solve
+        """
+        given_ids = [card.id for card in given_hand]
+        given_strength = self.evaluator.strength(np.array([given_ids]))[0]
+
+        retained_ids = []
+        deck_ids = []
+        for positions in RETAINED_HAND_POSITIONS:
+            retained = [given_ids[i] for i in positions]
+            retained_ids.append(retained)
+            deck_ids.append(np.array([card_id for card_id in range(52) if card_id not in retained], dtype=np.int16))
+
+        num_hold = len(RETAINED_HAND_POSITIONS)
+        successes = [0] * num_hold
+        samples = [0] * num_hold
+        intervals = [(0.0, 1.0)] * num_hold
+        racing = list(range(num_hold))
+
+        while True:
+            for i in racing:
+                successes[i] += self.sample_better(given_strength, retained_ids[i], deck_ids[i], self.batch_size)
+                samples[i] += self.batch_size
+                intervals[i] = wilson_interval(successes[i], samples[i], self.z)
+
+            best = max(racing, key=lambda i: successes[i] / samples[i])
+            racing = [i for i in racing if intervals[i][1] >= intervals[best][0]]
+            if len(racing) == 1 or samples[best] >= self.max_samples:
+                break
+
+        holds = [
+            HoldEstimate([given_hand[j] for j in positions], successes[i], samples[i], intervals[i][0], intervals[i][1])
+            for i, positions in enumerate(RETAINED_HAND_POSITIONS)
+        ]
+        return MulliganResult(given_hand, category_of(int(given_strength)), holds)
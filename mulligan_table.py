@@ -0,0 +1,110 @@
+import os
+import mmap
+import struct
+import argparse
+from card import CARDS
+from player import Player
+from result import NO_RETAINED_HAND
+from hand_index import TOTAL_HANDS, rank_hand, iter_hand_ids
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mulligan_table.bin")
+
+# one record per hand - retained hand mask, better combination, total combination
+RECORD = struct.Struct("<BII")
+
+# retained hand mask - bit i is the i-th card of the hand sorted by card id
+# NO_RETAINED_HAND - no retained hand can make a better hand (find_best_retained_hand returns None) - same as BatchResult
+# NOT_BUILT - the hand has not been calculated yet
+NOT_BUILT = 0xFF
+
+def build_mulligan_table(path=TABLE_PATH, start=0, stop=TOTAL_HANDS, player=None):
+    """
+    Calculate the best retained hand of every hand in rank order (hand_index.rank_hand) from start to stop and save it in the table file
+
+    - the file always has a record for all 2,598,960 hands, hands that are not built yet are NOT_BUILT
+    - an existing file is updated so the table can be built in parts
+    - the player should cache retained hands - each suit isomorphic class is then only calculated once
+    """
+    if player is None:
+        player = Player(cache_retained_hand=True)
+
+    if not os.path.exists(path):
+        with open(path, "wb") as file:
+            empty = RECORD.pack(NOT_BUILT, 0, 0) * 10000
+            for _ in range(TOTAL_HANDS // 10000):
+                file.write(empty)
+            file.write(RECORD.pack(NOT_BUILT, 0, 0) * (TOTAL_HANDS % 10000))
+
+    records = bytearray()
+    for ids in iter_hand_ids(start, stop):
+        given_hand = [CARDS[card_id] for card_id in ids]
+        (best_retained_hand, better_combination, total_combination) = player.lookup_best_retained_hand(given_hand)
+        records += RECORD.pack(retained_hand_mask(given_hand, best_retained_hand), better_combination, total_combination)
+
+    with open(path, "r+b") as file:
+        file.seek(start * RECORD.size)
+        file.write(records)
+
+    return path
+
+def retained_hand_mask(given_hand, retained_hand):
+    """
+    5 bit mask of the retained hand - bit i is the i-th card of the given hand sorted by card id
+    """
+    if retained_hand is None:
+        return NO_RETAINED_HAND
+
+    sorted_hand = sorted(given_hand, key=lambda card: card.id)
+    mask = 0
+    for card in retained_hand:
+        mask |= 1 << sorted_hand.index(card)
+    return mask
+
+class MulliganTable:
+    """
+    Best retained hand of every 5 card hand loaded from the file made by build_mulligan_table (mmap)
+    """
+    def __init__(self, path=TABLE_PATH):
+        with open(path, "rb") as file:
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self.mmap) != TOTAL_HANDS * RECORD.size:
+            self.close()
+            raise ValueError(f"Invalid mulligan table: {path}")
+
+    def lookup(self, given_hand):
+        """
+        Return (best retained hand, better combination, total combination) - same as Player.calc_best_retained_hand
+
+        Return None if the hand is not built yet
+        """
+        sorted_hand = sorted(given_hand, key=lambda card: card.id)
+        (mask, better_combination, total_combination) = RECORD.unpack_from(self.mmap, rank_hand([card.id for card in sorted_hand]) * RECORD.size)
+
+        if mask == NOT_BUILT:
+            return None
+        if mask == NO_RETAINED_HAND:
+            return (None, better_combination, total_combination)
+
+        retained_hand = [card for i, card in enumerate(sorted_hand) if mask & (1 << i)]
+        return (retained_hand, better_combination, total_combination)
+
+    def close(self):
+        self.mmap.close()
+
+def load_mulligan_table(path=TABLE_PATH):
+    """
+    Load the mulligan table - return None when the file was never built
+    """
+    if not os.path.exists(path):
+        return None
+    return MulliganTable(path)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the best retained hand of every 5 card hand")
+    parser.add_argument("path", nargs="?", default=TABLE_PATH)
+    parser.add_argument("--start", type=int, default=0, help="first hand rank to build")
+    parser.add_argument("--stop", type=int, default=TOTAL_HANDS, help="build up to (not including) this hand rank")
+    args = parser.parse_args()
+
+    print(f"Building mulligan table: {build_mulligan_table(args.path, args.start, args.stop)}")
@@ -1,17 +1,129 @@
 import math
+import functools
 import itertools
 from deck import Deck
+from card import Card, CARDS
+from cache import LRUCache, MISSING
+from result import HoldResult, MulliganResult, BatchResult
+from evaluator import category_of, PrimeEvaluator
+from canonical import canonicalize, canonical_id, retained_hand_pattern, better_combination_pattern
+
+# positions in the given hand of every retained hand - keep 0,1,2,3,4 card(s) in itertools.combinations order
+RETAINED_HAND_POSITIONS = [positions for i in range(5) for positions in itertools.combinations(range(5), i)]
+
+# TOTAL_COMBINATIONS[mulligan_num] - every possible redraw of mulligan_num card(s) from the 47 + mulligan_num cards in the deck
+TOTAL_COMBINATIONS = [math.comb(52 - 5 + mulligan_num, mulligan_num) for mulligan_num in range(6)]
+
+# every retained hand pattern of every calc_*_total_combination method fits
+TOTAL_CACHE_SIZE = 4096
+# (given hand, retained hand) value patterns are many more - each entry is ~600 bytes (see cache_stats)
+BETTER_CACHE_SIZE = 65536
+
+def memoize_total(method):
+    """
+    Memoize a calc_*_total_combination method by the retained hand pattern (canonical.retained_hand_pattern)
+
+    - the result is cached in the player's total_cache (no cache when total_cache is None)
+    """
+    @functools.wraps(method)
+    def wrapper(self, retained_hand):
+        if self.total_cache is None:
+            return method(self, retained_hand)
+
+        key = (method.__name__, retained_hand_pattern(retained_hand))
+        result = self.total_cache.get(key)
+        if result is MISSING:
+            result = method(self, retained_hand)
+            self.total_cache.put(key, result)
+        return result
+
+    return wrapper
+
+def memoize_better(use_suit):
+    """
+    Memoize a calc_total_better_*_combination method by the (given hand, retained hand) pattern (canonical.better_combination_pattern)
+
+    - use_suit - the method uses the retained hand's suit
+    - the result is cached in the player's better_cache (no cache when better_cache is None)
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, given_hand, retained_hand):
+            if self.better_cache is None:
+                return method(self, given_hand, retained_hand)
+
+            key = (method.__name__, better_combination_pattern(given_hand, retained_hand, use_suit))
+            result = self.better_cache.get(key)
+            if result is MISSING:
+                result = method(self, given_hand, retained_hand)
+                self.better_cache.put(key, result)
+            return result
+
+        return wrapper
+
+    return decorator
 
 class Player:
-    def __init__(self):
+    # itertools functions of the calc_total_better_* methods - replaced by an Instrumentation to count the combinations
+    combinations = staticmethod(itertools.combinations)
+    product = staticmethod(itertools.product)
+
+    def __init__(self, evaluator=None, cache_retained_hand=False, mulligan_table=None, brute_force=None, total_cache_size=TOTAL_CACHE_SIZE, better_cache_size=BETTER_CACHE_SIZE, lattice=None, instrumentation=None, estimator=None, anomaly_sink=None):
+        """
+        evaluator (optional) - anything with a strength(card_list) method, ie: hand_rank_table.HandRankTable
+        - when set, it is used to classify the given hand instead of running the is_* methods in order
+
+        cache_retained_hand (optional) - cache find_best_retained_hand by suit isomorphic class (see canonical.py)
+        - {canonical hand ids: (canonical retained hand ids, better combination, total combination)}
+
+        mulligan_table (optional) - mulligan_table.MulliganTable with the best retained hand of every hand
+        - used by lookup_best_retained_hand, hands that are not in the table are calculated
+
+        brute_force (optional) - brute_force.BruteForceEngine (numpy)
+        - fallback for calc_better_combination when a formula returns None
+
+        total_cache_size (optional) - size of the LRU cache in front of the calc_*_total_combination methods
+        - 0 or None to calculate every time
+
+        better_cache_size (optional) - size of the LRU cache in front of the calc_total_better_*_combination methods
+        - 0 or None to calculate every time
+
+        lattice (optional) - lattice.LatticeEvaluator
+        - when set, solve and calc_best_retained_hand count the better combinations of all retained hands with it instead of the calc_* methods
+
+        instrumentation (optional) - instrumentation.Instrumentation
+        - time and count the calls and itertools combinations of every stage (see Instrumentation.stats)
+
+        estimator (optional) - monte_carlo.MonteCarloEstimator (numpy)
+        - used by estimate and find_best_retained_hand(estimate=True) instead of the calc_* methods
+
+        anomaly_sink (optional) - anomaly.AnomalySink
+        - a formula error or a retained hand with more better combinations than redraws is recorded and the retained hand is skipped
+        """
         self.hand = []
+        self.evaluator = evaluator
+        self.retained_hand_cache = {} if cache_retained_hand else None
+        self.mulligan_table = mulligan_table
+        self.brute_force = brute_force
+        self.lattice = lattice
+        self.estimator = estimator
+        self.anomaly_sink = anomaly_sink
+        self.total_cache = LRUCache(total_cache_size) if total_cache_size else None
+        self.better_cache = LRUCache(better_cache_size) if better_cache_size else None
+        # search_best_retained_hand - retained hands searched and skipped by the bound
+        self.searched_holds = 0
+        self.pruned_holds = 0
+        self.instrumentation = instrumentation
+        if instrumentation is not None:
+            instrumentation.instrument(self)
+        self.formula_list = self.generate_formula_list()
 
     def draw(self, card):
         self.hand.append(card)
     
     def mulligan(self, mulligan_list, deck):
-        for card in mulligan_list:
-            self.hand.remove(card)
+        mulligan_ids = {card.id for card in mulligan_list}
+        self.hand = [card for card in self.hand if card.id not in mulligan_ids]
         new_cards = deck.mulligan(mulligan_list)
         for card in new_cards:
             self.draw(card)
@@ -20,34 +132,39 @@ class Player:
         hand = [str(card) for card in self.hand]
         print(f"Player's hand: {hand}")
 
+    def cache_stats(self):
+        """
+        Return the stats of every LRU cache of the player (see LRUCache.stats) - None if the cache is turned off
+
+        - "total" - calc_*_total_combination
+        - "better" - calc_total_better_*_combination
+        """
+        return {
+            "total": self.total_cache.stats() if self.total_cache is not None else None,
+            "better": self.better_cache.stats() if self.better_cache is not None else None,
+        }
+
     def is_same_suit(self, card_list):
         """
         check if input are same suit - return true when card_list is empty
         """
-        suits = [card.suit for card in card_list]
-        return len(set(suits)) <= 1
+        suits = {card.suit_id for card in card_list}
+        return len(suits) <= 1
     
     def generate_all_retained_hand_combination(self, given_hand):
         """
         - keep an output list
-        - generate all keep 0,1,2,3,4 card combo
+        - generate all keep 0,1,2,3,4 card combo (the positions are built once - RETAINED_HAND_POSITIONS)
         """
-        output = []
-
-        output.append([])
-        for i in range(1,5):
-            iterations = list(itertools.combinations(given_hand,i))
-            [output.append(list(iteration)) for iteration in iterations]
-
-        return output
+        return [[given_hand[i] for i in positions] for positions in RETAINED_HAND_POSITIONS]
 
-    def generate_method_list(self, given_hand):
+    def generate_formula_list(self):
         """
-        Generate the list of dictionary that pertained to a given hand.
+        Generate the list of dictionary for every combo from worst to best - built once per player
 
-        It is used for calc_percent_of_better_combination method
+        It is used for generate_method_list method
         """
-        formula_list = [{
+        return [{
             "name": "high card",
             "check": self.is_high_card,
             "better": self.calc_total_better_high_card_combination,
@@ -98,64 +215,323 @@ class Player:
             "better": self.calc_total_better_royal_flush_combination
         }]
 
-        for i in range(len(formula_list)):
-            if formula_list[i]["check"](given_hand) == True:
-                return formula_list[i:]
+    def classify(self, given_hand):
+        """
+        Return the index of the given hand's combo in formula_list (0: high card ... 9: royal flush)
 
-    def calc_percent_of_better_combination(self, given_hand, retained_hand, method_list):
+        - with an evaluator - one strength lookup
+        - without - run the check methods in order until one returns True
+        - return None if the hand is not any combo (ie: not 5 cards)
         """
-        Calculate the percentage of better combination for a specific set of retained hand
+        if self.evaluator is not None and len(given_hand) == 5:
+            return category_of(self.evaluator.strength(given_hand))
+
+        for i in range(len(self.formula_list)):
+            if self.formula_list[i]["check"](given_hand) == True:
+                return i
+
+    def generate_method_list(self, given_hand):
+        """
+        Generate the list of dictionary that pertained to a given hand.
+
+        It is used for calc_percent_of_better_combination method
+        """
+        category = self.classify(given_hand)
+        if category is not None:
+            return self.formula_list[category:]
+
+    def calc_better_combination(self, given_hand, retained_hand, method_list):
+        """
+        Calculate the number of better combination for a specific set of retained hand
+
+        If a formula returns None and the player has a brute force engine, the engine's count is returned instead
+        With an anomaly sink, a formula error (or more better combinations than redraws) is recorded and None is returned
+        Without one, the formula error is raised - a TypeError of a total names the combo and the retained hand (nothing is printed)
         """
-        num_card_to_draw = 5 - len(retained_hand)
         current_combo = method_list[0]
         better_combo = method_list[1:]
 
-        num_all_combinations = self.calc_total_combination(num_card_to_draw)
         better_combination = 0
-        better_combination += current_combo["better"](given_hand, retained_hand)
+        try:
+            better_combination += current_combo["better"](given_hand, retained_hand)
+        except (TypeError, ValueError) as error:
+            if self.brute_force is not None and isinstance(error, TypeError):
+                return self.brute_force.calc_better_combination(given_hand, retained_hand)
+            if self.anomaly_sink is None:
+                raise
+            self.anomaly_sink.record(given_hand, retained_hand, current_combo["better"].__name__, f"{type(error).__name__}: {error}")
+            return
+
         for combo in better_combo:
             try:
                 better_combination += combo["total"](retained_hand)
-            except TypeError:
-                print(f"given_hand: {[str(card) for card in given_hand]}")
-                print(f"retained_hand: {[str(card) for card in retained_hand]}")
-                print(f"stopped at: calc total combination of {combo['name']}\n")
-                return
-            
-            
+            except (TypeError, ValueError) as error:
+                if self.brute_force is not None and isinstance(error, TypeError):
+                    return self.brute_force.calc_better_combination(given_hand, retained_hand)
+                if self.anomaly_sink is not None:
+                    self.anomaly_sink.record(given_hand, retained_hand, combo["total"].__name__, f"{type(error).__name__}: {error}")
+                    return
+                if isinstance(error, ValueError):
+                    raise
+                raise TypeError(f"calc total combination of {combo['name']} failed for retained hand {[str(card) for card in retained_hand]}: {error}") from error
+
+        if self.anomaly_sink is not None and better_combination > TOTAL_COMBINATIONS[5 - len(retained_hand)]:
+            self.anomaly_sink.record(given_hand, retained_hand, "calc_better_combination", f"better combination {better_combination} > total combination {TOTAL_COMBINATIONS[5 - len(retained_hand)]}")
+            return
+
+        return better_combination
+
+    def calc_percent_of_better_combination(self, given_hand, retained_hand, method_list):
+        """
+        Calculate the percentage of better combination for a specific set of retained hand
+        """
+        num_card_to_draw = 5 - len(retained_hand)
+
+        num_all_combinations = self.calc_total_combination(num_card_to_draw)
+        better_combination = self.calc_better_combination(given_hand, retained_hand, method_list)
+        if better_combination is None:
+            return
+
         return better_combination / num_all_combinations
     
-    def find_best_retained_hand(self, given_hand, print_result=False):
+    def find_best_retained_hand(self, given_hand, estimate=False):
+        """
+        Find the retained hand combination that yield the best percentage of better combinations - nothing is printed
+
+        The answer comes from lookup_best_retained_hand (mulligan table, suit isomorphic cache or live calculation)
+        Use solve for every retained hand and render.py to print them
+
+        estimate - sample the redraws with the player's estimator instead (see estimate)
+
+        Returns (best retained hand, best better hand probability)
         """
-        This method will loop through all retained hand combinations to find the retained hand combination that yield the best percentage of better combinations
+        if estimate:
+            result = self.estimate(given_hand)
+            return (result.best_retained_hand, result.probability)
+
+        (best_retained_hand, better_combination, total_combination) = self.lookup_best_retained_hand(given_hand)
+
+        return (best_retained_hand, better_combination / total_combination)
+
+    def solve(self, given_hand):
         """
-        # setup
-        best_retained_hand = None
-        best_better_hand_probability = 0
+        Calculate the better hand probability of all retained hand combinations - nothing is printed
+
+        Returns a MulliganResult (result.py) with the given hand's combo and every retained hand ranked best first
+        - each retained hand has the exact better combination and total combination
+        """
+        if self.lattice is not None:
+            return self.lattice.solve(given_hand)
 
-        retained_hand_combination = self.generate_all_retained_hand_combination(given_hand)
         method_list = self.generate_method_list(given_hand)
 
-        for retained_hand in retained_hand_combination:
-            retained_hand_p = self.calc_percent_of_better_combination(given_hand, retained_hand, method_list)
+        holds = []
+        for retained_hand in self.generate_all_retained_hand_combination(given_hand):
+            better_combination = self.calc_better_combination(given_hand, retained_hand, method_list)
+            if better_combination is None:
+                if self.anomaly_sink is None:
+                    raise TypeError(f"No better combination for retained hand {[str(card) for card in retained_hand]}")
+                # a formula failed and was recorded in the anomaly sink
+                continue
+            total_combination = self.calc_total_combination(5 - len(retained_hand))
+            holds.append(HoldResult(retained_hand, better_combination, total_combination))
+
+        return MulliganResult(given_hand, self.classify(given_hand), holds)
+
+    def estimate(self, given_hand):
+        """
+        Estimate the better hand probability of all retained hand combinations by sampling redraws (monte_carlo.py)
+
+        Returns a MulliganResult with a HoldEstimate (estimate and confidence interval) for every retained hand
+        - the sampling stops once the best retained hand is separated from the others at the estimator's confidence level (for the whole race - see monte_carlo.py)
+        """
+        if self.estimator is None:
+            raise ValueError("estimate needs a player with an estimator (monte_carlo.MonteCarloEstimator)")
 
-            if print_result:
-                print(f"given_hand: {[str(card) for card in given_hand]}\nretained_hand: {[str(card) for card in retained_hand]}\nbetter_hand_probability: {retained_hand_p * 100:.2f}%\n")
+        return self.estimator.estimate(given_hand)
 
-            if retained_hand_p > best_better_hand_probability:
+    def lookup_best_retained_hand(self, given_hand):
+        """
+        Find the best retained hand the fastest way available
+
+        1. mulligan table (mulligan_table.py) - O(1) if the player has a table and the hand is in it
+        2. suit isomorphic cache - if the player caches retained hands
+        3. calculate all retained hands
+
+        Returns (best retained hand, better combination, total combination)
+        """
+        if self.mulligan_table is not None:
+            entry = self.mulligan_table.lookup(given_hand)
+            if entry is not None:
+                return entry
+
+        if self.retained_hand_cache is not None:
+            return self.find_cached_best_retained_hand(given_hand)
+
+        return self.calc_best_retained_hand(given_hand)
+
+    def calc_best_retained_hand(self, given_hand):
+        """
+        Loop through all retained hand combinations and return the first one with the best percentage of better combinations
+
+        Returns (best retained hand, better combination, total combination)
+        - best retained hand is None (0 / 1) if no retained hand can make a better hand
+        - same answer as solve(given_hand).best - the retained hands that cannot be the best are skipped (search_best_retained_hand)
+        - with a lattice evaluator every retained hand is counted at once (solve)
+        """
+        if self.lattice is not None:
+            best = self.solve(given_hand).best
+            if best is None:
+                return (None, 0, 1)
+            return (best.retained_hand, best.better_combination, best.total_combination)
+
+        (best_retained_hand, better_combination, total_combination, num_pruned) = self.search_best_retained_hand(given_hand)
+
+        return (best_retained_hand, better_combination, total_combination)
+
+    def search_best_retained_hand(self, given_hand):
+        """
+        Branch and bound search of the best retained hand - same answer as solve(given_hand).best
+
+        1. upper bound of every retained hand's better combination (calc_upper_bound_combination) - only the memoized totals
+        2. calculate the exact better combination in order of the highest bound
+        3. skip (prune) a retained hand if its bound cannot beat the best found so far
+            - bound < best, or bound = best but it is after the best in generate_all_retained_hand_combination order (ties keep the first)
+        - probabilities are compared as exact fractions (a * d vs b * c)
+        - nothing is pruned for a high card given hand - its bound is every redraw
+
+        Returns (best retained hand, better combination, total combination, number of pruned retained hands)
+        - the pruned / searched retained hands are also counted in pruned_holds / searched_holds
+        """
+        method_list = self.generate_method_list(given_hand)
+        category = len(self.formula_list) - len(method_list)
+
+        candidates = []
+        for index, retained_hand in enumerate(self.generate_all_retained_hand_combination(given_hand)):
+            total_combination = self.calc_total_combination(5 - len(retained_hand))
+            upper_bound = self.calc_upper_bound_combination(retained_hand, category)
+            candidates.append((upper_bound / total_combination, index, retained_hand, upper_bound, total_combination))
+        candidates.sort(key=lambda candidate: (-candidate[0], candidate[1]))
+
+        best_retained_hand = None
+        best_index = len(candidates)
+        best_better_combination = 0
+        best_total_combination = 1
+        num_pruned = 0
+
+        for (_, index, retained_hand, upper_bound, total_combination) in candidates:
+            bound_vs_best = upper_bound * best_total_combination - best_better_combination * total_combination
+            if bound_vs_best < 0 or (bound_vs_best == 0 and (upper_bound == 0 or index > best_index)):
+                num_pruned += 1
+                continue
+
+            better_combination = self.calc_better_combination(given_hand, retained_hand, method_list)
+            if better_combination is None:
+                if self.anomaly_sink is None:
+                    raise TypeError(f"No better combination for retained hand {[str(card) for card in retained_hand]}")
+                # a formula failed and was recorded in the anomaly sink
+                continue
+            better_vs_best = better_combination * best_total_combination - best_better_combination * total_combination
+            if better_vs_best > 0 or (better_vs_best == 0 and better_combination > 0 and index < best_index):
                 best_retained_hand = retained_hand
-                best_better_hand_probability = retained_hand_p
-        
-        # print result
-        print("\n\n\n")
-        print("Best retained hand:")
-        if best_retained_hand == None:
-            print(f"given hand: {[str(card) for card in given_hand]}\nbest retained hand: {None}\nbest retained hand probabilities: {best_better_hand_probability * 100:.2f}%")
-        else:
-            print(f"given hand: {[str(card) for card in given_hand]}\nbest retained hand: {[str(card) for card in best_retained_hand]}\nbest retained hand probabilities: {best_better_hand_probability * 100:.2f}%")
+                best_index = index
+                best_better_combination = better_combination
+                best_total_combination = total_combination
+
+        self.searched_holds += len(candidates)
+        self.pruned_holds += num_pruned
+
+        return (best_retained_hand, best_better_combination, best_total_combination, num_pruned)
+
+    def calc_upper_bound_combination(self, retained_hand, category):
+        """
+        Upper bound of calc_better_combination for a given hand of the combo category (index in formula_list)
+
+        - the better combinations of the same combo are at most all of its combinations (calc_*_total_combination)
+        - so the bound is the total combinations of the combo and every better combo
+        - high card has no total - every redraw is the bound
+        - a total that fails (returns None or raises) cannot prune - every redraw is the bound, and
+          calc_better_combination falls back to the brute force engine or records the anomaly of the retained hand
+        - cached by retained hand pattern in total_cache (same as the totals)
+        """
+        if category == 0:
+            return self.calc_total_combination(5 - len(retained_hand))
+
+        if self.total_cache is None:
+            return self.sum_upper_bound_combination(retained_hand, category)
+
+        key = ("upper_bound", category, retained_hand_pattern(retained_hand))
+        upper_bound = self.total_cache.get(key)
+        if upper_bound is MISSING:
+            upper_bound = self.sum_upper_bound_combination(retained_hand, category)
+            self.total_cache.put(key, upper_bound)
+        return upper_bound
+
+    def sum_upper_bound_combination(self, retained_hand, category):
+        try:
+            return sum(combo["total"](retained_hand) for combo in self.formula_list[category:])
+        except (TypeError, ValueError):
+            return self.calc_total_combination(5 - len(retained_hand))
+
+    def find_best_retained_hands(self, hands):
+        """
+        Batch version of find_best_retained_hand for many hands - nothing is printed
+
+        - hands - any iterable of 5 card hands (list of hands, Deck.stream_all_iteration, array of card ids, ...)
+        - built once for the whole batch and shared by every hand
+            - a hand evaluator for the combo of each given hand (the player's evaluator or PrimeEvaluator)
+            - the suit isomorphic cache (the player's cache or a new one for the batch) - each class is calculated once
+            - the calc_* caches of the player (retained hand patterns)
+        - the mulligan table is used first when the player has one
+
+        Returns a BatchResult (result.py) - columns of categories, best retained hands, better/total combinations and probabilities
+        """
+        evaluator = self.evaluator if self.evaluator is not None else PrimeEvaluator()
+        cache = self.retained_hand_cache if self.retained_hand_cache is not None else {}
+
+        result = BatchResult()
+        for hand in hands:
+            given_hand = [card if isinstance(card, Card) else CARDS[card] for card in hand]
+
+            entry = None
+            if self.mulligan_table is not None:
+                entry = self.mulligan_table.lookup(given_hand)
+            if entry is None:
+                entry = self.find_cached_best_retained_hand(given_hand, cache)
+
+            result.append(given_hand, category_of(evaluator.strength(given_hand)), *entry)
+
+        return result
+
+    def find_cached_best_retained_hand(self, given_hand, cache=None):
+        """
+        Same as calc_best_retained_hand but calculated only once per suit isomorphic class
+
+        - cache - {canonical hand ids: ...} - the player's retained_hand_cache if None
+        - the cache key is the class representative (canonical.canonicalize)
+        - the retained hand is cached as canonical card ids and mapped back to the given hand's actual cards
+        - when more than one retained hand ties for the best probability, the cached one is the first of the first hand seen in the class
+        """
+        if cache is None:
+            cache = self.retained_hand_cache
+        (cache_key, suit_map) = canonicalize(given_hand)
+
+        cached = cache.get(cache_key)
+        if cached is None:
+            (best_retained_hand, better_combination, total_combination) = self.calc_best_retained_hand(given_hand)
+            retained_ids = None
+            if best_retained_hand is not None:
+                retained_ids = tuple(canonical_id(card, suit_map) for card in best_retained_hand)
+            cache[cache_key] = (retained_ids, better_combination, total_combination)
+            return (best_retained_hand, better_combination, total_combination)
+
+        (retained_ids, better_combination, total_combination) = cached
+        if retained_ids is None:
+            return (None, better_combination, total_combination)
+
+        given_cards = {canonical_id(card, suit_map): card for card in given_hand}
+        return ([given_cards[card_id] for card_id in retained_ids], better_combination, total_combination)
 
-        return (best_retained_hand, best_better_hand_probability)
-    
     # region check combo method
     
     def is_royal_flush(self, card_list):
@@ -336,12 +712,9 @@ class Player:
         """
         Calculate the total number of possible combinations of cards after a mulligan.
         """
-        total_cards_in_deck = 52
-        hand_size = 5
-        card_in_deck = total_cards_in_deck - hand_size + mulligan_num
-
-        return math.comb(card_in_deck, mulligan_num)
+        return TOTAL_COMBINATIONS[mulligan_num]
     
+    @memoize_total
     def calc_royal_flush_total_combination(self, retained_hand):
         """
         Conditions:
@@ -368,6 +741,7 @@ class Player:
         
         return 1
     
+    @memoize_total
     def calc_straight_flush_total_combination(self, retained_hand):
         """
         Conditions:
@@ -402,6 +776,7 @@ class Player:
                 valid_combinations += 1
         return valid_combinations
 
+    @memoize_total
     def calc_four_of_a_kind_total_combination(self, retained_hand):
         """
         Condition:
@@ -463,6 +838,7 @@ class Player:
 
         return 0
          
+    @memoize_total
     def calc_full_house_total_combination(self, retained_hand):
         """
         Condition:
@@ -540,6 +916,7 @@ class Player:
 
             return combo_position_a + combo_position_b
 
+    @memoize_total
     def calc_flush_total_combination(self, retained_hand):
         """
         Condition:
@@ -578,6 +955,7 @@ class Player:
 
         return flush_with_royal_and_straight - consecutive_combo_count 
 
+    @memoize_total
     def calc_straight_total_combination(self, retained_hand):
         """
         Condition:
@@ -632,6 +1010,7 @@ class Player:
             return output - len(valid_straight)
         return output
 
+    @memoize_total
     def calc_three_of_a_kind_total_combination(self, retained_hand):
         """
         Condition:
@@ -736,6 +1115,7 @@ class Player:
             freq_2 = draw_triple * draw_z
             return freq_1 + freq_2
          
+    @memoize_total
     def calc_two_pairs_total_combination(self, retained_hand):
         """
         Condition:
@@ -844,6 +1224,7 @@ class Player:
             freq_2 = draw_two_pairs
             return freq_1 + freq_2
                  
+    @memoize_total
     def calc_one_pair_total_combination(self, retained_hand):
         """
         Condition:
@@ -952,6 +1333,7 @@ class Player:
     # region calculate better combo if hand is already a given combo
     # IE: given a pair in hand already - calculate pair combination that are better than current hand
 
+    @memoize_better(use_suit=False)
     def calc_total_better_royal_flush_combination(self, given_hand, retained_hand):
         """
         if hand is already royal flush - there is nothing better
@@ -961,6 +1343,7 @@ class Player:
         
         return 0
 
+    @memoize_better(use_suit=True)
     def calc_total_better_straight_flush_combination(self, given_hand, retained_hand):
         """
         Condition:
@@ -997,6 +1380,7 @@ class Player:
 
         return valid_combo
 
+    @memoize_better(use_suit=False)
     def calc_total_better_four_of_a_kind_combination(self, given_hand, retained_hand):
         """
         Condition:
@@ -1103,6 +1487,7 @@ class Player:
         # for XX(X)Y
         return 0
 
+    @memoize_better(use_suit=False)
     def calc_total_better_full_house_combination(self, given_hand, retained_hand):
         """
         Condition:
@@ -1249,6 +1634,7 @@ class Player:
             else:
                 return 0
         
+    @memoize_better(use_suit=True)
     def calc_total_better_flush_combination(self, given_hand, retained_hand):
         """
         Condition:
@@ -1328,7 +1714,7 @@ class Player:
 
         num_card_to_draw = len(mulligan_values)
 
-        all_card_draw_combination = itertools.combinations(num_in_deck, num_card_to_draw)
+        all_card_draw_combination = self.combinations(num_in_deck, num_card_to_draw)
         all_card_draw_combination = [list(combo) for combo in all_card_draw_combination]
 
         for combo in all_card_draw_combination:
@@ -1364,6 +1750,7 @@ class Player:
         
         return all_better_flush - all_possible_straight_flush_and_royal
 
+    @memoize_better(use_suit=True)
     def calc_total_better_straight_combination(self, given_hand, retained_hand):
         """
         Condition:
@@ -1408,6 +1795,7 @@ class Player:
         
         return output
 
+    @memoize_better(use_suit=False)
     def calc_total_better_three_of_a_kind_combination(self, given_hand, retained_hand):
         """
         Condition:
@@ -1486,7 +1874,7 @@ class Player:
             num_in_deck.remove(given_triple)
 
             choose_triple = math.comb(4,3)
-            kicker_combo = itertools.combinations(num_in_deck,2)
+            kicker_combo = self.combinations(num_in_deck,2)
             better_kicker_list = []
 
             for combo in kicker_combo:
@@ -1518,7 +1906,7 @@ class Player:
             better_kicker = 0
             num_in_deck = list(range(2,15))
             [num_in_deck.remove(num) for num in set(retained_values)]
-            all_draw_combo = itertools.combinations(num_in_deck, len(mulligan_kicker))
+            all_draw_combo = self.combinations(num_in_deck, len(mulligan_kicker))
             for draw in all_draw_combo:
                 draw_list = list(draw)
                 draw_list.sort(reverse=True)
@@ -1608,7 +1996,7 @@ class Player:
                 # card is triple + better kicker
                 choose_x = math.comb(3,2)
                 better_kicker = 0
-                kicker_combo = itertools.combinations(num_list, 2)
+                kicker_combo = self.combinations(num_list, 2)
                 for kicker in kicker_combo:
                     kicker_list = list(kicker)
                     kicker_list.sort(reverse=True)
@@ -1663,6 +2051,7 @@ class Player:
 
                 return freq_a + freq_b
 
+    @memoize_better(use_suit=False)
     def calc_total_better_two_pairs_combination(self, given_hand, retained_hand):
         """
         Conditions:
@@ -1742,7 +2131,7 @@ class Player:
             freq_a = choose_pairs * better_kicker_freq
             # better pairs + any kicker
             better_pairs = 0
-            pair_combo = itertools.combinations(num_list, 2)
+            pair_combo = self.combinations(num_list, 2)
             for combo in pair_combo:
                 combo_list = list(combo)
                 combo_list.sort(reverse=True)
@@ -1781,7 +2170,7 @@ class Player:
 
         # XYZ - all value is predetermined
         if count_list == [1,1,1]:
-            pair_combo = itertools.combinations(set(retained_values),2)
+            pair_combo = self.combinations(set(retained_values),2)
 
             better_pair = 0
             for combo in pair_combo:
@@ -1867,7 +2256,7 @@ class Player:
             # 1x retained single becomes pair + any better pair
             freq_b = 0
             better_pair = 0
-            pair_combo = itertools.product(num_list, retained_values)
+            pair_combo = self.product(num_list, retained_values)
             for combo in pair_combo:
                 combo_list = list(combo)
                 combo_list.sort(reverse=True)
@@ -1908,7 +2297,7 @@ class Player:
 
             # num is kicker  
             better_pair = 0
-            pair_combo = itertools.combinations(num_list,2)
+            pair_combo = self.combinations(num_list,2)
 
             for combo in pair_combo:
                 combo_list = list(combo)
@@ -1924,6 +2313,7 @@ class Player:
 
             return freq_a + freq_b
                 
+    @memoize_better(use_suit=False)
     def calc_total_better_one_pair_combination(self, given_hand, retained_hand):
         """
         Condition:
@@ -1980,7 +2370,7 @@ class Player:
             num_in_deck.remove(given_pair)
 
             choose_pair = math.comb(4,2)
-            kicker_combo = itertools.combinations(num_in_deck,3)
+            kicker_combo = self.combinations(num_in_deck,3)
             better_kicker = 0
 
             for combo in kicker_combo:
@@ -2010,7 +2400,7 @@ class Player:
         # XX XXY XXZ XXA XXYZ XXYA XXZA 
         if 2 in count_list:
             draw_num = 5 - len(retained_hand)
-            redraw_kicker = itertools.combinations(num_list, draw_num)
+            redraw_kicker = self.combinations(num_list, draw_num)
             better_kicker = 0
 
             for kicker in redraw_kicker:
@@ -2046,7 +2436,7 @@ class Player:
             num_in_deck.remove(given_pair)
 
         better_kicker = 0
-        redraw_kicker = itertools.combinations(num_in_deck, draw_num)
+        redraw_kicker = self.combinations(num_in_deck, draw_num)
         for redraw in redraw_kicker:
             redraw_list = list(redraw)
             redraw_list.sort(reverse=True)
@@ -2085,6 +2475,7 @@ class Player:
 
         return freq_a + freq_b + freq_c
 
+    @memoize_better(use_suit=True)
     def calc_total_better_high_card_combination(self, given_hand, retained_hand):
         """
         Condition:
@@ -2120,7 +2511,7 @@ class Player:
         consecutive_value_combos = [[i, i+1, i+2, i+3, i+4] for i in range(2, 11)]
         [combo.sort(reverse=True) for combo in consecutive_value_combos]
 
-        all_num_combo = itertools.combinations(num_list, num_card_to_draw)
+        all_num_combo = self.combinations(num_list, num_card_to_draw)
         for combo in all_num_combo:
             combo_list = list(combo)
             hand = retained_values +  combo_list
@@ -0,0 +1,105 @@
+import sys
+import time
+import threading
+from evaluator import CATEGORY_NAMES
+
+# short combo names for the category mix
+CATEGORY_SHORT_NAMES = ["HC", "1P", "2P", "3K", "ST", "FL", "FH", "4K", "SF", "RF"]
+# seconds between renders
+REFRESH_RATE = 0.5
+
+def format_duration(seconds):
+    """
+    h:mm:ss of a number of seconds
+    """
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+class Progress:
+    """
+    One line progress of a long run, rendered by a background thread - the run itself only adds to counters
+
+    - done / total - hands (or any unit) finished, hands/sec and ETA
+    - category_counts - number of finished hands of each combo in CATEGORY_NAMES (the category mix)
+    - anomalies - number of anomalies found so far
+    - the line is redrawn in place with a carriage return every refresh seconds - no subprocess or terminal clear
+
+    Use it as a context manager - the thread starts on enter and the last line is rendered on exit
+    """
+    def __init__(self, total, desc="", unit="hands", refresh=REFRESH_RATE, file=None, initial=0):
+        self.total = total
+        self.desc = desc
+        self.unit = unit
+        self.refresh = refresh
+        self.file = file if file is not None else sys.stderr
+        # hands done before this run (ie: resumed from a checkpoint) - not counted in the speed
+        self.initial = initial
+        self.done = initial
+        self.category_counts = [0] * len(CATEGORY_NAMES)
+        self.anomalies = 0
+        self.start_time = None
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while not self.stop_event.wait(self.refresh):
+            self.write()
+
+    def close(self):
+        """
+        Stop the render thread and render the last line
+        """
+        if self.thread is not None:
+            self.stop_event.set()
+            self.thread.join()
+            self.thread = None
+        self.write()
+        self.file.write("\n")
+        self.file.flush()
+
+    def update(self, count=1, category=None, category_counts=None):
+        """
+        count more hands done - category of the hand, or the category counts of many hands
+        """
+        self.done += count
+        if category is not None:
+            self.category_counts[category] += 1
+        if category_counts is not None:
+            for i, category_count in enumerate(category_counts):
+                self.category_counts[i] += category_count
+
+    def add_anomaly(self, count=1):
+        self.anomalies += count
+
+    def render(self):
+        """
+        The progress line
+        """
+        elapsed = time.perf_counter() - self.start_time if self.start_time is not None else 0
+        rate = (self.done - self.initial) / elapsed if elapsed > 0 else 0
+        percent = self.done / self.total * 100 if self.total else 0
+        eta = format_duration((self.total - self.done) / rate) if rate > 0 else "?"
+
+        line = f"{self.desc}: {self.done}/{self.total} ({percent:.1f}%) | {rate:.0f} {self.unit}/s | ETA {eta} | anomalies {self.anomalies}"
+
+        num_categorized = sum(self.category_counts)
+        if num_categorized > 0:
+            mix = " ".join(f"{name} {count / num_categorized * 100:.1f}%" for name, count in zip(CATEGORY_SHORT_NAMES, self.category_counts) if count > 0)
+            line += f" | {mix}"
+        return line
+
+    def write(self):
+        self.file.write("\r" + self.render())
+        self.file.flush()
@@ -0,0 +1,29 @@
+def format_hand(card_list):
+    return [str(card) for card in card_list]
+
+def render_holds(result):
+    """
+    Print the better hand probability of every retained hand in a MulliganResult, best first
+    """
+    for hold in result.holds:
+        print(f"given_hand: {format_hand(result.given_hand)}\nretained_hand: {format_hand(hold.retained_hand)}\nbetter_hand_probability: {hold.probability * 100:.2f}%\n")
+
+def render_best(result):
+    """
+    Print the best retained hand of a MulliganResult
+    """
+    best_retained_hand = result.best_retained_hand
+
+    print("\n\n\n")
+    print("Best retained hand:")
+    print(f"given hand: {format_hand(result.given_hand)} ({result.category_name})")
+    print(f"best retained hand: {format_hand(best_retained_hand) if best_retained_hand is not None else None}")
+    print(f"best retained hand probabilities: {result.probability * 100:.2f}%")
+
+def render_result(result, show_holds=False):
+    """
+    Print a MulliganResult - every retained hand (show_holds) and then the best retained hand
+    """
+    if show_holds:
+        render_holds(result)
+    render_best(result)
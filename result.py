@@ -0,0 +1,164 @@
+import array
+from evaluator import CATEGORY_NAMES
+
+class HoldResult:
+    """
+    Better hand probability of one retained hand
+
+    - better_combination / total_combination - exact numerator and denominator
+    """
+    __slots__ = ("retained_hand", "better_combination", "total_combination")
+
+    def __init__(self, retained_hand, better_combination, total_combination):
+        self.retained_hand = retained_hand
+        self.better_combination = better_combination
+        self.total_combination = total_combination
+
+    @property
+    def probability(self):
+        return self.better_combination / self.total_combination
+
+    def __repr__(self):
+        return f"HoldResult({[str(card) for card in self.retained_hand]}, {self.better_combination}/{self.total_combination})"
+
+class HoldEstimate(HoldResult):
+    """
+    Estimated better hand probability of one retained hand (monte_carlo.MonteCarloEstimator)
+
+    - better_combination / total_combination - better redraws / sampled redraws
+    - low / high - confidence interval of the probability
+    """
+    __slots__ = ("low", "high")
+
+    def __init__(self, retained_hand, better_combination, total_combination, low, high):
+        super().__init__(retained_hand, better_combination, total_combination)
+        self.low = low
+        self.high = high
+
+    def __repr__(self):
+        return f"HoldEstimate({[str(card) for card in self.retained_hand]}, {self.probability:.4f} [{self.low:.4f}, {self.high:.4f}])"
+
+class HoldDistribution:
+    """
+    Every hand one retained hand can end with, by combo (lattice.LatticeEvaluator.calc_all_distribution)
+
+    - category - index of the given hand's combo in CATEGORY_NAMES
+    - category_combinations - number of redraws that end as each combo in CATEGORY_NAMES
+    - better / equal / worse - redraws that end as the given hand's combo and are stronger / as strong / weaker than the given hand
+    - total_combination - every redraw (sum of category_combinations)
+    """
+    __slots__ = ("retained_hand", "category", "category_combinations", "better", "equal", "worse", "total_combination")
+
+    def __init__(self, retained_hand, category, category_combinations, better, equal, worse, total_combination):
+        self.retained_hand = retained_hand
+        self.category = category
+        self.category_combinations = category_combinations
+        self.better = better
+        self.equal = equal
+        self.worse = worse
+        self.total_combination = total_combination
+
+    @property
+    def better_combination(self):
+        """
+        Redraws that are better than the given hand - same as HoldResult.better_combination
+        """
+        return sum(self.category_combinations[self.category + 1:]) + self.better
+
+    @property
+    def probability(self):
+        return self.better_combination / self.total_combination
+
+    def __repr__(self):
+        return f"HoldDistribution({[str(card) for card in self.retained_hand]}, {list(self.category_combinations)}, better={self.better}, equal={self.equal}, worse={self.worse})"
+
+class MulliganResult:
+    """
+    Every retained hand of a given hand ranked by better hand probability (Player.solve)
+
+    - category - index of the given hand's combo in CATEGORY_NAMES
+    - holds - HoldResult of all 31 retained hands, best first
+        - retained hands with the same probability keep the generate_all_retained_hand_combination order
+    """
+    __slots__ = ("given_hand", "category", "holds")
+
+    def __init__(self, given_hand, category, holds):
+        self.given_hand = given_hand
+        self.category = category
+        self.holds = sorted(holds, key=lambda hold: hold.probability, reverse=True)
+
+    @property
+    def category_name(self):
+        return CATEGORY_NAMES[self.category]
+
+    @property
+    def best(self):
+        """
+        The best HoldResult - None if no retained hand can make a better hand
+        """
+        if len(self.holds) == 0 or self.holds[0].better_combination == 0:
+            return None
+        return self.holds[0]
+
+    @property
+    def best_retained_hand(self):
+        best = self.best
+        return best.retained_hand if best is not None else None
+
+    @property
+    def probability(self):
+        """
+        Better hand probability of the best retained hand
+        """
+        best = self.best
+        return best.probability if best is not None else 0
+
+    def __repr__(self):
+        return f"MulliganResult({[str(card) for card in self.given_hand]}, {self.category_name}, best={self.best})"
+
+# BatchResult.retained_masks - no retained hand can make a better hand (keeping all 5 cards is never a retained hand)
+NO_RETAINED_HAND = 0b11111
+
+class BatchResult:
+    """
+    Best retained hand of many given hands in columns (Player.find_best_retained_hands) - row i is the i-th given hand
+
+    - hands - the given hands
+    - categories - index of each given hand's combo in CATEGORY_NAMES
+    - retained_masks - bit j is set if the j-th card of the given hand is retained (NO_RETAINED_HAND if None)
+    - better_combinations / total_combinations - exact numerator and denominator of the best retained hand
+    - probabilities - better hand probability of the best retained hand
+    """
+    def __init__(self):
+        self.hands = []
+        self.categories = array.array("B")
+        self.retained_masks = array.array("B")
+        self.better_combinations = array.array("I")
+        self.total_combinations = array.array("I")
+        self.probabilities = array.array("d")
+
+    def __len__(self):
+        return len(self.hands)
+
+    def append(self, given_hand, category, retained_hand, better_combination, total_combination):
+        mask = NO_RETAINED_HAND
+        if retained_hand is not None:
+            mask = 0
+            for card in retained_hand:
+                mask |= 1 << given_hand.index(card)
+
+        self.hands.append(given_hand)
+        self.categories.append(category)
+        self.retained_masks.append(mask)
+        self.better_combinations.append(better_combination)
+        self.total_combinations.append(total_combination)
+        self.probabilities.append(better_combination / total_combination)
+
+    def retained_hand(self, i):
+        """
+        Best retained hand of the i-th given hand - None if no retained hand can make a better hand
+        """
+        mask = self.retained_masks[i]
+        if mask == NO_RETAINED_HAND:
+            return None
+        return [card for j, card in enumerate(self.hands[i]) if mask & (1 << j)]
@@ -0,0 +1,262 @@
+import os
+import json
+import time
+import socket
+import argparse
+from card import CARDS
+from player import Player
+from evaluator import PrimeEvaluator
+from hand_index import TOTAL_HANDS, iter_hand_ids
+from mulligan_table import RECORD, NOT_BUILT, retained_hand_mask
+
+# hands per shard - ~2 minutes of one worker with a cold cache
+SHARD_SIZE = 20000
+# a lease that was not renewed for this many seconds is given back to pending (the worker is considered dead)
+LEASE_TIMEOUT = 300
+# seconds between two heartbeats of a worker
+HEARTBEAT_INTERVAL = 30
+# shards are ranges of the colex rank (hand_index.rank_hand) - the order of mulligan_table, not of Deck.generate_all_iteration
+SHARD_ORDER = "colex"
+
+def shard_name(shard):
+    return f"{shard:05d}"
+
+def write_atomic(path, data):
+    """
+    Write data (bytes) to path.tmp, flush it to disk and rename it over path - readers never see a half written file
+    """
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+class ShardCoordinator:
+    """
+    Split the hands into colex rank ranges (shards) in a shared directory - workers on any machine claim them
+
+    The directory (any shared storage, or a local directory on one host):
+    - manifest.json - total hands, shard size, number of shards and the hand order (colex)
+    - pending/<shard> - shards nobody works on, the file has "start stop" (hand_index.rank_hand of the first hand and the hand to stop before)
+    - leased/<shard>.<worker id> - claimed shards, the file mtime is the last heartbeat
+    - done/<shard> - finished shards
+    - results/<shard>.bin - the result of a shard - one mulligan_table.RECORD per hand in rank order
+
+    Every state change is an os.rename of the shard file, which is atomic - when 2 workers rename the same file, one of them fails
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, "manifest.json")
+        self.pending_dir = os.path.join(directory, "pending")
+        self.leased_dir = os.path.join(directory, "leased")
+        self.done_dir = os.path.join(directory, "done")
+        self.results_dir = os.path.join(directory, "results")
+
+    def create(self, total=TOTAL_HANDS, shard_size=SHARD_SIZE):
+        """
+        Write the manifest and a pending file for every shard - the directory must not have a manifest yet
+        """
+        if os.path.exists(self.manifest_path):
+            raise ValueError(f"Shards already created: {self.directory}")
+
+        for directory in (self.pending_dir, self.leased_dir, self.done_dir, self.results_dir):
+            os.makedirs(directory, exist_ok=True)
+
+        num_shard = (total + shard_size - 1) // shard_size
+        for shard in range(num_shard):
+            start = shard * shard_size
+            write_atomic(os.path.join(self.pending_dir, shard_name(shard)), f"{start} {min(start + shard_size, total)}".encode())
+
+        # the manifest is written last - a directory with a manifest has every shard
+        write_atomic(self.manifest_path, json.dumps({"total": total, "shard_size": shard_size, "num_shard": num_shard, "order": SHARD_ORDER}).encode())
+        return num_shard
+
+    def manifest(self):
+        with open(self.manifest_path) as file:
+            return json.load(file)
+
+    def status(self):
+        """
+        Number of shards in each state - {"pending", "leased", "done"}
+        """
+        return {
+            "pending": len(os.listdir(self.pending_dir)),
+            "leased": len(os.listdir(self.leased_dir)),
+            "done": len(os.listdir(self.done_dir)),
+        }
+
+    def reclaim_expired(self, lease_timeout=LEASE_TIMEOUT):
+        """
+        Give every lease without a heartbeat for lease_timeout seconds back to pending - returns the number of shards reclaimed
+        """
+        now = time.time()
+        num_reclaimed = 0
+        for name in os.listdir(self.leased_dir):
+            path = os.path.join(self.leased_dir, name)
+            try:
+                if now - os.stat(path).st_mtime < lease_timeout:
+                    continue
+                os.rename(path, os.path.join(self.pending_dir, name.split(".")[0]))
+                num_reclaimed += 1
+            except FileNotFoundError:
+                # renewed into done or reclaimed by another worker
+                continue
+        return num_reclaimed
+
+    def merge(self, output_path):
+        """
+        Stitch the result of every shard into one mulligan table file (mulligan_table.MulliganTable) - the shards must all be done
+
+        - the hands after the manifest total are NOT_BUILT, so the file always has all 2,598,960 records
+        """
+        manifest = self.manifest()
+        if manifest.get("order") != SHARD_ORDER:
+            raise ValueError(f"Invalid shard order: {manifest.get('order')}")
+
+        records = bytearray()
+        for shard in range(manifest["num_shard"]):
+            start = shard * manifest["shard_size"]
+            num_hand = min(start + manifest["shard_size"], manifest["total"]) - start
+            path = os.path.join(self.results_dir, f"{shard_name(shard)}.bin")
+            if not os.path.exists(path):
+                raise ValueError(f"Shard {shard} is not done")
+
+            with open(path, "rb") as file:
+                data = file.read()
+            if len(data) != num_hand * RECORD.size:
+                raise ValueError(f"Invalid result of shard {shard}: {len(data)} bytes")
+            records += data
+
+        records += RECORD.pack(NOT_BUILT, 0, 0) * (TOTAL_HANDS - manifest["total"])
+        write_atomic(output_path, bytes(records))
+        return output_path
+
+class ShardWorker:
+    """
+    Claim pending shards of a ShardCoordinator directory, solve every hand of the shard and write its result
+
+    - the lease file is renewed (os.utime) every heartbeat_interval seconds while the shard is solved
+    - a worker whose lease was reclaimed (no heartbeat for too long) stops the shard - another worker solves it again
+    - the result is written before the shard is done, so a done shard always has its result
+    """
+    def __init__(self, directory, worker_id=None, player=None, heartbeat_interval=HEARTBEAT_INTERVAL, lease_timeout=LEASE_TIMEOUT):
+        self.coordinator = ShardCoordinator(directory)
+        self.worker_id = worker_id if worker_id is not None else f"{socket.gethostname()}-{os.getpid()}"
+        # each suit isomorphic class is only calculated once per worker
+        self.player = player if player is not None else Player(cache_retained_hand=True, evaluator=PrimeEvaluator())
+        self.heartbeat_interval = heartbeat_interval
+        self.lease_timeout = lease_timeout
+        self.lease_path = None
+        self.last_heartbeat = 0
+
+    def claim(self):
+        """
+        Claim a pending shard (the expired leases are reclaimed first if nothing is pending) - returns (shard, start, stop) or None
+        """
+        for attempt in range(2):
+            for name in sorted(os.listdir(self.coordinator.pending_dir)):
+                if not name.isdigit():
+                    # a pending file being written by create
+                    continue
+                lease_path = os.path.join(self.coordinator.leased_dir, f"{name}.{self.worker_id}")
+                try:
+                    os.rename(os.path.join(self.coordinator.pending_dir, name), lease_path)
+                except FileNotFoundError:
+                    # claimed by another worker
+                    continue
+
+                self.lease_path = lease_path
+                self.heartbeat(force=True)
+                with open(lease_path) as file:
+                    (start, stop) = map(int, file.read().split())
+                return (int(name), start, stop)
+
+            if attempt == 0 and self.coordinator.reclaim_expired(self.lease_timeout) == 0:
+                break
+        return None
+
+    def heartbeat(self, force=False):
+        """
+        Renew the lease - raises FileNotFoundError if the lease was reclaimed
+        """
+        now = time.time()
+        if force or now - self.last_heartbeat >= self.heartbeat_interval:
+            os.utime(self.lease_path)
+            self.last_heartbeat = now
+
+    def solve_shard(self, start, stop):
+        """
+        One mulligan_table.RECORD per hand from rank start to stop
+        """
+        records = bytearray()
+        for ids in iter_hand_ids(start, stop):
+            given_hand = [CARDS[card_id] for card_id in ids]
+            (best_retained_hand, better_combination, total_combination) = self.player.lookup_best_retained_hand(given_hand)
+            records += RECORD.pack(retained_hand_mask(given_hand, best_retained_hand), better_combination, total_combination)
+            if len(records) % (1000 * RECORD.size) == 0:
+                self.heartbeat()
+        return bytes(records)
+
+    def complete(self, shard, records):
+        """
+        Write the result of the shard and move its lease to done
+        """
+        write_atomic(os.path.join(self.coordinator.results_dir, f"{shard_name(shard)}.bin"), records)
+        try:
+            os.rename(self.lease_path, os.path.join(self.coordinator.done_dir, shard_name(shard)))
+        except FileNotFoundError:
+            # the lease was reclaimed - the result is the same whoever finishes the shard
+            pass
+        self.lease_path = None
+
+    def run(self, max_shards=None):
+        """
+        Solve shards until none is left (or max_shards are done) - returns the number of shards done
+        """
+        num_done = 0
+        while max_shards is None or num_done < max_shards:
+            claimed = self.claim()
+            if claimed is None:
+                break
+
+            (shard, start, stop) = claimed
+            try:
+                records = self.solve_shard(start, stop)
+            except FileNotFoundError:
+                # lost the lease
+                self.lease_path = None
+                continue
+
+            self.complete(shard, records)
+            num_done += 1
+        return num_done
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Spread the all hands run across machines with a shared directory")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    create_parser = subparsers.add_parser("create", help="split the hands into shards")
+    create_parser.add_argument("directory")
+    create_parser.add_argument("--shard-size", type=int, default=SHARD_SIZE)
+
+    work_parser = subparsers.add_parser("work", help="solve shards until none is left")
+    work_parser.add_argument("directory")
+    work_parser.add_argument("--worker-id", default=None)
+
+    status_parser = subparsers.add_parser("status", help="number of pending, leased and done shards")
+    status_parser.add_argument("directory")
+
+    merge_parser = subparsers.add_parser("merge", help="stitch the shard results into one file")
+    merge_parser.add_argument("directory")
+    merge_parser.add_argument("output")
+    args = parser.parse_args()
+
+    if args.command == "create":
+        print(f"Shards: {ShardCoordinator(args.directory).create(shard_size=args.shard_size)}")
+    if args.command == "work":
+        print(f"Shards done: {ShardWorker(args.directory, args.worker_id).run()}")
+    if args.command == "status":
+        print(ShardCoordinator(args.directory).status())
+    if args.command == "merge":
+        print(f"Merged: {ShardCoordinator(args.directory).merge(args.output)}")
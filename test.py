@@ -1,37 +1,56 @@
-import platform
+import sys
+import math
+import time
+import array
+import signal
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from deck import Deck
 from player import Player
+from render import render_result
+from card import CARDS
+from canonical import canonicalize, iter_class_representatives
+from evaluator import PrimeEvaluator, CATEGORY_NAMES
+from progress import Progress
+from checkpoint import Checkpoint
+from anomaly import AnomalySink, read_anomalies, summarize_anomalies, print_anomaly_summary
 import os
-from tqdm import tqdm
 
 TEST_VALUES = [10,11,12,13,14]
 TEST_SUITS = ["♠️", "♠️", "♠️", "♠️","♠️"]
 TEST_LOOP = 1000
+TOTAL_HANDS = math.comb(52, 5)
+# hands per range of the parallel run (phase 2)
+PARALLEL_CHUNK_SIZE = 10000
+# suit isomorphic classes per range of the parallel run (phase 1)
+PARALLEL_CLASS_CHUNK_SIZE = 500
+# hands between two checkpoints of the all hands run
+CHECKPOINT_INTERVAL = 50000
+CHECKPOINT_PATH = "all_iteration_checkpoint.json"
+ANOMALY_PATH = "all_iteration_anomalies.tsv"
 
 def clear_terminal():
-    if platform.system() == 'Windows':
-        os.system('cls')
-    else:
-        os.system('clear')
+    # ANSI clear screen and cursor home - no shell is started
+    print("\033[2J\033[H", end="", flush=True)
 
 def random_test_case():
-    # setup game
+    # setup game - deal 5 random cards without shuffling the whole deck
     deck = Deck()
     player = Player()
-    deck.shuffle()
 
-    for _ in range(5):
-        player.draw(deck.deal())
+    for card in deck.deal_random(5):
+        player.draw(card)
     
     player.show_hand()
     print("\n")
 
     # calc best probabilities and best retained hand
-    (best_retained_hand, best_probabilities) = player.find_best_retained_hand(player.hand, print_result=True)
+    result = player.solve(player.hand)
+    render_result(result, show_holds=True)
 
-    if best_probabilities > 1:
+    if result.probability > 1:
         return
-    return best_probabilities
+    return result.probability
 
 def specific_test_case():
     # setup game
@@ -46,34 +65,311 @@ def specific_test_case():
     print("\n")
 
     # calc best probabilities and best retained hand
-    player.find_best_retained_hand(player.hand, print_result=True)
+    render_result(player.solve(player.hand), show_holds=True)
+
+# region all hands run
+def empty_aggregates():
+    """
+    Aggregates of the all hands run - the checkpoint saves them with the lex index of the next hand
+
+    - hands - hands done
+    - probability_sum / max_probability - of the best better hand probability of every hand
+    - category_counts / category_probability_sums - the same per combo (index in CATEGORY_NAMES)
+    - anomalies / anomaly_classes / anomaly_file_size - hands with an anomaly, their suit isomorphic classes and the size of the anomaly sink file (see all_iteration)
+    """
+    return {
+        "hands": 0,
+        "anomalies": 0,
+        "anomaly_classes": [],
+        "anomaly_file_size": 0,
+        "probability_sum": 0.0,
+        "max_probability": 0.0,
+        "category_counts": [0] * len(CATEGORY_NAMES),
+        "category_probability_sums": [0.0] * len(CATEGORY_NAMES),
+    }
+
+def add_to_aggregates(aggregates, category, probability):
+    aggregates["hands"] += 1
+    aggregates["probability_sum"] += probability
+    aggregates["max_probability"] = max(aggregates["max_probability"], probability)
+    aggregates["category_counts"][category] += 1
+    aggregates["category_probability_sums"][category] += probability
+
+def print_aggregates(aggregates):
+    print(f"hands: {aggregates['hands']}")
+    print(f"hands with an anomaly: {aggregates['anomalies']}")
+    if aggregates["hands"] > 0:
+        print(f"mean best retained hand probabilities: {aggregates['probability_sum'] / aggregates['hands'] * 100:.4f}%")
+    print(f"max best retained hand probabilities: {aggregates['max_probability'] * 100:.4f}%")
+    for name, count, probability_sum in zip(CATEGORY_NAMES, aggregates["category_counts"], aggregates["category_probability_sums"]):
+        if count > 0:
+            print(f"  {name}: {count} hands, mean {probability_sum / count * 100:.4f}%")
+
+def all_iteration(stop=TOTAL_HANDS, checkpoint_path=None, resume=False, checkpoint_interval=CHECKPOINT_INTERVAL, anomaly_path=None):
+    """
+    Best retained hand of every hand from lex index 0 to stop (Deck.generate_all_iteration order) - returns the aggregates
+
+    checkpoint_path (optional) - save the lex index of the next hand and the aggregates (checkpoint.py) every checkpoint_interval hands
+    - Ctrl-C finishes the current hand, saves and stops
+    - resume - start from the checkpoint instead of hand 0 - the aggregates are the same as an uninterrupted run
+
+    anomaly_path (optional) - record every anomaly in an anomaly sink file (anomaly.py) and keep going
+    - formula errors and retained hands with more better combinations than redraws are recorded by the player, hands with probabilities > 1 here
+    - a hand with an anomaly is left out of the aggregates (counted in "anomalies") - each suit isomorphic class is recorded once
+    - the summary by method and hand pattern is printed at the end
+    - without it, the run stops at the first anomaly (probabilities > 1 or TypeError) and the checkpoint has every hand before it
+    """
+    checkpoint = Checkpoint(checkpoint_path) if checkpoint_path is not None else None
+
+    start = 0
+    aggregates = empty_aggregates()
+    if resume and checkpoint is not None:
+        state = checkpoint.load()
+        if state is not None:
+            (start, aggregates) = state
+            print(f"Resume from hand {start}")
+
+    # the anomalies after the checkpoint are recorded again - cut the file back to its size at the checkpoint
+    anomaly_sink = AnomalySink(anomaly_path, truncate_to=aggregates["anomaly_file_size"] if resume else 0) if anomaly_path is not None else None
+
+    anomaly_classes = {tuple(class_key) for class_key in aggregates["anomaly_classes"]}
 
-def all_iteration():
     # setup game
     deck = Deck()
-    player = Player()
+    # 2,598,960 hands are only 134,459 different suit patterns - the evaluator classifies each hand with one lookup
+    player = Player(cache_retained_hand=True, evaluator=PrimeEvaluator(), anomaly_sink=anomaly_sink)
+
+    def save_checkpoint():
+        if anomaly_sink is not None:
+            anomaly_sink.flush()
+            aggregates["anomaly_file_size"] = anomaly_sink.size
+        checkpoint.save(index, aggregates)
+
+    # Ctrl-C only sets a flag - the aggregates are never saved half updated
+    interrupted = []
+    previous_handler = signal.signal(signal.SIGINT, lambda signum, frame: interrupted.append(signum))
+
+    index = start
+    try:
+        # hands are generated one at a time instead of a list of 2,598,960 hands
+        with Progress(stop, desc="Calculating probabilities", initial=start) as progress:
+            progress.update(0, category_counts=aggregates["category_counts"])
+            progress.add_anomaly(aggregates["anomalies"])
+            for iter in deck.stream_all_iteration(start, stop):
+                category = player.classify(iter)
+                # a suit isomorphic class is recorded once - its other hands are anomalies without solving them again
+                class_key = canonicalize(iter)[0] if anomaly_sink is not None else None
+                is_anomaly = class_key in anomaly_classes
+
+                if not is_anomaly:
+                    num_anomaly = anomaly_sink.count if anomaly_sink is not None else 0
+                    anomaly = None
+                    try:
+                        (best_retained_hand, best_probabilities) = player.find_best_retained_hand(iter)
+                        if best_probabilities > 1:
+                            anomaly = f"best retained hand probabilities > 1: {best_probabilities}"
+                    except TypeError as error:
+                        anomaly = f"TypeError: {error}"
+
+                    if anomaly is not None:
+                        if anomaly_sink is None:
+                            progress.add_anomaly()
+                            print(f"\ngiven hand: {[str(card) for card in iter]}\n{anomaly}")
+                            break
+                        anomaly_sink.record(iter, None, "find_best_retained_hand", anomaly)
+
+                    if anomaly_sink is not None and anomaly_sink.count > num_anomaly:
+                        is_anomaly = True
+                        anomaly_classes.add(class_key)
+                        aggregates["anomaly_classes"].append(list(class_key))
+
+                if is_anomaly:
+                    aggregates["anomalies"] += 1
+                    progress.add_anomaly()
+                else:
+                    add_to_aggregates(aggregates, category, best_probabilities)
+                progress.update(category=category)
+                index += 1
+
+                if checkpoint is not None and index % checkpoint_interval == 0:
+                    save_checkpoint()
+                if len(interrupted) > 0:
+                    print(f"\nInterrupted at hand {index}")
+                    break
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+        if checkpoint is not None:
+            save_checkpoint()
+        if anomaly_sink is not None:
+            anomaly_sink.close()
+
+    print_aggregates(aggregates)
+    if anomaly_path is not None:
+        print_anomaly_summary(summarize_anomalies(read_anomalies(anomaly_path)))
+    return aggregates
+
+# endregion all hands run
+
+# region parallel all hands run
+def init_worker(class_results=None, representatives=None):
+    """
+    Setup of every worker process - its own player (formula errors are raised, solve_range keeps them as anomalies)
+    """
+    global worker_player, worker_class_results, worker_representatives
+    worker_player = Player(evaluator=PrimeEvaluator())
+    worker_class_results = class_results
+    worker_representatives = representatives
+
+def iterate_range(start, stop):
+    """
+    Generate (index, hand) of the hands from index start to stop - same order as Deck.generate_all_iteration
+    """
+    for index, hand in enumerate(Deck().stream_all_iteration(start, stop), start):
+        yield (index, hand)
 
-    all_iteration_list = deck.generate_all_iteration()
+def solve_range(start, stop):
+    """
+    Phase 1 - solve the suit isomorphic classes from start to stop of the class representatives (canonical.iter_class_representatives)
 
-    for iter in tqdm(all_iteration_list, desc="Calculating probabilities", unit="combination"):
+    - every class has exactly 1 representative, so all ranges together solve each of the 134,459 classes once
+    - the ranges have the same number of classes - a range of hands would put most of the representatives in the first ranges
+    - anomaly - the probability is > 1 or a formula raised TypeError
+
+    Returns (start, {class: (probability, anomaly or None, category)}, category counts of the classes, anomalies, pid, classes solved, seconds)
+    """
+    begin = time.perf_counter()
+    class_results = {}
+    category_counts = [0] * len(CATEGORY_NAMES)
+    num_anomaly = 0
+
+    for cache_key in worker_representatives[start:stop]:
+        hand = [CARDS[card_id] for card_id in cache_key]
+        category = worker_player.classify(hand)
+        category_counts[category] += 1
         try:
-            (best_retained_hand, best_probabilities) = player.find_best_retained_hand(iter)
-
-            if best_probabilities > 1:
-                return
-            else:
-                clear_terminal()
-        except TypeError:
-            print(f"given hand: {[str(card) for card in iter]}")
-            return
-        
-option = input(f"Random test {TEST_LOOP}x (Y)\nSpecific test case (N)\nAll 2,598,960 hand combination (A)\n")
-
-if option == "Y":
-    for _ in range(TEST_LOOP):
-        random_test_case()
-        clear_terminal()
-if option == "N":
-    specific_test_case()
-if option == "A":
-    all_iteration()
\ No newline at end of file
+            (best_retained_hand, best_probabilities) = worker_player.find_best_retained_hand(hand)
+        except TypeError as error:
+            class_results[cache_key] = (math.nan, f"TypeError: {error}", category)
+            num_anomaly += 1
+            continue
+
+        anomaly = f"probabilities > 1: {best_probabilities}" if best_probabilities > 1 else None
+        class_results[cache_key] = (best_probabilities, anomaly, category)
+        num_anomaly += anomaly is not None
+
+    return (start, class_results, category_counts, num_anomaly, os.getpid(), len(class_results), time.perf_counter() - begin)
+
+def expand_range(start, stop):
+    """
+    Phase 2 - the probability and anomaly of every hand from index start to stop from its class result
+
+    Returns (start, probabilities, [(index, hand, anomaly)], category counts of the hands, anomalies, pid, hands, seconds)
+    """
+    begin = time.perf_counter()
+    probabilities = array.array("d")
+    anomalies = []
+    category_counts = [0] * len(CATEGORY_NAMES)
+
+    for (index, hand) in iterate_range(start, stop):
+        (best_probabilities, anomaly, category) = worker_class_results[canonicalize(hand)[0]]
+        probabilities.append(best_probabilities)
+        category_counts[category] += 1
+        if anomaly is not None:
+            anomalies.append((index, [str(card) for card in hand], anomaly))
+
+    return (start, probabilities, anomalies, category_counts, len(anomalies), os.getpid(), stop - start, time.perf_counter() - begin)
+
+def run_ranges(function, ranges, workers, initargs, desc, unit="hands"):
+    """
+    Run function(start, stop) for every range in a process pool - return the results in range order
+
+    - every result ends with (category counts, anomalies, pid, count, seconds) - the progress line is updated as each range finishes
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=initargs) as executor, Progress(ranges[-1][1] - ranges[0][0], desc=desc, unit=unit) as progress:
+        futures = {executor.submit(function, start, stop): stop - start for (start, stop) in ranges}
+        results = []
+        for future in as_completed(futures):
+            result = future.result()
+            (category_counts, num_anomaly) = result[-5:-3]
+            progress.update(futures[future], category_counts=category_counts)
+            progress.add_anomaly(num_anomaly)
+            results.append(result)
+
+    return sorted(results, key=lambda result: result[0])
+
+def print_throughput(results, unit):
+    """
+    Print the number of hands (classes) and the speed of every worker - results are (start, ..., pid, count, seconds)
+    """
+    workers = {}
+    for result in results:
+        (pid, count, seconds) = result[-3:]
+        (total_count, total_seconds) = workers.get(pid, (0, 0))
+        workers[pid] = (total_count + count, total_seconds + seconds)
+
+    for pid, (count, seconds) in sorted(workers.items()):
+        print(f"worker {pid}: {count} {unit} in {seconds:.1f}s ({count / max(seconds, 1e-9):.0f} {unit}/s)")
+
+def parallel_all_iteration(workers=None, chunk_size=PARALLEL_CHUNK_SIZE, class_chunk_size=PARALLEL_CLASS_CHUNK_SIZE):
+    """
+    Same as all_iteration but the 2,598,960 hands are split into index ranges and solved in worker processes
+
+    Each worker has its own player. The suit isomorphic classes are split between the ranges so no class is solved twice:
+    1. phase 1 - the 134,459 class representatives are split into ranges of class_chunk_size classes, each range solves its classes
+    2. phase 2 - each range of chunk_size hands gets the probability of every hand from its class
+
+    Returns (probabilities of every hand in generate_all_iteration order, [(index, hand, anomaly)] in order)
+    """
+    workers = workers or os.cpu_count()
+    representatives = list(iter_class_representatives())
+    class_ranges = [(start, min(start + class_chunk_size, len(representatives))) for start in range(0, len(representatives), class_chunk_size)]
+    ranges = [(start, min(start + chunk_size, TOTAL_HANDS)) for start in range(0, TOTAL_HANDS, chunk_size)]
+    begin = time.perf_counter()
+
+    solved = run_ranges(solve_range, class_ranges, workers, (None, representatives), "Solving suit classes", "classes")
+    class_results = {}
+    for (start, range_class_results, category_counts, num_anomaly, pid, count, seconds) in solved:
+        class_results.update(range_class_results)
+    print_throughput(solved, "classes")
+
+    expanded = run_ranges(expand_range, ranges, workers, (class_results,), "Merging hands")
+    probabilities = array.array("d")
+    anomalies = []
+    for (start, range_probabilities, range_anomalies, category_counts, num_anomaly, pid, count, seconds) in expanded:
+        probabilities.extend(range_probabilities)
+        anomalies.extend(range_anomalies)
+    print_throughput(expanded, "hands")
+
+    elapsed = time.perf_counter() - begin
+    print(f"{len(probabilities)} hands ({len(class_results)} classes) with {workers} workers in {elapsed:.1f}s ({len(probabilities) / elapsed:.0f} hands/s)")
+    print(f"anomalies: {len(anomalies)}")
+    for (index, hand, anomaly) in anomalies[:10]:
+        print(f"  {index}: {hand} - {anomaly}")
+
+    return (probabilities, anomalies)
+
+# endregion parallel all hands run
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Demo runs of the mulligan solver")
+    parser.add_argument("--resume", action="store_true", help="resume the all hands run (A) from its checkpoint")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PATH, help="checkpoint file of the all hands run")
+    parser.add_argument("--anomalies", default=ANOMALY_PATH, help="anomaly file of the all hands run")
+    args = parser.parse_args()
+
+    if args.resume:
+        all_iteration(checkpoint_path=args.checkpoint, resume=True, anomaly_path=args.anomalies)
+        sys.exit()
+
+    option = input(f"Random test {TEST_LOOP}x (Y)\nSpecific test case (N)\nAll 2,598,960 hand combination (A)\nAll 2,598,960 hand combination in parallel (P)\n")
+
+    if option == "Y":
+        for _ in range(TEST_LOOP):
+            random_test_case()
+            clear_terminal()
+    if option == "N":
+        specific_test_case()
+    if option == "A":
+        all_iteration(checkpoint_path=args.checkpoint, anomaly_path=args.anomalies)
+    if option == "P":
+        parallel_all_iteration()
\ No newline at end of file
@@ -0,0 +1,139 @@
+import pytest
+import test as driver
+from card import Card
+from player import Player
+from anomaly import AnomalySink, read_anomalies, summarize_anomalies, hand_pattern
+
+high_card_hand = [Card("♥️", 2), Card("♠️", 7), Card("♣️", 9), Card("♦️", 11), Card("♥️", 13)]
+
+def broken_one_pair_total(self, retained_hand):
+    # a formula bug for every retained hand of 4 cards
+    if len(retained_hand) == 4:
+        raise TypeError("broken formula")
+    return 0
+
+# region sink
+def test_sink_record_and_read(tmp_path):
+    path = str(tmp_path / "anomalies.tsv")
+    with AnomalySink(path) as sink:
+        sink.record(high_card_hand, high_card_hand[:2], "calc_one_pair_total_combination", "TypeError: broken\tformula")
+        sink.record(high_card_hand, None, "find_best_retained_hand", 1.5)
+        assert sink.count == 2
+
+    anomalies = list(read_anomalies(path))
+    assert anomalies[0] == (high_card_hand, high_card_hand[:2], "calc_one_pair_total_combination", "TypeError: broken formula")
+    assert anomalies[1] == (high_card_hand, None, "find_best_retained_hand", "1.5")
+
+def test_sink_append_and_truncate(tmp_path):
+    path = str(tmp_path / "anomalies.tsv")
+    with AnomalySink(path) as sink:
+        sink.record(high_card_hand, [], "a", 1)
+        size = sink.size
+        sink.record(high_card_hand, [], "b", 2)
+
+    # append only - a new sink keeps the anomalies
+    with AnomalySink(path) as sink:
+        sink.record(high_card_hand, [], "c", 3)
+    assert [anomaly[2] for anomaly in read_anomalies(path)] == ["a", "b", "c"]
+
+    # cut back to the size after the first anomaly
+    with AnomalySink(path, truncate_to=size) as sink:
+        assert sink.size == size
+    assert [anomaly[2] for anomaly in read_anomalies(path)] == ["a"]
+
+def test_summary():
+    pair_hand = [Card("♥️", 2), Card("♠️", 2), Card("♣️", 9), Card("♦️", 11), Card("♥️", 13)]
+    assert hand_pattern(pair_hand, pair_hand[:3]) == "one pair, keep 2+1"
+    assert hand_pattern(pair_hand, [pair_hand[0], pair_hand[4]]) == "one pair, keep 1+1 suited"
+    assert hand_pattern(pair_hand, []) == "one pair, keep 0"
+    assert hand_pattern(pair_hand, None) == "one pair"
+
+    summary = summarize_anomalies([(pair_hand, pair_hand[:3], "a", 1), (pair_hand, pair_hand[:3], "a", 2), (pair_hand, [], "b", 3)])
+    assert summary == {"a": {"one pair, keep 2+1": 2}, "b": {"one pair, keep 0": 1}}
+# endregion
+
+# region player
+def test_player_records_and_continues(tmp_path, monkeypatch):
+    monkeypatch.setattr(Player, "calc_one_pair_total_combination", broken_one_pair_total)
+    path = str(tmp_path / "anomalies.tsv")
+
+    with AnomalySink(path) as sink:
+        player = Player(anomaly_sink=sink)
+        result = player.solve(high_card_hand)
+
+    # the 5 retained hands of 4 cards are skipped
+    assert len(result.holds) == 26
+    anomalies = list(read_anomalies(path))
+    assert len(anomalies) == 5
+    assert all(anomaly[2] == "broken_one_pair_total" and len(anomaly[1]) == 4 for anomaly in anomalies)
+
+def test_player_find_best_records_each_hold(tmp_path, monkeypatch):
+    def broken_two_pairs_total(self, retained_hand):
+        if len(retained_hand) == 4:
+            raise TypeError("broken formula")
+        return original(self, retained_hand)
+    original = Player.calc_two_pairs_total_combination
+    monkeypatch.setattr(Player, "calc_two_pairs_total_combination", broken_two_pairs_total)
+    one_pair_hand = [Card("♥️", 2), Card("♠️", 2), Card("♣️", 9), Card("♦️", 11), Card("♥️", 13)]
+    path = str(tmp_path / "anomalies.tsv")
+
+    # the broken total is also part of the search's upper bound - the search goes on without pruning those holds
+    with AnomalySink(path) as sink:
+        (best_retained_hand, probability) = Player(anomaly_sink=sink).find_best_retained_hand(one_pair_hand)
+    assert best_retained_hand is not None and len(best_retained_hand) < 4
+
+    # every anomaly names the formula and the retained hand it failed on
+    anomalies = list(read_anomalies(path))
+    assert len(anomalies) == 5
+    assert all(anomaly[0] == one_pair_hand and anomaly[2] == "broken_two_pairs_total" for anomaly in anomalies)
+    assert {tuple(anomaly[1]) for anomaly in anomalies} == {tuple(hold) for hold in Player().generate_all_retained_hand_combination(one_pair_hand) if len(hold) == 4}
+
+def test_player_without_sink_raises_total(monkeypatch):
+    # a failing total is never a skipped retained hand without a sink - the hand cannot have a wrong best retained hand
+    monkeypatch.setattr(Player, "calc_one_pair_total_combination", broken_one_pair_total)
+    player = Player()
+
+    with pytest.raises(TypeError):
+        player.solve(high_card_hand)
+    with pytest.raises(TypeError):
+        player.search_best_retained_hand(high_card_hand)
+    with pytest.raises(TypeError):
+        player.find_best_retained_hand(high_card_hand)
+
+def test_player_without_sink_raises(monkeypatch):
+    def broken_better(self, given_hand, retained_hand):
+        raise ValueError("broken formula")
+    monkeypatch.setattr(Player, "calc_total_better_high_card_combination", broken_better)
+
+    with pytest.raises(ValueError):
+        Player().solve(high_card_hand)
+# endregion
+
+# region all hands run
+def test_all_iteration_collects_anomalies(tmp_path, monkeypatch):
+    monkeypatch.setattr(Player, "calc_one_pair_total_combination", broken_one_pair_total)
+    path = str(tmp_path / "anomalies.tsv")
+    aggregates = driver.all_iteration(stop=300, anomaly_path=path)
+
+    # the run went on to the last hand
+    assert aggregates["hands"] + aggregates["anomalies"] == 300
+    assert aggregates["anomalies"] > 0
+    # every anomaly is recorded per retained hand by the formula that failed - never for the whole given hand
+    assert set(summarize_anomalies(read_anomalies(path))) == {"broken_one_pair_total"}
+    assert all(retained_hand is not None and len(retained_hand) == 4 for (given_hand, retained_hand, method, value) in read_anomalies(path))
+    # every hand of a recorded class is an anomaly, each class is recorded once
+    assert len(aggregates["anomaly_classes"]) == len({tuple(given_hand) for (given_hand, retained_hand, method, value) in read_anomalies(path)})
+
+def test_all_iteration_resume_same_anomalies(tmp_path, monkeypatch):
+    monkeypatch.setattr(Player, "calc_one_pair_total_combination", broken_one_pair_total)
+    expected_path = str(tmp_path / "expected.tsv")
+    expected = driver.all_iteration(stop=300, anomaly_path=expected_path)
+
+    path = str(tmp_path / "anomalies.tsv")
+    checkpoint_path = str(tmp_path / "state.json")
+    driver.all_iteration(stop=150, checkpoint_path=checkpoint_path, anomaly_path=path, checkpoint_interval=100)
+    resumed = driver.all_iteration(stop=300, checkpoint_path=checkpoint_path, resume=True, anomaly_path=path, checkpoint_interval=100)
+
+    assert {key: value for key, value in resumed.items() if key != "anomaly_file_size"} == {key: value for key, value in expected.items() if key != "anomaly_file_size"}
+    assert open(path).read() == open(expected_path).read()
+# endregion
@@ -0,0 +1,72 @@
+import json
+import pytest
+from evaluator import CATEGORY_NAMES
+from benchmarks.corpus import Corpus, generate_category_index
+from benchmarks.timing import measure, percentile
+from benchmarks.run import run_benchmarks
+
+# region fixture
+@pytest.fixture(scope="module")
+def category_index():
+    # every hand is evaluated once for the module - a corpus only samples from it
+    return generate_category_index()
+
+@pytest.fixture(scope="module")
+def corpus(category_index):
+    return Corpus(seed=1, size=1, category_index=category_index)
+# endregion
+
+# region corpus
+def test_corpus_same_seed_same_hands(category_index):
+    corpus_1 = Corpus(seed=1, size=2, category_index=category_index)
+    corpus_2 = Corpus(seed=1, size=2, category_index=category_index)
+    assert [[str(card) for card in hand] for hand in corpus_1.all_hands()] == [[str(card) for card in hand] for hand in corpus_2.all_hands()]
+
+def test_corpus_every_combo(category_index):
+    corpus = Corpus(seed=1, size=2, category_index=category_index)
+    assert len(corpus.hands) == len(CATEGORY_NAMES)
+    for category, hands in enumerate(corpus.hands):
+        assert len(hands) == 2
+        for hand, retained_hand in zip(hands, corpus.retained_hands[category]):
+            assert len(hand) == 5
+            assert all(card in hand for card in retained_hand)
+            assert len(retained_hand) < 5
+# endregion
+
+# region timing
+def test_percentile():
+    assert percentile([1, 2, 3, 4], 0) == 1
+    assert percentile([1, 2, 3, 4], 100) == 4
+
+def test_measure():
+    result = measure(sum, [([1, 2],), ([3],)], repeat=2)
+    assert result["calls"] == 4
+    assert result["ops_per_sec"] > 0
+    assert result["p50_us"] <= result["p99_us"]
+    assert result["peak_memory_bytes"] >= 0
+
+def test_measure_setup():
+    # every call gets the args made by setup - the calls of a pass never share them
+    calls = []
+    def setup(value):
+        return ([value],)
+    result = measure(lambda values: calls.append(values.pop()), [(1,), (2,)], repeat=3, setup=setup)
+    assert result["calls"] == 6
+    assert calls == [1, 2] * 4
+# endregion
+
+# region run
+def test_run_benchmarks_json(corpus):
+    report = run_benchmarks(name_filter="total/", corpus=corpus)
+    assert report["meta"]["seed"] == 1
+    assert len(report["results"]) == 9
+    assert all(name.startswith("total/") for name in report["results"])
+    json.dumps(report)
+
+def test_run_deck_benchmarks_repeat(corpus):
+    # a deck is never reused across calls or repeats - it would run out of cards
+    report = run_benchmarks(name_filter="deck/", repeat=10, corpus=corpus)
+    assert set(report["results"]) == {"deck/shuffle", "deck/deal", "deck/deal_random_5", "deck/deal_5_mulligan_3"}
+    num_calls = 10 * len(corpus.all_hands())
+    assert all(result["calls"] == num_calls for result in report["results"].values())
+# endregion
@@ -0,0 +1,95 @@
+import pytest
+import random
+import itertools
+from player import Player
+from deck import Deck
+from card import Card, CARDS
+from evaluator import hand_strength
+
+np = pytest.importorskip("numpy")
+from brute_force import BruteForceEngine, VectorEvaluator
+
+# region fixture and helper function
+@pytest.fixture
+def player():
+    player = Player()
+    return player
+
+@pytest.fixture(scope="module")
+def engine():
+    return BruteForceEngine()
+
+def create_hand(num_list, suit_list):
+    hand = []
+
+    for i in range(len(num_list)):
+        card = Card(suit_list[i], num_list[i])
+        hand.append(card)
+    
+    return hand
+
+def random_five():
+    deck = Deck()
+    deck.shuffle()
+    hand = []
+    for _ in range(5):
+        hand.append(deck.deal())
+
+    return hand
+
+# endregion fixture and helper function
+
+def test_vector_evaluator():
+    evaluator = VectorEvaluator()
+    all_hand = list(itertools.islice(itertools.combinations(CARDS, 5), 0, 2598960, 97))
+    hand_ids = np.array([[card.id for card in hand] for hand in all_hand])
+
+    assert list(evaluator.strength(hand_ids)) == [hand_strength(hand) for hand in all_hand]
+
+def test_same_as_formula(player: Player, engine: BruteForceEngine):
+    for _ in range(30):
+        given_hand = random_five()
+        method_list = player.generate_method_list(given_hand)
+        retained_hand_combination = player.generate_all_retained_hand_combination(given_hand)
+
+        formula = [player.calc_better_combination(given_hand, retained_hand, method_list) for retained_hand in retained_hand_combination]
+        assert engine.calc_all_better_combination(given_hand, retained_hand_combination) == formula
+
+def test_same_as_formula_each_combo(player: Player, engine: BruteForceEngine):
+    all_given_hand = [
+        create_hand([14,13,12,11,10], ["♠️"]*5),
+        create_hand([9,10,11,12,13], ["♥️"]*5),
+        create_hand([7,7,7,7,2], ["♠️", "♥️", "♣️", "♦️", "♠️"]),
+        create_hand([3,3,3,9,9], ["♠️", "♥️", "♣️", "♦️", "♠️"]),
+        create_hand([2,5,7,9,13], ["♦️"]*5),
+        create_hand([5,6,7,8,9], ["♠️", "♥️", "♣️", "♦️", "♠️"]),
+        create_hand([12,12,12,4,2], ["♠️", "♥️", "♣️", "♦️", "♠️"]),
+        create_hand([8,8,11,11,3], ["♠️", "♥️", "♣️", "♦️", "♠️"]),
+        create_hand([10,10,14,6,3], ["♠️", "♥️", "♣️", "♦️", "♠️"]),
+        create_hand([14,5,4,3,2], ["♠️", "♥️", "♣️", "♦️", "♠️"]),
+    ]
+
+    for given_hand in all_given_hand:
+        method_list = player.generate_method_list(given_hand)
+        for retained_hand in player.generate_all_retained_hand_combination(given_hand):
+            assert engine.calc_better_combination(given_hand, retained_hand) == player.calc_better_combination(given_hand, retained_hand, method_list)
+
+def test_fallback(engine: BruteForceEngine):
+    fallback_player = Player(brute_force=engine)
+    given_hand = create_hand([8,8,11,11,3], ["♠️", "♥️", "♣️", "♦️", "♠️"])
+    retained_hand = given_hand[:2]
+
+    # simulate a formula that does not cover a scenario
+    fallback_player.formula_list[3]["total"] = lambda retained_hand: None
+
+    method_list = fallback_player.generate_method_list(given_hand)
+    assert fallback_player.calc_better_combination(given_hand, retained_hand, method_list) == engine.calc_better_combination(given_hand, retained_hand)
+
+def test_fallback_find_best_retained_hand(player: Player, engine: BruteForceEngine):
+    fallback_player = Player(brute_force=engine)
+    given_hand = create_hand([8,8,11,11,3], ["♠️", "♥️", "♣️", "♦️", "♠️"])
+
+    # the broken total is also part of the search's upper bound - it cannot prune, the engine answers instead
+    fallback_player.formula_list[3]["total"] = lambda retained_hand: None
+
+    assert fallback_player.find_best_retained_hand(given_hand) == player.find_best_retained_hand(given_hand)
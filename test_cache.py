@@ -0,0 +1,77 @@
+import pytest
+from card import Card
+from player import Player
+from cache import LRUCache, MISSING, sizeof
+
+def test_lru_cache_get_put():
+    cache = LRUCache(2)
+    assert cache.get("a") is MISSING
+    cache.put("a", 1)
+    cache.put("b", None)
+    assert cache.get("a") == 1
+    # None is a cached value
+    assert cache.get("b") is None
+    assert cache.get("c", 0) == 0
+    assert cache.stats() == {"hits": 2, "misses": 2, "evictions": 0, "bytes": sizeof("a") + sizeof(1) + sizeof("b") + sizeof(None), "size": 2, "maxsize": 2}
+
+def test_lru_cache_eviction():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    # "a" is now the most recently used
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+    assert len(cache) == 2
+    assert cache.evictions == 1
+
+    # updating a cached key does not evict
+    cache.put("a", 4)
+    assert cache.get("a") == 4
+    assert cache.evictions == 1
+
+def test_lru_cache_clear():
+    cache = LRUCache(1)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("b")
+    cache.clear()
+    assert cache.stats() == {"hits": 0, "misses": 0, "evictions": 0, "bytes": 0, "size": 0, "maxsize": 1}
+
+def test_lru_cache_invalid_size():
+    with pytest.raises(ValueError):
+        LRUCache(0)
+
+def test_lru_cache_bytes():
+    cache = LRUCache(2)
+    cache.put(("a", (1, 2)), 10)
+    assert cache.bytes == sizeof(("a", (1, 2))) + sizeof(10)
+
+    # replacing a value only changes the value size
+    cache.put(("a", (1, 2)), (10, 20))
+    assert cache.bytes == sizeof(("a", (1, 2))) + sizeof((10, 20))
+
+    # evicted entries are removed from the size
+    cache.put("b", 1)
+    cache.put("c", 2)
+    assert cache.bytes == sizeof("b") + sizeof(1) + sizeof("c") + sizeof(2)
+
+def test_player_cache_stats():
+    player = Player()
+    hand = [Card("♠️", 10), Card("♥️", 10), Card("♠️", 3), Card("♣️", 7), Card("♦️", 12)]
+    player.calc_best_retained_hand(hand)
+    stats = player.cache_stats()
+    assert stats["total"]["hits"] > 0
+    assert stats["better"]["misses"] > 0
+    assert stats["better"]["bytes"] > 0
+
+    # the same hand again is all cache hits
+    misses = stats["better"]["misses"]
+    player.calc_best_retained_hand(hand)
+    assert player.cache_stats()["better"]["misses"] == misses
+
+    no_cache_player = Player(total_cache_size=0, better_cache_size=0)
+    assert no_cache_player.cache_stats() == {"total": None, "better": None}
+    assert no_cache_player.calc_best_retained_hand(hand) == player.calc_best_retained_hand(hand)
@@ -0,0 +1,139 @@
+import pytest
+import random
+import itertools
+from player import Player
+from deck import Deck
+from card import Card, CARDS, SUITS
+from canonical import canonicalize, iter_class_representatives, retained_hand_pattern, better_combination_pattern
+
+# region fixture and helper function
+@pytest.fixture
+def player():
+    player = Player()
+    return player
+
+def create_hand(num_list, suit_list):
+    hand = []
+
+    for i in range(len(num_list)):
+        card = Card(suit_list[i], num_list[i])
+        hand.append(card)
+    
+    return hand
+
+def random_five():
+    deck = Deck()
+    deck.shuffle()
+    hand = []
+    for _ in range(5):
+        hand.append(deck.deal())
+
+    return hand
+
+# relabel the suit of every card in hand
+def permute_suit(hand, suit_order):
+    return [Card(SUITS[suit_order[card.suit_id]], card.value) for card in hand]
+
+# endregion fixture and helper function
+
+def test_canonicalize_permutation():
+    for _ in range(500):
+        hand = random_five()
+        (canonical_ids, suit_map) = canonicalize(hand)
+
+        for suit_order in itertools.permutations(range(4)):
+            assert canonicalize(permute_suit(hand, suit_order))[0] == canonical_ids
+
+        # suit_map is a permutation that maps the hand to the representative
+        assert sorted(suit_map) == [0, 1, 2, 3]
+        assert tuple(sorted(suit_map[card.suit_id] * 13 + card.value - 2 for card in hand)) == canonical_ids
+
+def test_canonicalize_different_class():
+    # same values but different suit pattern
+    flush = create_hand([2,4,6,8,10], ["♠️"]*5)
+    four_suit = create_hand([2,4,6,8,10], ["♠️", "♠️", "♥️", "♣️", "♦️"])
+    assert canonicalize(flush)[0] != canonicalize(four_suit)[0]
+
+    # same suit pattern but the suit is on different values
+    hand_a = create_hand([2,4,6,8,10], ["♠️", "♠️", "♥️", "♥️", "♦️"])
+    hand_b = create_hand([2,4,6,8,10], ["♠️", "♥️", "♠️", "♥️", "♦️"])
+    assert canonicalize(hand_a)[0] != canonicalize(hand_b)[0]
+
+def test_all_class():
+    all_class = set(canonicalize(hand)[0] for hand in itertools.combinations(CARDS, 5))
+    assert len(all_class) == 134459
+
+def test_iter_class_representatives():
+    representatives = list(iter_class_representatives())
+
+    # one representative of every class, each one is its own canonical hand
+    assert len(representatives) == len(set(representatives)) == 134459
+    for card_ids in representatives:
+        assert canonicalize([CARDS[card_id] for card_id in card_ids])[0] == card_ids
+
+def test_cached_best_retained_hand(player: Player):
+    cache_player = Player(cache_retained_hand=True)
+
+    for _ in range(20):
+        hand = random_five()
+        (best_retained_hand, best_probabilities) = player.find_best_retained_hand(hand)
+
+        for suit_order in random.sample(list(itertools.permutations(range(4))), 3):
+            permuted_hand = permute_suit(hand, suit_order)
+            (cache_retained_hand, cache_probabilities) = cache_player.find_best_retained_hand(permuted_hand)
+
+            # retained hand is the caller's cards
+            assert best_probabilities == cache_probabilities
+            assert all(card in permuted_hand for card in cache_retained_hand or [])
+            assert cache_player.calc_percent_of_better_combination(permuted_hand, cache_retained_hand or [], cache_player.generate_method_list(permuted_hand)) == cache_probabilities
+
+    assert len(cache_player.retained_hand_cache) <= 20
+
+def test_retained_hand_pattern():
+    # same counts, suit and straights on different values
+    assert retained_hand_pattern(create_hand([3,4], ["♠️", "♠️"])) == retained_hand_pattern(create_hand([9,12], ["♥️", "♥️"]))
+    # royal flush is only possible with 10-J-Q-K-A
+    assert retained_hand_pattern(create_hand([9,12], ["♥️", "♥️"])) != retained_hand_pattern(create_hand([10,12], ["♥️", "♥️"]))
+    # pair - no straight
+    assert retained_hand_pattern(create_hand([5,5], ["♠️", "♥️"])) == ((2,), False, 0, False)
+    assert retained_hand_pattern([]) == ((), True, 9, True)
+
+def test_retained_hand_pattern_total(player: Player):
+    no_cache_player = Player(total_cache_size=0)
+    names = ["royal_flush", "straight_flush", "four_of_a_kind", "full_house", "flush", "straight", "three_of_a_kind", "two_pairs", "one_pair"]
+
+    # holds with the same pattern have the same totals
+    totals = {}
+    for retained_hand in itertools.chain(itertools.combinations(CARDS, 2), random.sample(list(itertools.combinations(CARDS, 3)), 2000)):
+        pattern = retained_hand_pattern(retained_hand)
+        total = tuple(getattr(no_cache_player, f"calc_{name}_total_combination")(list(retained_hand)) for name in names)
+        assert totals.setdefault(pattern, total) == total
+
+    # cached totals are the same as calculated
+    for _ in range(200):
+        retained_hand = random_five()[:random.randint(0, 4)]
+        for name in names:
+            assert getattr(player, f"calc_{name}_total_combination")(retained_hand) == getattr(no_cache_player, f"calc_{name}_total_combination")(retained_hand)
+    assert player.total_cache.hits > 0
+    assert no_cache_player.total_cache is None
+
+def test_better_combination_pattern():
+    given_hand = create_hand([11,10,8,5,4], ["♠️"]*5)
+    permuted_hand = permute_suit(given_hand, [1, 2, 3, 0])
+    assert better_combination_pattern(given_hand, given_hand[1:3]) == better_combination_pattern(permuted_hand, permuted_hand[1:3])
+    assert better_combination_pattern(given_hand, [given_hand[3], given_hand[1]]) == ((4, 5, 8, 10, 11), (5, 10), True)
+    assert better_combination_pattern(given_hand, given_hand[1:3], use_suit=False) == ((4, 5, 8, 10, 11), (8, 10))
+
+def test_better_combination_pattern_cache():
+    no_cache_player = Player(better_cache_size=0)
+    cache_player = Player(better_cache_size=64)
+
+    for _ in range(30):
+        hand = random_five()
+        method_list = no_cache_player.generate_method_list(hand)
+        for retained_hand in no_cache_player.generate_all_retained_hand_combination(hand):
+            assert cache_player.calc_percent_of_better_combination(hand, retained_hand, cache_player.generate_method_list(hand)) == no_cache_player.calc_percent_of_better_combination(hand, retained_hand, method_list)
+
+    # small cache evicts
+    assert cache_player.better_cache.evictions > 0
+    assert len(cache_player.better_cache) == 64
@@ -1,4 +1,6 @@
-from card import Card
+import pickle
+import pytest
+from card import Card, CARDS
 
 def test_card():
     # Test initialization
@@ -23,4 +25,36 @@ def test_ace_card():
 
     assert ace_card.get_face_name() == "Ace"
 
-    assert str(ace_card) == "Ace♠️"
\ No newline at end of file
+    assert str(ace_card) == "Ace♠️"
+
+def test_invalid_card():
+    with pytest.raises(ValueError):
+        Card("X", 2)
+
+    with pytest.raises(ValueError):
+        Card("♠️", 15)
+
+# Test interned cards
+def test_card_is_interned():
+    assert Card("♦️", 11) is Card("♦️", 11)
+    assert Card("♦️", 11) is not Card("♦️", 12)
+
+    # pickle (process pool) keep the same object
+    card = Card("♣️", 7)
+    assert pickle.loads(pickle.dumps(card)) is card
+
+    # no per instance dict
+    assert not hasattr(card, "__dict__")
+
+def test_card_id():
+    assert len(CARDS) == 52
+
+    for card_id, card in enumerate(CARDS):
+        assert card.id == card_id
+        assert Card.from_id(card_id) is card
+        assert Card(card.suit, card.value) is card
+
+    card = Card("♥️", 14)
+    assert card.id == 25
+    assert card.suit_id == 1
+    assert card.value == 14
\ No newline at end of file
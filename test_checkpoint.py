@@ -0,0 +1,44 @@
+import os
+import pytest
+import test as driver
+from checkpoint import Checkpoint
+
+def test_checkpoint_save_load(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / "state.json"))
+    assert checkpoint.load() is None
+
+    checkpoint.save(10, {"probability_sum": 0.1 + 0.2, "hands": 10})
+    assert checkpoint.load() == (10, {"probability_sum": 0.1 + 0.2, "hands": 10})
+    # the temp file is renamed over the checkpoint
+    assert not os.path.exists(checkpoint.path + ".tmp")
+
+    checkpoint.save(20, {"hands": 20})
+    assert checkpoint.load() == (20, {"hands": 20})
+
+    checkpoint.remove()
+    assert checkpoint.load() is None
+
+def test_checkpoint_invalid_version(tmp_path):
+    path = tmp_path / "state.json"
+    path.write_text('{"version": 0, "next_index": 0, "aggregates": {}}')
+    with pytest.raises(ValueError):
+        Checkpoint(str(path)).load()
+
+def test_checkpoint_invalid_order(tmp_path):
+    # a checkpoint of another hand order (ie: colex ranks) cannot resume the lex order run
+    path = tmp_path / "state.json"
+    path.write_text('{"version": 1, "order": "colex", "next_index": 0, "aggregates": {}}')
+    with pytest.raises(ValueError):
+        Checkpoint(str(path)).load()
+
+def test_resume_same_as_uninterrupted(tmp_path):
+    path = str(tmp_path / "state.json")
+    expected = driver.all_iteration(stop=400)
+
+    # first run stops at hand 250 - the checkpoint has every hand before it
+    driver.all_iteration(stop=250, checkpoint_path=path, checkpoint_interval=100)
+    assert Checkpoint(path).load()[0] == 250
+
+    resumed = driver.all_iteration(stop=400, checkpoint_path=path, resume=True, checkpoint_interval=100)
+    assert resumed == expected
+    assert Checkpoint(path).load() == (400, expected)
@@ -0,0 +1,47 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+from dealer import Dealer
+
+# region deal
+def test_deal_shape_and_unique():
+    hands = Dealer(seed=1).deal(10000)
+    assert hands.shape == (10000, 5)
+    assert hands.min() >= 0 and hands.max() <= 51
+    assert all(len(set(hand)) == 5 for hand in hands.tolist())
+
+def test_deal_same_seed_same_hands():
+    assert (Dealer(seed=1).deal(100) == Dealer(seed=1).deal(100)).all()
+
+def test_deal_every_card():
+    counts = np.bincount(Dealer(seed=2).deal(52000).ravel(), minlength=52)
+    # every card is dealt ~5000 times
+    assert counts.min() > 4500 and counts.max() < 5500
+# endregion
+
+# region mulligan
+def test_mulligan_keeps_retained_cards():
+    dealer = Dealer(seed=3)
+    hands = dealer.deal(10000)
+    retained_masks = np.arange(10000) % 31
+    new_hands = dealer.mulligan(hands, retained_masks)
+
+    for hand, new_hand, mask in zip(hands.tolist(), new_hands.tolist(), retained_masks.tolist()):
+        retained_hand = [hand[j] for j in range(5) if mask >> j & 1]
+        assert len(set(new_hand)) == 5
+        for j in range(5):
+            if mask >> j & 1:
+                assert new_hand[j] == hand[j]
+            else:
+                assert new_hand[j] not in retained_hand
+
+def test_mulligan_redraws_from_every_card_left():
+    # keep the first card - the 4 redrawn cards are any of the other 51 cards (the discarded cards too)
+    hands = np.tile(np.arange(5, dtype=np.int8), (51000, 1))
+    new_hands = Dealer(seed=4).mulligan(hands, np.ones(51000, dtype=np.int64))
+    counts = np.bincount(new_hands[:, 1:].ravel(), minlength=52)
+
+    assert counts[0] == 0
+    # every other card is redrawn ~4000 times
+    assert counts[1:].min() > 3600 and counts[1:].max() < 4400
+# endregion
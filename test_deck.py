@@ -1,5 +1,7 @@
 import pytest
-from deck import Deck
+import itertools
+from deck import Deck, unrank_combination
+from card import Card
 
 @pytest.fixture
 def full_deck():
@@ -64,8 +66,114 @@ def test_deal_card(full_deck):
     assert ace_heart.value == 14
     assert ace_heart.face == 'Ace'
 
+    # card is gone from the deck and is the same interned card
+    assert ace_heart is Card("♥️", 14)
+    assert ace_heart not in full_deck.cards
+    assert len(full_deck.cards) == 51
+    assert full_deck.deal_card(14, "♥️") is None
+
+    # invalid card
+    assert full_deck.deal_card(15, "♥️") is None
+
+def test_deal_card_keeps_order(full_deck):
+    full_deck.shuffle()
+    order = full_deck.cards
+    dealt = [full_deck.deal_card(card.value, card.suit) for card in order[10:40]]
+
+    # membership, count and order of the cards left - the dealt cards are tombstones until the deck is compacted
+    assert all(card not in full_deck for card in dealt)
+    assert all(card in full_deck for card in order[:10] + order[40:])
+    assert len(full_deck) == 22
+    assert full_deck.cards == order[:10] + order[40:]
+    assert [full_deck.deal() for _ in range(22)] == list(order[:10] + order[40:])[::-1]
+    assert full_deck.deal() is None
+
+def test_duplicate_deck_is_independent(full_deck):
+    full_deck.deal_card(14, "♥️")
+    duplicate_deck = full_deck.create_duplicate_deck()
+    duplicate_deck.deal()
+
+    assert len(full_deck) == 51
+    assert len(duplicate_deck) == 50
+    assert full_deck.cards[:-1] == duplicate_deck.cards
+
+def test_cards_is_read_only(full_deck):
+    # the cards are a tuple - changing them fails instead of leaving the deck as it was
+    with pytest.raises(AttributeError):
+        full_deck.cards.append(Card("♥️", 14))
+    with pytest.raises(AttributeError):
+        full_deck.cards.remove(Card("♥️", 14))
+
+    # assigning cards replaces the deck
+    full_deck.cards = [Card("♥️", 14), Card("♠️", 2)]
+    assert full_deck.cards == (Card("♥️", 14), Card("♠️", 2))
+    assert len(full_deck) == 2
+
+def test_mulligan_card_already_in_deck(full_deck):
+    with pytest.raises(ValueError):
+        full_deck.mulligan([Card("♥️", 14)])
+
 def test_generate_all_iteration(full_deck):
     all_iteration_list = full_deck.generate_all_iteration()
 
     assert len(all_iteration_list) == 2598960
-    assert len(set(tuple(hand) for hand in all_iteration_list)) == 2598960
\ No newline at end of file
+    assert len(set(tuple(hand) for hand in all_iteration_list)) == 2598960
+
+def test_stream_all_iteration(full_deck):
+    all_iteration_list = full_deck.generate_all_iteration()
+
+    # same hands in the same order
+    assert list(full_deck.stream_all_iteration()) == all_iteration_list
+
+    # start / stop by hand index
+    for (start, stop) in [(0, 10), (123456, 124000), (2598950, 2598960), (2598950, 3000000), (10, 10)]:
+        assert list(full_deck.stream_all_iteration(start, stop)) == all_iteration_list[start:stop]
+
+    # chunks
+    chunks = list(full_deck.stream_all_iteration(1000, 3500, chunk_size=1000))
+    assert [len(chunk) for chunk in chunks] == [1000, 1000, 500]
+    assert [hand for chunk in chunks for hand in chunk] == all_iteration_list[1000:3500]
+
+def test_stream_all_iteration_dealt_deck(full_deck):
+    full_deck.shuffle()
+    for _ in range(40):
+        full_deck.deal()
+
+    # hands from the 12 cards left in the deck
+    assert list(full_deck.stream_all_iteration()) == full_deck.generate_all_iteration()
+    assert len(list(full_deck.stream_all_iteration())) == 792
+
+def test_unrank_combination():
+    all_combination = list(itertools.combinations(range(10), 3))
+    for index, combination in enumerate(all_combination):
+        assert tuple(unrank_combination(index, 10, 3)) == combination
+
+    assert unrank_combination(2598959, 52, 5) == [47, 48, 49, 50, 51]
+    with pytest.raises(ValueError):
+        unrank_combination(2598960, 52, 5)
+
+def test_deal_random(full_deck):
+    dealt = full_deck.deal_random(5)
+
+    assert len(dealt) == 5
+    assert len(set(dealt)) == 5
+    assert len(full_deck) == 47
+    assert all(card not in full_deck for card in dealt)
+    assert sorted(card.id for card in full_deck.cards + tuple(dealt)) == list(range(52))
+
+    # the deck runs out
+    assert len(full_deck.deal_random(50)) == 47
+    assert full_deck.deal_random(1) == []
+
+def test_seeded_deck():
+    deck_1 = Deck(seed=1)
+    deck_2 = Deck(seed=1)
+    assert deck_1.deal_random(5) == deck_2.deal_random(5)
+
+    hand_1 = deck_1.deal_random(5)
+    hand_2 = deck_2.deal_random(5)
+    assert deck_1.mulligan(hand_1[:3]) == deck_2.mulligan(hand_2[:3])
+
+    deck_1.shuffle()
+    deck_2.shuffle()
+    assert deck_1.cards == deck_2.cards
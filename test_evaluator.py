@@ -0,0 +1,107 @@
+import pytest
+import itertools
+from collections import Counter
+from player import Player
+from card import CARDS
+from evaluator import CATEGORY_NAMES, STRENGTH_MAP, hand_strength, category_of, PrimeEvaluator
+from test_player import create_hand, random_five, find_better_combo_by_strength, all_redraw_combination
+
+# region fixture and helper function
+@pytest.fixture
+def player():
+    player = Player()
+    return player
+
+@pytest.fixture(scope="module")
+def prime_evaluator():
+    return PrimeEvaluator()
+
+# endregion fixture and helper function
+
+def test_strength_map():
+    # 6175 value combinations + 1287 same suit value combinations
+    assert len(STRENGTH_MAP) == 7462
+    assert len(set(STRENGTH_MAP.values())) == 7462
+
+def test_category_count():
+    # https://en.wikipedia.org/wiki/Poker_probability
+    # steel wheel A-2-3-4-5 is a high card (or a flush when same suit)
+    category_count = Counter(category_of(hand_strength(hand)) for hand in itertools.combinations(CARDS, 5))
+
+    assert category_count[CATEGORY_NAMES.index("royal flush")] == 4
+    assert category_count[CATEGORY_NAMES.index("straight flush")] == 32
+    assert category_count[CATEGORY_NAMES.index("four of a kind")] == 624
+    assert category_count[CATEGORY_NAMES.index("full house")] == 3744
+    assert category_count[CATEGORY_NAMES.index("flush")] == 5108 + 4
+    assert category_count[CATEGORY_NAMES.index("straight")] == 10200 - 1020
+    assert category_count[CATEGORY_NAMES.index("three of a kind")] == 54912
+    assert category_count[CATEGORY_NAMES.index("two pair")] == 123552
+    assert category_count[CATEGORY_NAMES.index("one pair")] == 1098240
+    assert category_count[CATEGORY_NAMES.index("high card")] == 1302540 + 1020
+
+def test_category_same_as_check_method(player: Player):
+    for _ in range(2000):
+        hand = random_five()
+        method_list = player.generate_method_list(hand)
+        assert CATEGORY_NAMES[category_of(hand_strength(hand))] == method_list[0]["name"]
+
+def test_strength_order():
+    # better category
+    pair = create_hand([14,14,13,12,11], ["♠️", "♥️", "♣️", "♦️", "♠️"])
+    two_pair = create_hand([2,2,3,3,4], ["♠️", "♥️", "♣️", "♦️", "♠️"])
+    assert hand_strength(two_pair) > hand_strength(pair)
+
+    # same category - compare by pair then kicker
+    better_kicker = create_hand([14,14,13,12,10], ["♠️", "♥️", "♣️", "♦️", "♠️"])
+    assert hand_strength(pair) > hand_strength(better_kicker)
+
+    # same category - full house rank by triple
+    full_house_a = create_hand([3,3,3,2,2], ["♠️", "♥️", "♣️", "♦️", "♠️"])
+    full_house_b = create_hand([2,2,2,14,14], ["♠️", "♥️", "♣️", "♦️", "♠️"])
+    assert hand_strength(full_house_a) > hand_strength(full_house_b)
+
+    # straight rank by highest card
+    straight_a = create_hand([3,4,5,6,7], ["♠️", "♥️", "♣️", "♦️", "♠️"])
+    straight_b = create_hand([2,3,4,5,6], ["♠️", "♥️", "♣️", "♦️", "♠️"])
+    assert hand_strength(straight_a) > hand_strength(straight_b)
+
+    # same value different suit
+    high_card_a = create_hand([2,4,6,8,10], ["♠️", "♥️", "♣️", "♦️", "♠️"])
+    high_card_b = create_hand([2,4,6,8,10], ["♥️", "♥️", "♣️", "♦️", "♠️"])
+    assert hand_strength(high_card_a) == hand_strength(high_card_b)
+
+def test_prime_evaluator_same_as_hand_strength(prime_evaluator: PrimeEvaluator):
+    for hand in itertools.combinations(CARDS, 5):
+        assert prime_evaluator.strength(hand) == hand_strength(hand)
+
+def test_prime_evaluator_category(player: Player, prime_evaluator: PrimeEvaluator):
+    prime_player = Player(evaluator=prime_evaluator)
+
+    for _ in range(2000):
+        hand = random_five()
+        assert CATEGORY_NAMES[prime_evaluator.category(hand)] == player.generate_method_list(hand)[0]["name"]
+        assert len(prime_player.generate_method_list(hand)) == len(player.generate_method_list(hand))
+
+def test_prime_evaluator_better_combination(player: Player, prime_evaluator: PrimeEvaluator):
+    # scenario 1: flush - keep 3
+    given_hand = create_hand([4,5,8,10,11], ["♠️"]*5)
+    retained_hand = given_hand[:3]
+    all_better_combination = find_better_combo_by_strength(given_hand, all_redraw_combination(retained_hand), prime_evaluator)
+    method_list = player.generate_method_list(given_hand)
+    better = sum(combo["total"](retained_hand) for combo in method_list[1:]) + method_list[0]["better"](given_hand, retained_hand)
+    assert better == len(all_better_combination)
+
+    # scenario 2: two pair - keep 2 pair
+    given_hand = create_hand([6,6,9,9,3], ["♠️", "♥️", "♣️", "♦️", "♠️"])
+    retained_hand = given_hand[:4]
+    all_better_combination = find_better_combo_by_strength(given_hand, all_redraw_combination(retained_hand), prime_evaluator)
+    method_list = player.generate_method_list(given_hand)
+    better = sum(combo["total"](retained_hand) for combo in method_list[1:]) + method_list[0]["better"](given_hand, retained_hand)
+    assert better == len(all_better_combination)
+
+    # scenario 3: high card - keep 2
+    given_hand = create_hand([2,5,9,12,13], ["♠️", "♥️", "♣️", "♦️", "♠️"])
+    retained_hand = given_hand[3:]
+    all_better_combination = find_better_combo_by_strength(given_hand, all_redraw_combination(retained_hand), prime_evaluator)
+    better = player.calc_percent_of_better_combination(given_hand, retained_hand, player.generate_method_list(given_hand)) * player.calc_total_combination(3)
+    assert round(better) == len(all_better_combination)
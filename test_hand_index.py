@@ -0,0 +1,74 @@
+import pytest
+import random
+import itertools
+from deck import Deck, unrank_combination
+from hand_index import TOTAL_HANDS, TOTAL_HOLDS, rank_hand, unrank_hand, rank_hold, unrank_hold, iter_hand_ids
+
+# region hand
+def test_unrank_hand_inverse_of_rank_hand():
+    rng = random.Random(1)
+    for rank in [0, 1, TOTAL_HANDS - 1] + [rng.randrange(TOTAL_HANDS) for _ in range(5000)]:
+        card_ids = unrank_hand(rank)
+        assert list(card_ids) == sorted(set(card_ids))
+        assert rank_hand(card_ids) == rank
+
+def test_unrank_hand_matches_iter_hand_ids():
+    for rank, ids in enumerate(itertools.islice(iter_hand_ids(), 5000)):
+        assert unrank_hand(rank) == tuple(ids)
+
+    assert unrank_hand(0) == (0, 1, 2, 3, 4)
+    assert unrank_hand(TOTAL_HANDS - 1) == (47, 48, 49, 50, 51)
+
+def test_iter_hand_ids_range():
+    assert list(iter_hand_ids(0, 3)) == [(0, 1, 2, 3, 4), (0, 1, 2, 3, 5), (0, 1, 2, 4, 5)]
+    for start in [0, 1, 4, 5, 20, 1000, 1234567, TOTAL_HANDS - 10]:
+        assert list(iter_hand_ids(start, start + 10)) == [unrank_hand(rank) for rank in range(start, min(start + 10, TOTAL_HANDS))]
+    assert list(iter_hand_ids(TOTAL_HANDS - 1, TOTAL_HANDS + 5)) == [(47, 48, 49, 50, 51)]
+    assert list(iter_hand_ids(5, 5)) == []
+
+def test_lex_index_and_colex_rank():
+    # Deck.generate_all_iteration (lex index) and rank_hand (colex rank) are 2 orders of the same hands
+    lex_hands = [tuple(card.id for card in hand) for hand in Deck().stream_all_iteration(0, 2000)]
+    assert lex_hands[:2] == [unrank_hand(0), unrank_hand(1)]
+    assert lex_hands != list(iter_hand_ids(0, 2000))
+
+    # converting between them gives back the same hand
+    rng = random.Random(3)
+    for index in [rng.randrange(TOTAL_HANDS) for _ in range(2000)]:
+        hand_ids = tuple(unrank_combination(index, 52, 5))
+        assert unrank_hand(rank_hand(hand_ids)) == hand_ids
+
+def test_unrank_hand_out_of_range():
+    with pytest.raises(ValueError):
+        unrank_hand(-1)
+    with pytest.raises(ValueError):
+        unrank_hand(TOTAL_HANDS)
+# endregion hand
+
+# region hold
+@pytest.mark.parametrize("num_card", [0, 1, 2, 3])
+def test_rank_hold_every_hold(num_card):
+    # every hold of num_card cards gets a different rank in 0..comb(52, num_card)-1 and unranks back
+    ranks = set()
+    for hold in itertools.combinations(range(52), num_card):
+        rank = rank_hold(hold)
+        assert unrank_hold(rank, num_card) == hold
+        ranks.add(rank)
+    assert ranks == set(range(TOTAL_HOLDS[num_card]))
+
+def test_rank_hold_four_cards():
+    rng = random.Random(2)
+    assert rank_hold([0, 1, 2, 3]) == 0
+    assert rank_hold([48, 49, 50, 51]) == TOTAL_HOLDS[4] - 1
+    for _ in range(5000):
+        hold = rng.sample(range(52), 4)
+        assert unrank_hold(rank_hold(hold), 4) == tuple(sorted(hold))
+
+def test_rank_hold_invalid():
+    with pytest.raises(ValueError):
+        rank_hold([0, 1, 2, 3, 4])
+    with pytest.raises(ValueError):
+        unrank_hold(TOTAL_HOLDS[2], 2)
+    with pytest.raises(ValueError):
+        unrank_hold(0, 5)
+# endregion hold
@@ -0,0 +1,68 @@
+import pytest
+import random
+import itertools
+from player import Player
+from deck import Deck
+from card import CARDS
+from evaluator import CATEGORY_NAMES, hand_strength
+from hand_index import TOTAL_HANDS, rank_hand, iter_hand_ids
+from hand_rank_table import build_hand_rank_table, load_hand_rank_table, HandRankTable
+
+# region fixture and helper function
+@pytest.fixture(scope="module")
+def table(tmp_path_factory):
+    path = tmp_path_factory.mktemp("table") / "hand_rank_table.bin"
+    build_hand_rank_table(path)
+    table = HandRankTable(path)
+    yield table
+    table.close()
+
+def random_five():
+    deck = Deck()
+    deck.shuffle()
+    hand = []
+    for _ in range(5):
+        hand.append(deck.deal())
+
+    return hand
+
+# endregion fixture and helper function
+
+def test_rank_hand():
+    # first and last hand
+    assert rank_hand([0,1,2,3,4]) == 0
+    assert rank_hand([47,48,49,50,51]) == TOTAL_HANDS - 1
+
+    # order of the card does not matter
+    assert rank_hand([4,3,2,1,0]) == rank_hand([0,1,2,3,4])
+
+    # iter_hand_ids is in rank order
+    for rank, ids in enumerate(itertools.islice(iter_hand_ids(), 10000)):
+        assert rank_hand(ids) == rank
+
+def test_all_rank_unique():
+    all_rank = set(rank_hand([card.id for card in hand]) for hand in itertools.combinations(CARDS, 5))
+    assert len(all_rank) == TOTAL_HANDS
+    assert min(all_rank) == 0
+    assert max(all_rank) == TOTAL_HANDS - 1
+
+def test_table_strength(table: HandRankTable):
+    assert len(table.table) == TOTAL_HANDS
+
+    for _ in range(2000):
+        hand = random_five()
+        assert table.strength(hand) == hand_strength(hand)
+
+def test_player_with_table(table: HandRankTable):
+    player = Player()
+    table_player = Player(evaluator=table)
+
+    for _ in range(2000):
+        hand = random_five()
+        method_list = player.generate_method_list(hand)
+        table_method_list = table_player.generate_method_list(hand)
+        assert [combo["name"] for combo in method_list] == [combo["name"] for combo in table_method_list]
+        assert CATEGORY_NAMES[table.category(hand)] == method_list[0]["name"]
+
+def test_load_missing_table(tmp_path):
+    assert load_hand_rank_table(tmp_path / "missing.bin") is None
@@ -0,0 +1,39 @@
+import json
+import itertools
+from card import Card
+from player import Player
+from instrumentation import Instrumentation
+
+given_hand = [Card("♥️", 2), Card("♠️", 7), Card("♣️", 9), Card("♦️", 11), Card("♥️", 13)]
+
+def test_player_without_instrumentation():
+    player = Player()
+    assert player.instrumentation is None
+    assert player.combinations is itertools.combinations
+    assert "calc_total_better_high_card_combination" not in vars(player)
+
+def test_instrumentation_same_answer():
+    instrumentation = Instrumentation()
+    assert Player(instrumentation=instrumentation).find_best_retained_hand(given_hand) == Player().find_best_retained_hand(given_hand)
+
+def test_instrumentation_stages():
+    instrumentation = Instrumentation()
+    player = Player(instrumentation=instrumentation, total_cache_size=0, better_cache_size=0)
+    player.solve(given_hand)
+    stats = instrumentation.stats()
+
+    assert stats["generate_all_retained_hand_combination"]["calls"] == 1
+    assert stats["generate_method_list"]["calls"] == 1
+    # high card - every retained hand calls the better method once and every total once
+    assert stats["calc_total_better_high_card_combination"]["calls"] == 31
+    assert stats["calc_total_better_high_card_combination"]["combinations"] > 0
+    assert stats["calc_one_pair_total_combination"]["calls"] == 31
+    assert stats["calc_one_pair_total_combination"]["combinations"] == 0
+    assert all(stage["time_ns"] > 0 for stage in stats.values())
+    assert json.loads(instrumentation.to_json()) == stats
+
+def test_instrumentation_reset():
+    instrumentation = Instrumentation()
+    Player(instrumentation=instrumentation).solve(given_hand)
+    instrumentation.reset()
+    assert instrumentation.stats() == {}
@@ -0,0 +1,124 @@
+import pytest
+import random
+import itertools
+from player import Player, RETAINED_HAND_POSITIONS, TOTAL_COMBINATIONS
+from deck import Deck
+from card import Card, CARDS
+from evaluator import hand_strength, category_of
+from lattice import LatticeEvaluator, EMPTY_HOLD, MIXED_SUIT
+
+# region fixture and helper function
+@pytest.fixture
+def player():
+    player = Player()
+    return player
+
+@pytest.fixture(scope="module")
+def lattice():
+    return LatticeEvaluator()
+
+def create_hand(num_list, suit_list):
+    hand = []
+
+    for i in range(len(num_list)):
+        card = Card(suit_list[i], num_list[i])
+        hand.append(card)
+    
+    return hand
+
+def random_five():
+    deck = Deck()
+    deck.shuffle()
+    hand = []
+    for _ in range(5):
+        hand.append(deck.deal())
+
+    return hand
+
+# a hand for every combo
+COMBO_HANDS = [
+    create_hand([2,4,7,9,13], ["♠️", "♥️", "♠️", "♣️", "♦️"]),
+    create_hand([2,2,5,9,13], ["♠️", "♥️", "♠️", "♣️", "♦️"]),
+    create_hand([2,2,5,5,13], ["♠️", "♥️", "♠️", "♣️", "♦️"]),
+    create_hand([8,8,8,5,13], ["♠️", "♥️", "♣️", "♣️", "♦️"]),
+    create_hand([4,5,6,7,8], ["♠️", "♥️", "♣️", "♣️", "♦️"]),
+    create_hand([2,5,6,9,13], ["♠️"]*5),
+    create_hand([3,3,3,9,9], ["♠️", "♥️", "♣️", "♣️", "♦️"]),
+    create_hand([14,14,14,14,2], ["♠️", "♥️", "♣️", "♦️", "♦️"]),
+    create_hand([5,6,7,8,9], ["♥️"]*5),
+    create_hand([10,11,12,13,14], ["♥️"]*5),
+]
+
+# endregion fixture and helper function
+
+def test_hold_states(lattice: LatticeEvaluator):
+    given_hand = create_hand([2,2,5,9,13], ["♠️", "♥️", "♠️", "♠️", "♦️"])
+    states = lattice.generate_hold_states(given_hand)
+
+    assert len(states) == 31
+    assert states[0] is EMPTY_HOLD
+    for positions, state in zip(RETAINED_HAND_POSITIONS, states):
+        retained_hand = [given_hand[i] for i in positions]
+        assert state.values == tuple(sorted(card.value for card in retained_hand))
+        assert state.counts == tuple([card.value for card in retained_hand].count(val) for val in range(2, 15))
+        if len({card.suit_id for card in retained_hand}) > 1:
+            assert state.suit == MIXED_SUIT
+        elif len(retained_hand) > 0:
+            assert state.suit == retained_hand[0].suit_id
+
+def test_completion_ways(lattice: LatticeEvaluator):
+    # every redraw is counted once
+    for given_hand in COMBO_HANDS:
+        for state in lattice.generate_hold_states(given_hand):
+            (strengths, at_least) = lattice.calc_completion(state)
+            assert at_least[0] == TOTAL_COMBINATIONS[5 - len(state.values)]
+            assert strengths == sorted(set(strengths))
+
+def test_same_as_formula(player: Player, lattice: LatticeEvaluator):
+    for given_hand in COMBO_HANDS + [random_five() for _ in range(100)]:
+        method_list = player.generate_method_list(given_hand)
+        expected = [player.calc_percent_of_better_combination(given_hand, retained_hand, method_list) for retained_hand in player.generate_all_retained_hand_combination(given_hand)]
+        assert lattice.calc_all_percent_of_better_combination(given_hand) == expected
+
+def test_player_with_lattice(player: Player, lattice: LatticeEvaluator):
+    lattice_player = Player(lattice=lattice)
+
+    for given_hand in COMBO_HANDS + [random_five() for _ in range(50)]:
+        assert lattice_player.calc_best_retained_hand(given_hand) == player.calc_best_retained_hand(given_hand)
+
+        result = lattice_player.solve(given_hand)
+        expected = player.solve(given_hand)
+        assert result.category == expected.category
+        assert [(hold.retained_hand, hold.better_combination, hold.total_combination) for hold in result.holds] == [(hold.retained_hand, hold.better_combination, hold.total_combination) for hold in expected.holds]
+
+
+# region distribution
+def test_distribution_same_as_better(lattice: LatticeEvaluator):
+    for given_hand in COMBO_HANDS + [random_five() for _ in range(50)]:
+        distributions = lattice.calc_all_distribution(given_hand)
+        holds = lattice.calc_all_better_combination(given_hand)
+
+        for distribution, hold in zip(distributions, holds):
+            assert distribution.retained_hand == hold.retained_hand
+            assert distribution.better_combination == hold.better_combination
+            assert sum(distribution.category_combinations) == distribution.total_combination
+            assert distribution.better + distribution.equal + distribution.worse == distribution.category_combinations[distribution.category]
+
+def test_distribution_same_as_enumeration(lattice: LatticeEvaluator):
+    for given_hand in COMBO_HANDS[:3]:
+        given_strength = hand_strength(given_hand)
+
+        # keep 3+ cards - every redraw is enumerated
+        for distribution in lattice.calc_all_distribution(given_hand)[-15:]:
+            category_combinations = [0] * 10
+            split = [0, 0, 0]
+            deck = [card for card in CARDS if card not in distribution.retained_hand]
+            for redraw in itertools.combinations(deck, 5 - len(distribution.retained_hand)):
+                strength = hand_strength(distribution.retained_hand + list(redraw))
+                category_combinations[category_of(strength)] += 1
+                if category_of(strength) == distribution.category:
+                    split[0 if strength > given_strength else 1 if strength == given_strength else 2] += 1
+
+            assert tuple(category_combinations) == distribution.category_combinations
+            assert split == [distribution.better, distribution.equal, distribution.worse]
+# endregion
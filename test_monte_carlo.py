@@ -0,0 +1,95 @@
+import pytest
+import random
+from card import Card, CARDS
+from player import Player
+from lattice import LatticeEvaluator
+
+np = pytest.importorskip("numpy")
+from monte_carlo import MonteCarloEstimator, wilson_interval
+
+# region fixture
+@pytest.fixture(scope="module")
+def estimator():
+    return MonteCarloEstimator(seed=7)
+# endregion
+
+# region wilson interval
+def test_wilson_interval():
+    (low, high) = wilson_interval(50, 100, 1.96)
+    assert low < 0.5 < high
+    assert wilson_interval(0, 100, 1.96)[0] == pytest.approx(0)
+    assert wilson_interval(100, 100, 1.96)[1] == pytest.approx(1)
+    assert wilson_interval(0, 0, 1.96) == (0.0, 1.0)
+
+def test_invalid_estimator():
+    with pytest.raises(ValueError):
+        MonteCarloEstimator(confidence=1)
+    with pytest.raises(ValueError):
+        MonteCarloEstimator(batch_size=100, max_samples=10)
+# endregion
+
+# region estimate
+def test_estimate_same_seed_same_result():
+    hand = [Card("♠️", 10), Card("♥️", 10), Card("♠️", 3), Card("♣️", 7), Card("♦️", 12)]
+    result_1 = MonteCarloEstimator(seed=1).estimate(hand)
+    result_2 = MonteCarloEstimator(seed=1).estimate(hand)
+    assert [(hold.better_combination, hold.total_combination) for hold in result_1.holds] == [(hold.better_combination, hold.total_combination) for hold in result_2.holds]
+
+def test_estimate_close_to_exact(estimator):
+    rng = random.Random(3)
+    lattice = LatticeEvaluator()
+    for _ in range(5):
+        hand = rng.sample(CARDS, 5)
+        result = estimator.estimate(hand)
+        exact = lattice.solve(hand)
+
+        assert len(result.holds) == 31
+        assert result.category == exact.category
+        # the estimated best retained hand is (close to) as good as the exact best
+        exact_probability = {tuple(hold.retained_hand): hold.probability for hold in exact.holds}
+        assert exact_probability[tuple(result.best_retained_hand)] > exact.probability - 0.02
+        for hold in result.holds:
+            assert hold.low <= hold.probability <= hold.high
+
+def test_estimate_close_runner_up():
+    # the best 2 retained hands are 0.003 apart - too close to separate, the exact best must never be out of the race
+    hand = [CARDS[card_id] for card_id in [5, 35, 31, 12, 10]]
+    exact = LatticeEvaluator().solve(hand)
+    (first, second) = exact.holds[:2]
+    assert 0 < first.probability - second.probability < 0.005
+
+    # an unadjusted 95% interval per retained hand drops the exact best with seed 9
+    for seed in range(6, 12):
+        estimator = MonteCarloEstimator(seed=seed)
+        holds = {tuple(hold.retained_hand): hold for hold in estimator.estimate(hand).holds}
+        best = holds[tuple(first.retained_hand)]
+        assert best.total_combination == estimator.max_samples
+        assert best.low <= first.probability <= best.high
+        assert holds[tuple(second.retained_hand)].total_combination == estimator.max_samples
+
+def test_confidence_is_adjusted():
+    # every interval of the race is wider than a single 95% interval
+    estimator = MonteCarloEstimator(confidence=0.95)
+    assert estimator.z > 3.9
+    assert MonteCarloEstimator(confidence=0.99).z > estimator.z
+
+def test_estimate_royal_flush(estimator):
+    hand = [Card("♠️", 10), Card("♠️", 11), Card("♠️", 12), Card("♠️", 13), Card("♠️", 14)]
+    result = estimator.estimate(hand)
+    assert result.best is None
+    assert all(hold.total_combination == estimator.max_samples for hold in result.holds)
+# endregion
+
+# region player
+def test_player_estimate(estimator):
+    hand = [Card("♠️", 10), Card("♥️", 10), Card("♠️", 3), Card("♣️", 7), Card("♦️", 12)]
+    player = Player(estimator=estimator)
+    (best_retained_hand, probability) = player.find_best_retained_hand(hand, estimate=True)
+    (exact_retained_hand, exact_probability) = player.find_best_retained_hand(hand)
+    assert abs(probability - exact_probability) < 0.05
+    assert all(card in hand for card in best_retained_hand)
+
+def test_player_estimate_without_estimator():
+    with pytest.raises(ValueError):
+        Player().estimate([Card("♠️", 10), Card("♥️", 10), Card("♠️", 3), Card("♣️", 7), Card("♦️", 12)])
+# endregion
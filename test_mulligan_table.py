@@ -0,0 +1,72 @@
+import pytest
+import itertools
+from player import Player
+from card import CARDS
+from hand_index import TOTAL_HANDS, iter_hand_ids
+from mulligan_table import build_mulligan_table, load_mulligan_table, retained_hand_mask, MulliganTable, RECORD, NO_RETAINED_HAND
+
+# region fixture and helper function
+START = 100000
+STOP = 100200
+
+@pytest.fixture
+def player():
+    player = Player()
+    return player
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory):
+    path = tmp_path_factory.mktemp("table") / "mulligan_table.bin"
+    build_mulligan_table(path, START, STOP)
+    table = MulliganTable(path)
+    yield table
+    table.close()
+
+def hand_at(rank):
+    ids = next(itertools.islice(iter_hand_ids(), rank, rank + 1))
+    return [CARDS[card_id] for card_id in ids]
+
+# endregion fixture and helper function
+
+def test_retained_hand_mask():
+    given_hand = [CARDS[30], CARDS[2], CARDS[51], CARDS[7], CARDS[18]]
+
+    assert retained_hand_mask(given_hand, []) == 0
+    assert retained_hand_mask(given_hand, [CARDS[2]]) == 0b00001
+    assert retained_hand_mask(given_hand, [CARDS[51], CARDS[7]]) == 0b10010
+    assert retained_hand_mask(given_hand, None) == NO_RETAINED_HAND
+
+def test_table_size(table: MulliganTable):
+    assert len(table.mmap) == TOTAL_HANDS * RECORD.size
+
+def test_lookup(player: Player, table: MulliganTable):
+    for ids in itertools.islice(iter_hand_ids(), START, STOP):
+        given_hand = [CARDS[card_id] for card_id in ids]
+        (best_retained_hand, better_combination, total_combination) = table.lookup(given_hand[::-1])
+
+        (expected_retained_hand, expected_better, expected_total) = player.calc_best_retained_hand(given_hand)
+        assert better_combination == expected_better
+        assert total_combination == expected_total
+
+        # the retained hand is the given hand's cards and has the same probability
+        if best_retained_hand is not None:
+            assert all(card in given_hand for card in best_retained_hand)
+            assert player.calc_better_combination(given_hand, best_retained_hand, player.generate_method_list(given_hand)) == better_combination
+
+def test_lookup_not_built(table: MulliganTable):
+    assert table.lookup(hand_at(START - 1)) is None
+    assert table.lookup(hand_at(STOP)) is None
+
+def test_player_with_table(player: Player, table: MulliganTable):
+    table_player = Player(mulligan_table=table)
+
+    # from table
+    given_hand = hand_at(START)
+    assert table_player.lookup_best_retained_hand(given_hand) == table.lookup(given_hand)
+
+    # not in table - live calculation
+    given_hand = hand_at(STOP + 1)
+    assert table_player.lookup_best_retained_hand(given_hand) == player.calc_best_retained_hand(given_hand)
+
+def test_load_missing_table(tmp_path):
+    assert load_mulligan_table(tmp_path / "missing.bin") is None
@@ -2,7 +2,8 @@ import pytest
 import random
 from player import Player
 from deck import Deck
-from card import Card
+from card import Card, CARDS
+from evaluator import PrimeEvaluator
 import itertools
 import math
 
@@ -147,6 +148,20 @@ def random_num_combination(count, num_list):
 
     return output
 
+# helper function to find combo that is BETTER than given hand with a hand evaluator (evaluator.py) - any combo, no combo rules
+def find_better_combo_by_strength(given_hand, all_valid_combo, evaluator=None):
+    evaluator = evaluator if evaluator is not None else PRIME_EVALUATOR
+    given_strength = evaluator.strength(given_hand)
+    return [combo for combo in all_valid_combo if evaluator.strength(combo) > given_strength]
+
+# helper function to find all 5 card hand that can be made with retained hand
+def all_redraw_combination(retained_hand):
+    deck = [card for card in CARDS if card not in retained_hand]
+    for redraw in itertools.combinations(deck, 5 - len(retained_hand)):
+        yield list(retained_hand) + list(redraw)
+
+PRIME_EVALUATOR = PrimeEvaluator()
+
 # endregion fixture and helper function
 
 # SPECIFIC TEST CASE
@@ -1038,6 +1053,8 @@ def test_calc_total_better_straight_flush_combination(player: Player):
             for combo in output:
                 print([str(card) for card in combo])
 
+        # the combo rules above find the same better combos as the hand evaluator
+        assert len(output) == len(find_better_combo_by_strength(given_hand, all_valid_combo))
         return output
 
     # find all straight flush combo
@@ -1109,6 +1126,8 @@ def test_calc_total_better_four_of_a_kind_combination(player: Player):
             for combo in output:
                 print([str(card) for card in combo])
 
+        # the combo rules above find the same better combos as the hand evaluator
+        assert len(output) == len(find_better_combo_by_strength(given_hand, all_valid_combo))
         return output
 
     # find all 4 of a kind combo
@@ -1247,6 +1266,8 @@ def test_calc_total_better_full_house_combination(player: Player):
             for combo in output:
                 print([str(card) for card in combo])
 
+        # the combo rules above find the same better combos as the hand evaluator
+        assert len(output) == len(find_better_combo_by_strength(given_hand, all_valid_combo))
         return output
 
     # find all full house combo
@@ -1447,6 +1468,8 @@ def test_calc_total_better_flush_combination(player: Player):
                 str_combo = [str(card) for card in combo]
                 print(str_combo)
 
+        # the combo rules above find the same better combos as the hand evaluator
+        assert len(output) == len(find_better_combo_by_strength(given_hand, all_valid_combo))
         return output
 
     # find all flush combo
@@ -1520,6 +1543,8 @@ def test_calc_total_better_straight_combination(player: Player):
                 str_combo = [str(card) for card in combo]
                 print(str_combo)
         
+        # the combo rules above find the same better combos as the hand evaluator
+        assert len(output) == len(find_better_combo_by_strength(given_hand, all_valid_combo))
         return output
     # all straight combo
     all_straight_no_flush = all_iter_consecutive_combination(flush=False, royal=True)
@@ -1612,6 +1637,8 @@ def test_calc_total_better_three_of_a_kind_combination(player: Player):
                 str_combo = [str(card) for card in combo]
                 print(str_combo)
         
+        # the combo rules above find the same better combos as the hand evaluator
+        assert len(output) == len(find_better_combo_by_strength(given_hand, all_valid_combo))
         return output
 
     # find all 3 of a kind combo
@@ -1838,6 +1865,8 @@ def test_calc_total_better_two_pairs_combination(player: Player):
                 str_combo = [str(card) for card in combo]
                 print(str_combo)
 
+        # the combo rules above find the same better combos as the hand evaluator
+        assert len(output) == len(find_better_combo_by_strength(given_hand, all_valid_combo))
         return output
 
     # all two pairs combinations
@@ -2136,6 +2165,8 @@ def test_calc_total_better_pair_combination(player: Player):
                 str_combo = [str(card) for card in combo]
                 print(str_combo)
         
+        # the combo rules above find the same better combos as the hand evaluator
+        assert len(output) == len(find_better_combo_by_strength(given_hand, all_valid_combo))
         return output
     
     # all one pair
@@ -2334,6 +2365,8 @@ def test_calc_total_better_high_card_combination(player: Player):
                 str_combo = [str(card) for card in combo]
                 print(str_combo)
 
+        # the combo rules above find the same better combos as the hand evaluator
+        assert len(output) == len(find_better_combo_by_strength(given_hand, all_valid_combo))
         return output
 
     # generate all high card combination:
@@ -2401,4 +2434,46 @@ def test_calc_total_better_high_card_combination(player: Player):
         all_better_combination = find_better_combo(TEST_GIVEN_HAND, all_valid_combination)
         assert player.calc_total_better_high_card_combination(TEST_GIVEN_HAND, TEST_RETAINED_HAND) == len(all_better_combination)
     
-# endregion calc better combo if hand is already a given combo
\ No newline at end of file
+# endregion calc better combo if hand is already a given combo
+
+# region branch and bound search
+def test_calc_upper_bound_combination(player: Player):
+    for _ in range(50):
+        given_hand = random_five()
+        method_list = player.generate_method_list(given_hand)
+        category = len(player.formula_list) - len(method_list)
+
+        for retained_hand in player.generate_all_retained_hand_combination(given_hand):
+            upper_bound = player.calc_upper_bound_combination(retained_hand, category)
+            assert player.calc_better_combination(given_hand, retained_hand, method_list) <= upper_bound <= player.calc_total_combination(5 - len(retained_hand))
+
+def test_search_best_retained_hand(player: Player):
+    hands = [random_five() for _ in range(100)]
+    # a hand for every combo above high card - ties and hands without a better retained hand
+    hands += [
+        create_hand([2,2,5,9,13], ["♠️", "♥️", "♠️", "♣️", "♦️"]),
+        create_hand([2,2,5,5,13], ["♠️", "♥️", "♠️", "♣️", "♦️"]),
+        create_hand([8,8,8,5,13], ["♠️", "♥️", "♣️", "♣️", "♦️"]),
+        create_hand([4,5,6,7,8], ["♠️", "♥️", "♣️", "♣️", "♦️"]),
+        create_hand([2,5,6,9,13], ["♠️"]*5),
+        create_hand([3,3,3,9,9], ["♠️", "♥️", "♣️", "♣️", "♦️"]),
+        create_hand([14,14,14,14,2], ["♠️", "♥️", "♣️", "♦️", "♦️"]),
+        create_hand([5,6,7,8,9], ["♥️"]*5),
+        create_hand([10,11,12,13,14], ["♥️"]*5),
+    ]
+
+    for given_hand in hands:
+        best = player.solve(given_hand).best
+        expected = (None, 0, 1) if best is None else (best.retained_hand, best.better_combination, best.total_combination)
+        (best_retained_hand, better_combination, total_combination, num_pruned) = player.search_best_retained_hand(given_hand)
+
+        assert (best_retained_hand, better_combination, total_combination) == expected
+        assert player.calc_best_retained_hand(given_hand) == expected
+        if player.classify(given_hand) == 0:
+            assert num_pruned == 0
+
+    # a royal flush can not be beaten
+    assert player.search_best_retained_hand(hands[-1])[:3] == (None, 0, 1)
+    assert 0 < player.pruned_holds < player.searched_holds
+
+# endregion branch and bound search
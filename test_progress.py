@@ -0,0 +1,44 @@
+import io
+import time
+from progress import Progress, format_duration
+
+def test_format_duration():
+    assert format_duration(0) == "0:00:00"
+    assert format_duration(3725) == "1:02:05"
+
+def test_progress_render():
+    progress = Progress(100, desc="hands", file=io.StringIO())
+    for _ in range(3):
+        progress.update(category=0)
+    progress.update(1, category=1)
+    progress.add_anomaly()
+
+    line = progress.render()
+    assert line.startswith("hands: 4/100 (4.0%)")
+    assert "anomalies 1" in line
+    assert "HC 75.0%" in line and "1P 25.0%" in line
+
+def test_progress_category_counts():
+    progress = Progress(10, file=io.StringIO())
+    progress.update(10, category_counts=[5, 5] + [0] * 8)
+    assert progress.done == 10
+    assert progress.category_counts[:2] == [5, 5]
+
+def test_progress_thread_renders():
+    file = io.StringIO()
+    with Progress(10, desc="test", refresh=0.01, file=file) as progress:
+        progress.update(5)
+        time.sleep(0.05)
+        assert progress.thread.is_alive()
+
+    assert progress.thread is None
+    output = file.getvalue()
+    # rendered by the thread while running and once more on close
+    assert output.count("\r") >= 2
+    assert output.endswith("test: 5/10 (50.0%)" + output.split("test: 5/10 (50.0%)")[-1])
+    assert output.endswith("\n")
+
+def test_progress_resumed_speed():
+    progress = Progress(100, file=io.StringIO(), initial=50)
+    assert progress.done == 50
+    assert progress.render().startswith(": 50/100 (50.0%) | 0 hands/s")
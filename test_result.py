@@ -0,0 +1,126 @@
+import pytest
+from player import Player
+from deck import Deck
+from card import Card, CARDS
+from result import HoldResult, MulliganResult, NO_RETAINED_HAND
+from render import render_result
+
+# region fixture and helper function
+@pytest.fixture
+def player():
+    player = Player()
+    return player
+
+def create_hand(num_list, suit_list):
+    hand = []
+
+    for i in range(len(num_list)):
+        card = Card(suit_list[i], num_list[i])
+        hand.append(card)
+    
+    return hand
+
+# endregion fixture and helper function
+
+def test_solve(player: Player):
+    given_hand = create_hand([2,2,7,9,13], ["♠️", "♥️", "♠️", "♣️", "♦️"])
+    result = player.solve(given_hand)
+
+    assert result.category == 1
+    assert result.category_name == "one pair"
+    assert len(result.holds) == 31
+
+    # ranked best first with the exact numerator and denominator
+    probabilities = [hold.probability for hold in result.holds]
+    assert probabilities == sorted(probabilities, reverse=True)
+    for hold in result.holds:
+        method_list = player.generate_method_list(given_hand)
+        assert hold.better_combination == player.calc_better_combination(given_hand, hold.retained_hand, method_list)
+        assert hold.total_combination == player.calc_total_combination(5 - len(hold.retained_hand))
+
+    # same best retained hand as calc_best_retained_hand / find_best_retained_hand
+    (best_retained_hand, better_combination, total_combination) = player.calc_best_retained_hand(given_hand)
+    assert result.best_retained_hand == best_retained_hand
+    assert (result.best.better_combination, result.best.total_combination) == (better_combination, total_combination)
+    assert player.find_best_retained_hand(given_hand) == (best_retained_hand, result.probability)
+
+def test_solve_royal_flush(player: Player):
+    result = player.solve(create_hand([10,11,12,13,14], ["♠️"]*5))
+
+    # nothing is better than a royal flush
+    assert result.category_name == "royal flush"
+    assert result.best is None
+    assert result.best_retained_hand is None
+    assert result.probability == 0
+    assert player.calc_best_retained_hand(result.given_hand) == (None, 0, 1)
+
+def test_mulligan_result_tie_order():
+    first = HoldResult([], 1, 4)
+    second = HoldResult([], 2, 8)
+    third = HoldResult([], 3, 4)
+    result = MulliganResult([], 0, [first, second, third])
+
+    # same probability keeps the given order
+    assert result.holds == [third, first, second]
+
+def test_find_best_retained_hand_is_quiet(player: Player, capsys):
+    player.find_best_retained_hand(create_hand([2,4,7,9,13], ["♠️", "♥️", "♠️", "♣️", "♦️"]))
+    assert capsys.readouterr().out == ""
+
+def test_formula_error_is_raised_not_printed(capsys, monkeypatch):
+    def broken_two_pairs_total(self, retained_hand):
+        raise TypeError("broken formula")
+    monkeypatch.setattr(Player, "calc_two_pairs_total_combination", broken_two_pairs_total)
+    player = Player()
+    given_hand = create_hand([2,2,7,9,13], ["♠️", "♥️", "♠️", "♣️", "♦️"])
+
+    # the error names the combo and the retained hand - the caller renders it
+    with pytest.raises(TypeError, match="two pair failed for retained hand"):
+        player.calc_better_combination(given_hand, given_hand[:2], player.generate_method_list(given_hand))
+    assert capsys.readouterr().out == ""
+
+def test_render_result(player: Player, capsys):
+    result = player.solve(create_hand([2,2,7,9,13], ["♠️", "♥️", "♠️", "♣️", "♦️"]))
+
+    render_result(result)
+    output = capsys.readouterr().out
+    assert "Best retained hand:" in output
+    assert f"best retained hand probabilities: {result.probability * 100:.2f}%" in output
+    assert "retained_hand:" not in output
+
+    render_result(result, show_holds=True)
+    assert capsys.readouterr().out.count("retained_hand:") == 31
+
+def test_find_best_retained_hands(player: Player):
+    deck = Deck()
+    hands = list(deck.stream_all_iteration(1000000, 1000300))
+    result = player.find_best_retained_hands(iter(hands))
+
+    assert len(result) == 300
+    assert result.hands == hands
+    for i, given_hand in enumerate(hands):
+        (best_retained_hand, best_probabilities) = player.find_best_retained_hand(given_hand)
+        assert result.probabilities[i] == best_probabilities
+        assert result.better_combinations[i] / result.total_combinations[i] == best_probabilities
+        assert result.categories[i] == player.classify(given_hand)
+
+        # same probability for the batch's retained hand (ties can pick a different retained hand of the suit class)
+        retained_hand = result.retained_hand(i)
+        if retained_hand is not None:
+            assert all(card in given_hand for card in retained_hand)
+            assert player.calc_percent_of_better_combination(given_hand, retained_hand, player.generate_method_list(given_hand)) == best_probabilities
+
+def test_find_best_retained_hands_card_ids(player: Player):
+    royal_flush = [8, 9, 10, 11, 12]
+    result = player.find_best_retained_hands([royal_flush, (0, 13, 26, 1, 2)])
+
+    assert result.hands[0] == [CARDS[card_id] for card_id in royal_flush]
+    assert result.categories[0] == 9
+    assert result.retained_masks[0] == NO_RETAINED_HAND
+    assert result.retained_hand(0) is None
+    assert result.probabilities[0] == 0
+
+    # three of a kind 2 - keep the 3 2s
+    assert result.categories[1] == 3
+    assert result.retained_hand(1) == [CARDS[0], CARDS[13], CARDS[26]]
+    assert result.retained_masks[1] == 0b00111
@@ -0,0 +1,125 @@
+import os
+import sys
+import time
+import pytest
+import subprocess
+from card import CARDS
+from player import Player
+from hand_index import TOTAL_HANDS, iter_hand_ids
+from shard import ShardCoordinator, ShardWorker
+from mulligan_table import RECORD, NOT_BUILT, MulliganTable, retained_hand_mask
+
+def expected_records(stop):
+    # the merged file is a mulligan table - the hands in rank order, NOT_BUILT after stop
+    player = Player()
+    records = bytearray()
+    for ids in iter_hand_ids(0, stop):
+        given_hand = [CARDS[card_id] for card_id in ids]
+        (best_retained_hand, better_combination, total_combination) = player.calc_best_retained_hand(given_hand)
+        records += RECORD.pack(retained_hand_mask(given_hand, best_retained_hand), better_combination, total_combination)
+    records += RECORD.pack(NOT_BUILT, 0, 0) * (TOTAL_HANDS - stop)
+    return bytes(records)
+
+# region coordinator
+def test_create(tmp_path):
+    coordinator = ShardCoordinator(str(tmp_path))
+    assert coordinator.create(total=100, shard_size=30) == 4
+    assert coordinator.manifest() == {"total": 100, "shard_size": 30, "num_shard": 4, "order": "colex"}
+    assert coordinator.status() == {"pending": 4, "leased": 0, "done": 0}
+
+    with pytest.raises(ValueError):
+        coordinator.create(total=100, shard_size=30)
+
+def test_merge_needs_every_shard(tmp_path):
+    coordinator = ShardCoordinator(str(tmp_path))
+    coordinator.create(total=40, shard_size=20)
+    ShardWorker(str(tmp_path), "worker").run(max_shards=1)
+
+    with pytest.raises(ValueError):
+        coordinator.merge(str(tmp_path / "merged.bin"))
+
+def test_merge_needs_colex_order(tmp_path):
+    # shards of an older lex order manifest cannot be merged into a mulligan table
+    coordinator = ShardCoordinator(str(tmp_path))
+    coordinator.create(total=20, shard_size=20)
+    with open(coordinator.manifest_path, "w") as file:
+        file.write('{"total": 20, "shard_size": 20, "num_shard": 1}')
+    ShardWorker(str(tmp_path), "worker").run()
+
+    with pytest.raises(ValueError):
+        coordinator.merge(str(tmp_path / "merged.bin"))
+# endregion
+
+# region worker
+def test_workers_and_merge(tmp_path):
+    coordinator = ShardCoordinator(str(tmp_path))
+    coordinator.create(total=90, shard_size=30)
+
+    assert ShardWorker(str(tmp_path), "a").run(max_shards=1) == 1
+    assert ShardWorker(str(tmp_path), "b").run() == 2
+    assert coordinator.status() == {"pending": 0, "leased": 0, "done": 3}
+
+    output = coordinator.merge(str(tmp_path / "merged.bin"))
+    with open(output, "rb") as file:
+        assert file.read() == expected_records(90)
+
+def test_merged_file_is_mulligan_table(tmp_path):
+    coordinator = ShardCoordinator(str(tmp_path))
+    coordinator.create(total=60, shard_size=20)
+    ShardWorker(str(tmp_path), "a").run()
+
+    table = MulliganTable(coordinator.merge(str(tmp_path / "merged.bin")))
+    player = Player()
+    try:
+        # every hand of the shards is looked up by its rank, in any card order
+        for ids in iter_hand_ids(0, 60):
+            given_hand = [CARDS[card_id] for card_id in ids]
+            assert table.lookup(given_hand[::-1]) == player.calc_best_retained_hand(given_hand)
+        # the hands after the shards are not built
+        assert table.lookup([CARDS[card_id] for card_id in next(iter_hand_ids(60, 61))]) is None
+    finally:
+        table.close()
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    coordinator = ShardCoordinator(str(tmp_path))
+    coordinator.create(total=40, shard_size=20)
+
+    # worker a claims a shard and dies - its last heartbeat is 10 minutes old
+    dead_worker = ShardWorker(str(tmp_path), "a")
+    (shard, start, stop) = dead_worker.claim()
+    old = time.time() - 600
+    os.utime(dead_worker.lease_path, (old, old))
+
+    # worker b solves the other shard, then reclaims and solves the dead worker's shard
+    assert ShardWorker(str(tmp_path), "b", lease_timeout=300).run() == 2
+    assert coordinator.status() == {"pending": 0, "leased": 0, "done": 2}
+
+    # the dead worker lost its lease
+    with pytest.raises(FileNotFoundError):
+        dead_worker.heartbeat(force=True)
+
+    with open(coordinator.merge(str(tmp_path / "merged.bin")), "rb") as file:
+        assert file.read() == expected_records(40)
+
+def test_live_lease_is_not_reclaimed(tmp_path):
+    coordinator = ShardCoordinator(str(tmp_path))
+    coordinator.create(total=20, shard_size=20)
+    ShardWorker(str(tmp_path), "a").claim()
+
+    assert coordinator.reclaim_expired(lease_timeout=300) == 0
+    assert ShardWorker(str(tmp_path), "b").claim() is None
+
+def test_worker_processes(tmp_path):
+    directory = str(tmp_path)
+    coordinator = ShardCoordinator(directory)
+    coordinator.create(total=200, shard_size=20)
+
+    # 2 worker processes share the directory - every shard is done exactly once
+    workers = [subprocess.Popen([sys.executable, "shard.py", "work", directory, "--worker-id", f"w{i}"], cwd=os.path.dirname(os.path.abspath(__file__)), stdout=subprocess.PIPE, text=True) for i in range(2)]
+    num_done = sum(int(worker.communicate()[0].split()[-1]) for worker in workers)
+
+    assert num_done == 10
+    assert coordinator.status() == {"pending": 0, "leased": 0, "done": 10}
+    with open(coordinator.merge(str(tmp_path / "merged.bin")), "rb") as file:
+        assert file.read() == expected_records(200)
+# endregion
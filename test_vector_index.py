@@ -0,0 +1,53 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+from hand_index import TOTAL_HANDS, TOTAL_HOLDS, rank_hand, unrank_hand, rank_hold
+from vector_index import rank_hands, unrank_hands, rank_holds, unrank_holds
+
+# region hand
+def test_unrank_hands_every_hand():
+    ranks = np.arange(TOTAL_HANDS)
+    hands = unrank_hands(ranks)
+    assert hands.shape == (TOTAL_HANDS, 5) and hands.dtype == np.uint8
+    assert (np.diff(hands.astype(np.int64), axis=1) > 0).all()
+
+    ranked = rank_hands(hands)
+    assert ranked.dtype == np.uint32
+    assert (ranked == ranks).all()
+
+def test_batch_matches_scalar():
+    rng = np.random.default_rng(1)
+    ranks = rng.integers(0, TOTAL_HANDS, 2000)
+    for rank, card_ids in zip(ranks.tolist(), unrank_hands(ranks).tolist()):
+        assert tuple(card_ids) == unrank_hand(rank)
+
+    # the card order of a row does not matter
+    hands = np.array([rng.permutation(52)[:5] for _ in range(2000)])
+    assert rank_hands(hands).tolist() == [rank_hand(hand) for hand in hands.tolist()]
+
+def test_unrank_hands_out_of_range():
+    with pytest.raises(ValueError):
+        unrank_hands([0, TOTAL_HANDS])
+    with pytest.raises(ValueError):
+        unrank_hands([-1])
+    assert unrank_hands([]).shape == (0, 5)
+# endregion hand
+
+# region hold
+@pytest.mark.parametrize("num_card", [1, 2, 3, 4])
+def test_holds_every_hold(num_card):
+    ranks = np.arange(TOTAL_HOLDS[num_card])
+    holds = unrank_holds(ranks, num_card)
+    assert (rank_holds(holds) == ranks).all()
+    assert [rank_hold(hold) for hold in holds[::997].tolist()] == ranks[::997].tolist()
+
+def test_empty_hold():
+    assert unrank_holds([0], 0).shape == (1, 0)
+    assert rank_holds(np.empty((3, 0), dtype=np.int64)).tolist() == [0, 0, 0]
+
+def test_holds_invalid_size():
+    with pytest.raises(ValueError):
+        rank_holds(np.zeros((1, 5), dtype=np.int64))
+    with pytest.raises(ValueError):
+        unrank_holds([0], 5)
+# endregion hold
@@ -0,0 +1,70 @@
+import numpy as np
+from hand_index import BINOMIAL
+
+# BINOMIAL_ARRAY[n, k] = comb(n, k) for n in 0..52 and k in 0..5 - every rank of a 5 card hand fits in a uint32
+BINOMIAL_ARRAY = np.array(BINOMIAL, dtype=np.int64)
+
+def rank_combinations(card_ids):
+    """
+    Colex rank of every row of card ids (NumPy) - the batch version of hand_index.rank_hand / rank_hold
+
+    - card_ids - integer array with shape (number of rows, k), the cards of a row in any order
+    - returns a uint32 array with shape (number of rows,)
+    """
+    card_ids = np.sort(np.asarray(card_ids, dtype=np.int64), axis=1)
+    ranks = np.zeros(len(card_ids), dtype=np.int64)
+    for k in range(card_ids.shape[1]):
+        ranks += BINOMIAL_ARRAY[card_ids[:, k], k + 1]
+    return ranks.astype(np.uint32)
+
+def unrank_combinations(ranks, num_card):
+    """
+    Sorted card ids of every colex rank (NumPy) - the batch version of hand_index.unrank_hand / unrank_hold
+
+    - from the highest card: the largest id c with comb(c, k) <= rank, found with one searchsorted for all rows
+    - returns a uint8 array with shape (number of ranks, num_card)
+    """
+    if not 0 <= num_card <= 5:
+        raise ValueError(f"Invalid number of cards: {num_card}")
+    ranks = np.array(ranks, dtype=np.int64)
+    total = BINOMIAL[52][num_card]
+    if len(ranks) > 0 and (ranks.min() < 0 or ranks.max() >= total):
+        raise ValueError(f"Invalid rank: ranks must be in 0..{total - 1}")
+
+    card_ids = np.empty((len(ranks), num_card), dtype=np.uint8)
+    for k in range(num_card, 0, -1):
+        column = BINOMIAL_ARRAY[:52, k]
+        card_id = np.searchsorted(column, ranks, side="right") - 1
+        ranks -= column[card_id]
+        card_ids[:, k - 1] = card_id
+    return card_ids
+
+def rank_hands(hand_ids):
+    """
+    Colex rank of every 5 card hand - (number of hands, 5) card ids to uint32
+    """
+    if np.shape(hand_ids)[1] != 5:
+        raise ValueError(f"Invalid hand size: {np.shape(hand_ids)[1]}")
+    return rank_combinations(hand_ids)
+
+def unrank_hands(ranks):
+    """
+    Sorted card ids of every 5 card hand rank - ie: unrank_hands(np.arange(start, stop)) is a shard of every hand
+    """
+    return unrank_combinations(ranks, 5)
+
+def rank_holds(hold_ids):
+    """
+    Colex rank of every 0 to 4 card hold - (number of holds, k) card ids to uint32
+    """
+    if np.shape(hold_ids)[1] > 4:
+        raise ValueError(f"Invalid hold size: {np.shape(hold_ids)[1]}")
+    return rank_combinations(hold_ids)
+
+def unrank_holds(ranks, num_card):
+    """
+    Sorted card ids of every num_card card hold rank
+    """
+    if num_card > 4:
+        raise ValueError(f"Invalid hold size: {num_card}")
+    return unrank_combinations(ranks, num_card)